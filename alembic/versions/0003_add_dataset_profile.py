@@ -0,0 +1,20 @@
+"""add dataset profile_json
+
+Revision ID: 0003_add_dataset_profile
+Revises: 0002_add_dataset_meta
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_add_dataset_profile"
+down_revision = "0002_add_dataset_meta"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("datasets", sa.Column("profile_json", sa.Text(), nullable=True))
+
+def downgrade():
+    op.drop_column("datasets", "profile_json")
@@ -0,0 +1,90 @@
+"""add experiment/project run summaries
+
+Revision ID: 0004_add_run_summaries
+Revises: 0003_add_dataset_profile
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_add_run_summaries"
+down_revision = "0003_add_dataset_profile"
+branch_labels = None
+depends_on = None
+
+def _rollup_columns():
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.Column("n_queued", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("n_running", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("n_succeeded", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("n_failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("n_canceled", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("best_accuracy", sa.Float(), nullable=True),
+        sa.Column("latest_accuracy", sa.Float(), nullable=True),
+        sa.Column("best_f1_macro", sa.Float(), nullable=True),
+        sa.Column("latest_f1_macro", sa.Float(), nullable=True),
+        sa.Column("best_run_id", sa.Uuid(), nullable=True),
+        sa.Column("total_fit_seconds", sa.Float(), nullable=False, server_default="0"),
+    ]
+
+# one row per group from existing runs; latest_* = most recently updated succeeded run
+_BACKFILL = """
+INSERT INTO {table} ({key}, n_queued, n_running, n_succeeded, n_failed, n_canceled,
+                     best_accuracy, best_f1_macro, total_fit_seconds,
+                     latest_accuracy, latest_f1_macro, best_run_id)
+SELECT g.id,
+       count(r.id) FILTER (WHERE r.status = 'QUEUED'),
+       count(r.id) FILTER (WHERE r.status = 'RUNNING'),
+       count(r.id) FILTER (WHERE r.status = 'SUCCEEDED'),
+       count(r.id) FILTER (WHERE r.status = 'FAILED'),
+       count(r.id) FILTER (WHERE r.status = 'CANCELED'),
+       max((r.metrics_json::json->>'accuracy')::float) FILTER (WHERE r.status = 'SUCCEEDED'),
+       max((r.metrics_json::json->>'f1_macro')::float) FILTER (WHERE r.status = 'SUCCEEDED'),
+       coalesce(sum((r.metrics_json::json->>'fit_seconds')::float) FILTER (WHERE r.status = 'SUCCEEDED'), 0),
+       (SELECT (l.metrics_json::json->>'accuracy')::float FROM runs l {join_latest}
+         WHERE l.status = 'SUCCEEDED' AND {match_latest} ORDER BY l.updated_at DESC LIMIT 1),
+       (SELECT (l.metrics_json::json->>'f1_macro')::float FROM runs l {join_latest}
+         WHERE l.status = 'SUCCEEDED' AND {match_latest} ORDER BY l.updated_at DESC LIMIT 1),
+       (SELECT l.id FROM runs l {join_latest}
+         WHERE l.status = 'SUCCEEDED' AND {match_latest} AND l.metrics_json::json->>'accuracy' IS NOT NULL
+         ORDER BY (l.metrics_json::json->>'accuracy')::float DESC LIMIT 1)
+FROM {group_table} g
+{join_runs}
+GROUP BY g.id
+"""
+
+def upgrade():
+    op.create_table(
+        "experiment_summaries",
+        sa.Column("experiment_id", sa.Uuid(), sa.ForeignKey("experiments.id", ondelete="CASCADE"), primary_key=True),
+        *_rollup_columns(),
+    )
+    op.create_table(
+        "project_summaries",
+        sa.Column("project_id", sa.Uuid(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        *_rollup_columns(),
+    )
+
+    op.execute(sa.text(_BACKFILL.format(
+        table="experiment_summaries",
+        key="experiment_id",
+        group_table="experiments",
+        join_runs="LEFT JOIN runs r ON r.experiment_id = g.id",
+        join_latest="",
+        match_latest="l.experiment_id = g.id",
+    )))
+    op.execute(sa.text(_BACKFILL.format(
+        table="project_summaries",
+        key="project_id",
+        group_table="projects",
+        join_runs="LEFT JOIN experiments e ON e.project_id = g.id LEFT JOIN runs r ON r.experiment_id = e.id",
+        join_latest="JOIN experiments le ON le.id = l.experiment_id",
+        match_latest="le.project_id = g.id",
+    )))
+
+def downgrade():
+    op.drop_table("project_summaries")
+    op.drop_table("experiment_summaries")
@@ -0,0 +1,39 @@
+"""add upload_sessions (chunked resumable uploads)
+
+Revision ID: 0005_add_upload_sessions
+Revises: 0004_add_run_summaries
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_add_upload_sessions"
+down_revision = "0004_add_run_summaries"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.Column("project_id", sa.Uuid(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("target_col", sa.String(length=200), nullable=True),
+        sa.Column("meta_json", sa.Text(), nullable=True),
+        sa.Column("filename", sa.String(length=500), nullable=False),
+        sa.Column("total_size", sa.BigInteger(), nullable=False),
+        sa.Column("chunk_size", sa.Integer(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="open"),
+        sa.Column("dataset_id", sa.Uuid(), sa.ForeignKey("datasets.id", ondelete="SET NULL"), nullable=True),
+    )
+    op.create_index("ix_upload_sessions_status_updated_at", "upload_sessions", ["status", "updated_at"])
+
+def downgrade():
+    op.drop_index("ix_upload_sessions_status_updated_at", table_name="upload_sessions")
+    op.drop_table("upload_sessions")
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 import os
-import uuid as uuidlib
+import shutil
+
+from loguru import logger
 
 from app.db.deps import get_db
-from app.schemas.dataset import DatasetCreate, DatasetOut
+from app.core.responses import rows_response, row_response, resource_etag, not_modified, json_bytes_response
+from app.schemas.dataset import DatasetCreate, DatasetOut, UploadSessionCreate, UploadSessionOut
 from app.models.dataset import Dataset
 from app.models.project import Project
+from app.models.upload import UploadSession
+from app.services.jobs import enqueue_profiling
+from app.services.uploads import (
+    UPLOAD_DIR,
+    ChunkWriter,
+    abort_session,
+    complete_session,
+    create_session,
+    maybe_sweep_stale_sessions,
+    session_state,
+    stored_filename,
+)
 
 router = APIRouter()
 
-UPLOAD_DIR = "/app/app/ml/datasets/uploads"
+def _enqueue_profiling_best_effort(dataset_id: str) -> None:
+    # profiling is an optimization; an unreachable queue must not fail the upload
+    try:
+        enqueue_profiling(dataset_id)
+    except Exception as e:
+        logger.warning(f"profiling enqueue failed for dataset {dataset_id}: {e}")
 
 @router.post("", response_model=DatasetOut, status_code=201)
 def create_dataset(payload: DatasetCreate, db: Session = Depends(get_db)):
@@ -27,11 +47,18 @@ def create_dataset(payload: DatasetCreate, db: Session = Depends(get_db)):
     return d
 
 @router.get("", response_model=list[DatasetOut])
-def list_datasets(project_id: str | None = None, db: Session = Depends(get_db)):
+def list_datasets(request: Request, project_id: str | None = None, db: Session = Depends(get_db)):
     q = select(Dataset).order_by(Dataset.created_at.desc())
     if project_id:
         q = q.where(Dataset.project_id == project_id)
-    return list(db.scalars(q).all())
+    return rows_response(request, db.scalars(q).all(), DatasetOut)
+
+@router.get("/{dataset_id}", response_model=DatasetOut)
+def get_dataset(dataset_id: str, request: Request, db: Session = Depends(get_db)):
+    d = db.get(Dataset, dataset_id)
+    if not d:
+        raise HTTPException(status_code=404, detail="dataset not found")
+    return row_response(request, d, DatasetOut)
 
 @router.post("/upload", response_model=DatasetOut, status_code=201)
 async def upload_dataset(
@@ -54,15 +81,11 @@ async def upload_dataset(
 
     os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-    ext = os.path.splitext(file.filename or "")[1].lower()
-    if not ext:
-        ext = ".bin"
-    safe_name = f"{name.lower().replace(' ', '_')}_{uuidlib.uuid4().hex}{ext}"
-    path = os.path.join(UPLOAD_DIR, safe_name)
+    path = os.path.join(UPLOAD_DIR, stored_filename(name, file.filename))
 
-    content = await file.read()
+    # copy from the spooled temp file in blocks instead of reading it all into memory
     with open(path, "wb") as f:
-        f.write(content)
+        shutil.copyfileobj(file.file, f, 1024 * 1024)
 
     d = Dataset(
         project_id=project_id,
@@ -76,4 +99,125 @@ async def upload_dataset(
     db.add(d)
     db.commit()
     db.refresh(d)
+    _enqueue_profiling_best_effort(str(d.id))
     return d
+
+def _get_upload_session(db: Session, session_id: str) -> UploadSession:
+    s = db.get(UploadSession, session_id)
+    if not s:
+        raise HTTPException(status_code=404, detail="upload session not found")
+    return s
+
+@router.post("/uploads", response_model=UploadSessionOut, status_code=201)
+def create_upload_session(payload: UploadSessionCreate, db: Session = Depends(get_db)):
+    """Parça parça yükleme için session açar (bkz. app.services.uploads)."""
+    p = db.get(Project, payload.project_id)
+    if not p:
+        raise HTTPException(status_code=404, detail="project not found")
+    maybe_sweep_stale_sessions(db)
+    try:
+        s = create_session(db, payload.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return session_state(s)
+
+@router.get("/uploads/{session_id}", response_model=UploadSessionOut)
+def get_upload_session(session_id: str, db: Session = Depends(get_db)):
+    """Session durumu + eksik chunk'lar (devam ederken sadece bunlar gönderilir)."""
+    return session_state(_get_upload_session(db, session_id))
+
+@router.put("/uploads/{session_id}/chunks/{index}", response_model=dict)
+async def upload_chunk(
+    session_id: str,
+    index: int,
+    request: Request,
+    x_chunk_sha256: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Chunk'ı ham body olarak alır (application/octet-stream), offset'ine stream eder.
+
+    `X-Chunk-SHA256` verilirse chunk ayrıca doğrulanır.
+    """
+    s = _get_upload_session(db, session_id)
+    if s.status != "open":
+        raise HTTPException(status_code=409, detail=f"upload session is {s.status}")
+    try:
+        writer = ChunkWriter(s, index, expected_sha256=x_chunk_sha256)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=410, detail="upload session data is gone")
+    except BlockingIOError:
+        raise HTTPException(status_code=409, detail="upload session is completing")
+    # re-read under the file lock: a complete or sweep that just finished has committed by now
+    s = db.get(UploadSession, s.id, populate_existing=True)
+    if s is None:
+        writer.close()
+        raise HTTPException(status_code=410, detail="upload session is gone")
+    if s.status != "open":
+        writer.close()
+        raise HTTPException(status_code=409, detail=f"upload session is {s.status}")
+    # release the connection while the body streams in; parallel chunks would otherwise pin the pool
+    db.close()
+
+    declared = request.headers.get("content-length")
+    if declared is not None and int(declared) != writer.length:
+        writer.close()
+        raise HTTPException(status_code=400, detail=f"chunk {index} must be {writer.length} bytes, got {declared}")
+    try:
+        async for piece in request.stream():
+            writer.write(piece)
+        writer.finish()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        writer.close()
+    return {"index": index, "bytes": writer.written}
+
+@router.post("/uploads/{session_id}/complete", response_model=DatasetOut, status_code=201)
+def complete_upload_session(session_id: str, db: Session = Depends(get_db)):
+    """Tüm chunk'lar geldiyse sha256'yı doğrular ve Dataset'i oluşturur."""
+    maybe_sweep_stale_sessions(db)
+    try:
+        d = complete_session(db, session_id)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="upload session not found")
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    _enqueue_profiling_best_effort(str(d.id))
+    return d
+
+@router.delete("/uploads/{session_id}", status_code=204)
+def abort_upload_session(session_id: str, db: Session = Depends(get_db)):
+    s = _get_upload_session(db, session_id)
+    if s.status != "open":
+        raise HTTPException(status_code=409, detail=f"upload session is {s.status}")
+    abort_session(db, s)
+    return Response(status_code=204)
+
+@router.post("/{dataset_id}/profile", response_model=dict)
+def enqueue_dataset_profile(dataset_id: str, db: Session = Depends(get_db)):
+    """Profiling job'ını (yeniden) kuyruğa atar."""
+    d = db.get(Dataset, dataset_id)
+    if not d:
+        raise HTTPException(status_code=404, detail="dataset not found")
+    job_id = enqueue_profiling(dataset_id)
+    return {"enqueued": True, "job_id": job_id}
+
+@router.get("/{dataset_id}/profile", response_model=dict)
+def get_dataset_profile(dataset_id: str, request: Request, db: Session = Depends(get_db)):
+    """Cache'li kolon istatistiklerini döner."""
+    d = db.get(Dataset, dataset_id)
+    if not d:
+        raise HTTPException(status_code=404, detail="dataset not found")
+    if not d.profile_json:
+        raise HTTPException(status_code=404, detail="dataset not profiled yet")
+    # profile writes bump updated_at, so the row ETag covers the profile too
+    etag = resource_etag(d)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    # profile_json is already JSON: splice it in instead of parsing and re-encoding
+    body = b'{"dataset_id":"' + str(d.id).encode() + b'","profile":' + d.profile_json.encode() + b"}"
+    return json_bytes_response(request, body, etag=etag)
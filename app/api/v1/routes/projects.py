@@ -3,9 +3,17 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from app.db.deps import get_db
-from app.schemas.project import ProjectCreate, ProjectOut, ExperimentCreate, ExperimentOut
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectOut,
+    ExperimentCreate,
+    ExperimentOut,
+    ExperimentSummaryOut,
+    ProjectSummaryOut,
+)
 from app.models.project import Project, Experiment
 from app.services.projects import list_projects, create_project, create_experiment
+from app.services.summaries import get_experiment_summary, get_project_summary
 
 router = APIRouter()
 
@@ -33,3 +41,18 @@ def post_experiment(payload: ExperimentCreate, db: Session = Depends(get_db)):
 def list_experiments(project_id: str, db: Session = Depends(get_db)):
     exps = db.scalars(select(Experiment).where(Experiment.project_id == project_id).order_by(Experiment.created_at.desc())).all()
     return list(exps)
+
+@router.get("/{project_id}/summary", response_model=ProjectSummaryOut)
+def project_summary(project_id: str, db: Session = Depends(get_db)):
+    """Run sayıları (status bazlı), best/latest metrikler, toplam eğitim süresi."""
+    p = db.get(Project, project_id)
+    if not p:
+        raise HTTPException(status_code=404, detail="project not found")
+    return get_project_summary(db, p.id)
+
+@router.get("/experiments/{experiment_id}/summary", response_model=ExperimentSummaryOut)
+def experiment_summary(experiment_id: str, db: Session = Depends(get_db)):
+    e = db.get(Experiment, experiment_id)
+    if not e:
+        raise HTTPException(status_code=404, detail="experiment not found")
+    return get_experiment_summary(db, e.id)
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 import json
 
 from app.db.deps import get_db
+from app.core.responses import rows_response, row_response
 from app.schemas.project import RunCreate, RunOut
 from app.models.project import Run, Experiment, RunStatus
-from app.models.dataset import Dataset
 from app.services.projects import create_run, update_run_status
+from app.services.datasets import dataset_profile_hint, run_routing_key
 from app.services.jobs import enqueue_training
-from app.ml.pipelines.ml_baseline import run_baseline
+from app.services.inline_jobs import pool_enabled, run_train_inline, try_reserve_slot
+from app.services.job_router import choose_mode, estimate_job, rf_shard_count
 
 router = APIRouter()
 
@@ -23,11 +27,19 @@ def post_run(payload: RunCreate, db: Session = Depends(get_db)):
     return create_run(db, experiment_id=payload.experiment_id, name=payload.name, params_json=payload.params_json)
 
 @router.get("", response_model=list[RunOut])
-def list_runs(experiment_id: str | None = None, db: Session = Depends(get_db)):
+def list_runs(request: Request, experiment_id: str | None = None, db: Session = Depends(get_db)):
     q = select(Run).order_by(Run.created_at.desc())
     if experiment_id:
         q = q.where(Run.experiment_id == experiment_id)
-    return list(db.scalars(q).all())
+    # fast path: ORM rows -> orjson directly, ETag over the body
+    return rows_response(request, db.scalars(q).all(), RunOut)
+
+@router.get("/{run_id}", response_model=RunOut)
+def get_run(run_id: str, request: Request, db: Session = Depends(get_db)):
+    run = db.get(Run, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="run not found")
+    return row_response(request, run, RunOut)
 
 @router.post("/{run_id}/enqueue", response_model=dict)
 def enqueue_run(run_id: str, db: Session = Depends(get_db)):
@@ -36,46 +48,86 @@ def enqueue_run(run_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="run not found")
     if run.status not in (RunStatus.QUEUED, RunStatus.FAILED):
         raise HTTPException(status_code=400, detail=f"cannot enqueue run in status {run.status}")
-    job_id = enqueue_training(run_id)
+    job_id = enqueue_training(run_id, routing_key=run_routing_key(db, run.params_json))
     return {"enqueued": True, "job_id": job_id}
 
-@router.post("/{run_id}/start", response_model=dict)
-def start_run(run_id: str, db: Session = Depends(get_db)):
-    """Default: arka plan (RQ) ile başlatır."""
+def _startable_run(db: Session, run_id: str) -> Run:
     run = db.get(Run, run_id)
     if not run:
         raise HTTPException(status_code=404, detail="run not found")
     if run.status not in (RunStatus.QUEUED, RunStatus.FAILED):
         raise HTTPException(status_code=400, detail=f"cannot start run in status {run.status}")
-    job_id = enqueue_training(run_id)
-    return {"started": True, "mode": "async", "job_id": job_id}
+    return run
+
+def _run_inline(db: Session, run: Run) -> Run:
+    """Slot'u alınmış run'ı pool'da çalıştırır; child DB'ye yazdıktan sonra satırı tazeler."""
+    run_id = str(run.id)
+    # don't hold a pooled connection while the fit runs
+    db.rollback()
+    try:
+        run_train_inline(run_id)
+    except BrokenProcessPool:
+        run = db.get(Run, run_id)
+        return update_run_status(db, run, RunStatus.FAILED, error="inline worker process died")
+    run = db.get(Run, run_id)
+    db.refresh(run)
+    return run
+
+# sync on purpose: DB, Redis and the pool wait all block; FastAPI runs these in its threadpool
+@router.post("/{run_id}/start", response_model=dict)
+def start_run(run_id: str, mode: str = "auto", db: Session = Depends(get_db)):
+    """Run'ı başlatır; ucuz işler API'nin process pool'unda hemen çalışır, pahalılar RQ'ya gider.
+
+    `mode`: auto (maliyet tahmini ile) | inline | queue
+    Inline modda cevap, bitmiş run'ı içerir.
+    """
+    run = _startable_run(db, run_id)
+    params = json.loads(run.params_json) if run.params_json else {}
+    try:
+        estimate = estimate_job(params, profile=dataset_profile_hint(db, params))
+        chosen = choose_mode(estimate, mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if chosen == "inline":
+        if try_reserve_slot():
+            run = _run_inline(db, run)
+            return {
+                "started": True,
+                "mode": "inline",
+                "estimate": estimate.to_dict(),
+                "run": RunOut.model_validate(run).model_dump(mode="json"),
+            }
+        if mode == "inline":
+            raise HTTPException(status_code=503, detail="inline pool is busy")
+
+    job_id = enqueue_training(run_id, routing_key=run_routing_key(db, run.params_json))
+    return {"started": True, "mode": "async", "job_id": job_id, "estimate": estimate.to_dict()}
 
 @router.post("/{run_id}/start_sync", response_model=RunOut)
 def start_run_sync(run_id: str, db: Session = Depends(get_db)):
-    """Geliştirme için: aynı request içinde çalıştırır."""
-    run = db.get(Run, run_id)
-    if not run:
-        raise HTTPException(status_code=404, detail="run not found")
-    if run.status not in (RunStatus.QUEUED, RunStatus.FAILED):
-        raise HTTPException(status_code=400, detail=f"cannot start run in status {run.status}")
+    """Bitmiş run'ı döner; eğitim request thread'inde değil, inline process pool'da çalışır.
 
+    Pool kapalıysa (`INLINE_POOL_WORKERS=0`) 400, maliyet tahmini `/start`'ın auto
+    modunda RQ'ya gidecek kadar yüksekse 413 döner; bu run'lar `/start` ile başlatılır.
+    """
+    if not pool_enabled():
+        raise HTTPException(status_code=400, detail="inline pool is disabled (INLINE_POOL_WORKERS=0); use /start")
+    run = _startable_run(db, run_id)
+    params = json.loads(run.params_json) if run.params_json else {}
+    if rf_shard_count(params.get("model")) > 1:
+        raise HTTPException(status_code=400, detail="distributed rf runs on the queue only; use /start")
     try:
-        update_run_status(db, run, RunStatus.RUNNING)
-        params = json.loads(run.params_json) if run.params_json else {}
-
-        ds_id = params.get("dataset_id")
-        if ds_id:
-            ds = db.get(Dataset, ds_id)
-            if not ds:
-                raise ValueError(f"dataset not found: {ds_id}")
-            dataset_cfg = params.get("dataset") or {}
-            dataset_cfg.setdefault("csv_path", ds.uri)
-            if ds.target_col:
-                dataset_cfg.setdefault("target_col", ds.target_col)
-            params["dataset"] = dataset_cfg
-
-        result = run_baseline(params, run_id=str(run.id))
-        metrics_json = json.dumps(result.metrics, ensure_ascii=False)
-        return update_run_status(db, run, RunStatus.SUCCEEDED, metrics_json=metrics_json)
-    except Exception as e:
-        return update_run_status(db, run, RunStatus.FAILED, error=str(e))
+        estimate = estimate_job(params, profile=dataset_profile_hint(db, params))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # same bar as auto routing: a long fit would pin one of the pool's few slots
+    if choose_mode(estimate, "auto") == "queue":
+        cost = "unknown" if estimate.est_seconds is None else f"~{estimate.est_seconds:.1f}s"
+        raise HTTPException(
+            status_code=413,
+            detail=f"run is too expensive for start_sync (estimated {cost}, rows={estimate.n_rows}); use /start",
+        )
+    if not try_reserve_slot():
+        raise HTTPException(status_code=503, detail="inline pool is busy")
+    return _run_inline(db, run)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+
+from app.services.jobs import get_redis
+from app.services.routing import cache_stats
+from app.services.inline_jobs import pool_stats
+
+router = APIRouter()
+
+@router.get("/cache", response_model=list[dict])
+def get_worker_cache_stats():
+    """Canlı worker'ların dataset cache istatistikleri (hit rate, bytes resident)."""
+    return cache_stats(get_redis())
+
+@router.get("/inline", response_model=dict)
+def get_inline_pool_stats():
+    """API içi inline job pool'unun doluluğu."""
+    return pool_stats()
@@ -0,0 +1,143 @@
+"""Response compression middleware (brotli / gzip).
+
+`Accept-Encoding` br içeriyorsa brotli, değilse gzip kullanılır. Eşik altındaki
+tek parça cevaplar sıkıştırılmaz; streaming cevaplar chunk chunk sıkıştırılır.
+Zaten encode edilmiş cevaplara ve 204'lere dokunulmaz.
+
+Sıkıştırılan cevabın ETag'ine coding eklenir (`"<hash>"` -> `"<hash>-br"`): br,
+gzip ve identity farklı byte'lar olduğundan aynı strong ETag'i paylaşamazlar.
+Gelen If-None-Match'teki bu son ek app'e iletilmeden silinir, 304'te geri eklenir;
+app tarafındaki ETag hesabı coding'den habersiz kalır.
+"""
+from __future__ import annotations
+
+import zlib
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=brotli_quality)
+            self._process, self._finish = self._c.process, self._c.finish
+        else:
+            # wbits=31 -> gzip container
+            self._c = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._process, self._finish = self._c.compress, self._c.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._process(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+def _coded_etag(etag: str, encoding: str) -> str:
+    # only quoted entity tags; W/ prefix is kept
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+def _strip_coding(header: str, encoding: str) -> tuple[str, set[str]]:
+    """If-None-Match'ten coding son ekini siler; client'ın elindeki coded tag'leri de döner."""
+    suffix = f'-{encoding}"'
+    tags, coded = [], set()
+    for t in header.split(","):
+        t = t.strip()
+        if t.endswith(suffix):
+            coded.add(t.removeprefix("W/"))
+            t = t[: -len(suffix)] + '"'
+        tags.append(t)
+    return ", ".join(tags), coded
+
+def _pick_encoding(accept: str) -> str | None:
+    tokens = {t.split(";")[0].strip().lower() for t in accept.split(",")}
+    if "br" in tokens:
+        return "br"
+    if "gzip" in tokens:
+        return "gzip"
+    return None
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = _pick_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        coded: set[str] = set()
+        inm = request_headers.get("if-none-match")
+        if inm:
+            inm, coded = _strip_coding(inm, encoding)
+            raw = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+            scope = {**scope, "headers": [*raw, (b"if-none-match", inm.encode("latin-1"))]}
+        await _Responder(self, encoding, send, coded).run(scope, receive)
+
+class _Responder:
+    def __init__(self, mw: CompressionMiddleware, encoding: str, send: Send, coded_tags: set[str]):
+        self.mw = mw
+        self.encoding = encoding
+        self.send = send
+        # coded ETags the client sent; a 304 must echo the one it matched
+        self.coded_tags = coded_tags
+        self.start: Message | None = None
+        self.passthrough = False
+        self.compressor: _Compressor | None = None
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.mw.app(scope, receive, self.on_send)
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or message["status"] in (204, 304)
+            etag = headers.get("etag")
+            if message["status"] == 304 and etag:
+                coded = _coded_etag(etag, self.encoding)
+                if coded.removeprefix("W/") in self.coded_tags:
+                    MutableHeaders(raw=message["headers"])["ETag"] = coded
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.mw.minimum_size:
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding, self.mw.gzip_level, self.mw.brotli_quality)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = _coded_etag(headers["etag"], self.encoding)
+            if not more_body:
+                out = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(out))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": out})
+                return
+            del headers["Content-Length"]
+            await self.send(self.start)
+
+        out = self.compressor.compress(body)
+        if not more_body:
+            out += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": out, "more_body": more_body})
@@ -10,7 +10,38 @@ class Settings(BaseSettings):
     database_url: str = "postgresql+psycopg://ai:ai@localhost:5432/ai_lab"
     cors_origins: str = "*"
 
+    # chunked uploads idle longer than this are swept
+    upload_session_ttl_hours: int = 24
+
+    # responses smaller than this are sent uncompressed
+    compression_min_bytes: int = 1024
+
     redis_url: str = "redis://redis:6379/0"
     rq_queue_name: str = "ai_lab"
+    # RQ job timeout (seconds) for training, rf shard and merge jobs
+    train_job_timeout: int = 3600
+
+    # in-API process pool for cheap runs; opt-in (0: every auto run goes to RQ).
+    # each child loads the ML stack (~200 MB RSS) per API process and per uvicorn worker
+    inline_pool_workers: int = 0
+    # BLAS/joblib threads per pool process
+    inline_pool_threads: int = 1
+    # accepted inline runs beyond the busy workers before routing falls back to RQ
+    inline_max_pending: int = 4
+    # router thresholds (see app.services.job_router)
+    inline_max_seconds: float = 1.0
+    inline_max_rows: int = 50_000
+
+    # worker-resident dataset cache (MB), opt-in; > 0 runs jobs in the worker process
+    # (no fork), so a crashing or leaking job takes the worker with it. 0 forks per job
+    dataset_cache_mb: int = 0
+    # a cache holder with this many jobs in its private queue is skipped by routing
+    affinity_max_queued: int = 1
+    # how often each worker moves jobs out of dead workers' private queues (seconds)
+    orphan_sweep_seconds: int = 60
+    # memory a training run may plan for (MB); 0 reads the cgroup limit / physical RAM
+    worker_memory_mb: int = 0
+    # cpus a training run may use (hgb threads); 0 reads the cgroup quota / cpu affinity
+    worker_cpus: int = 0
 
 settings = Settings()
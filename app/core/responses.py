@@ -0,0 +1,66 @@
+"""Hızlı JSON cevapları ve conditional GET (ETag / If-None-Match).
+
+- `orjson_bytes`: orjson ile serialize (UTC datetime'lar Pydantic gibi `Z` ile)
+- `rows_response`: ORM satırlarını Pydantic validation'a sokmadan, schema'nın
+  alanlarıyla doğrudan JSON'a döker; body hash'i ETag olur
+- `resource_etag`: tek kaynak için (id, updated_at) tabanlı weak ETag; 304
+  dönerken serialize bile edilmez
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Iterable
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+# bump when the JSON shape of resources changes so cached ETags are invalidated
+REPRESENTATION_VERSION = 1
+
+_ORJSON_OPTS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def orjson_bytes(content: Any) -> bytes:
+    return orjson.dumps(content, option=_ORJSON_OPTS)
+
+def _if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # weak comparison, as RFC 9110 requires for If-None-Match
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    if _if_none_match(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+def json_bytes_response(request: Request, body: bytes, etag: str | None = None) -> Response:
+    if etag is None:
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+def resource_etag(obj: Any) -> str:
+    ts = obj.updated_at.timestamp() if obj.updated_at is not None else 0
+    return f'W/"{REPRESENTATION_VERSION}-{obj.id}-{ts}"'
+
+def rows_response(request: Request, rows: Iterable[Any], schema: type[BaseModel]) -> Response:
+    """Satırları `schema` alanlarıyla serialize eder (Pydantic round-trip'i yok)."""
+    fields = tuple(schema.model_fields)
+    body = orjson_bytes([{f: getattr(r, f) for f in fields} for r in rows])
+    return json_bytes_response(request, body)
+
+def row_response(request: Request, row: Any, schema: type[BaseModel]) -> Response:
+    etag = resource_etag(row)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    fields = tuple(schema.model_fields)
+    body = orjson_bytes({f: getattr(row, f) for f in fields})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
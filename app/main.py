@@ -1,13 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.api.v1.router import api_router
 from app.core.logging import setup_logging
+from app.core.compression import CompressionMiddleware
+from app.services.inline_jobs import shutdown_inline_pool, warm_inline_pool
+from app.services.uploads import start_session_sweeper, stop_session_sweeper
 
 setup_logging()
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, default_response_class=ORJSONResponse)
 
 # CORS
 origins = [o.strip() for o in settings.cors_origins.split(",") if o.strip()]
@@ -19,4 +23,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# brotli/gzip above the size threshold
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes)
+
 app.include_router(api_router, prefix="/api/v1")
+
+app.add_event_handler("startup", warm_inline_pool)
+app.add_event_handler("shutdown", shutdown_inline_pool)
+app.add_event_handler("startup", start_session_sweeper)
+app.add_event_handler("shutdown", stop_session_sweeper)
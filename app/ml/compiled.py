@@ -0,0 +1,437 @@
+"""Eğitilmiş pipeline'ların düşük gecikmeli, numpy-only inference formu.
+
+Kayıtlı sklearn `Pipeline`'ında her `predict` çağrısı ColumnTransformer,
+DataFrame kolon erişimi, imputer, scaler ve encoder'dan geçer; küçük
+isteklerde süreyi bunlar belirler. Export adımı desteklenen pipeline'ları
+düz numpy dizilerine derler ve `{run_id}.compiled.npz` olarak joblib
+artifact'ın yanına yazar:
+
+- logreg: median impute + StandardScaler + one-hot + ordinal tek bir affine
+  map'e katlanır (scaler katsayılara gömülür, one-hot kolonlar tablo lookup'ı)
+- rf: tüm ağaçlar tek bir düğüm dizisine (feature / threshold / left / right /
+  value) düzleştirilir; satır x ağaç yürüyüşleri vektörel ilerler, yaprağa
+  varanlar düşer. sklearn gibi girdiyi float32'ye çevirip ağaç sırasıyla
+  toplar, olasılıklar birebir aynı çıkar. Hedef küçük istekler: binlerce
+  satırlık batch'lerde sklearn'ün Cython yürüyüşü hâlâ daha hızlı.
+
+Desteklenmeyen adımlar (hash / infrequent / target encoding, diğer modeller)
+`NotCompilable` verir; run normal joblib artifact'ıyla devam eder. Derlenen
+form kaydedilmeden önce test split'inde orijinal pipeline'la karşılaştırılır.
+
+Yükleme ve tahmin sadece numpy kullanır (pickle yok):
+    predictor = CompiledPredictor.load(path)
+    predictor.predict([{"age": 31, "city": "izmir"}])
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Mapping
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# rows kept from the test split when checking the compiled form
+VERIFY_ROWS = 2000
+# compiled probabilities may differ from sklearn only by float rounding
+VERIFY_ATOL = 1e-9
+
+# rows x trees visited per traversal batch (bounds the node / leaf-value buffers)
+_NODE_BATCH = 1 << 18
+
+class NotCompilable(ValueError):
+    """Pipeline derlenebilir adımlardan oluşmuyor."""
+
+def _str_array(values: Any) -> np.ndarray:
+    return np.asarray([str(v) for v in values], dtype=np.str_)
+
+def _is_missing(v: Any) -> bool:
+    return v is None or (isinstance(v, float) and v != v)
+
+def _kept(imputer: Any) -> np.ndarray:
+    """Imputer'ın çıktıda tuttuğu kolonlar (tamamı boş kolonlar düşer)."""
+    stats = imputer.statistics_
+    if getattr(imputer, "keep_empty_features", False):
+        return np.ones(len(stats), dtype=bool)
+    return np.asarray([not _is_missing(v) for v in stats], dtype=bool)
+
+def _compile_categories(enc: Any, strategy: str) -> tuple[np.ndarray, np.ndarray]:
+    if strategy == "onehot":
+        if enc.drop is not None or getattr(enc, "_infrequent_enabled", False) or enc.handle_unknown != "ignore":
+            raise NotCompilable("onehot encoder with drop / infrequent categories")
+    elif enc.handle_unknown != "use_encoded_value" or enc.unknown_value != -1:
+        raise NotCompilable("ordinal encoder must map unknowns to -1")
+    cats = [_str_array(c) for c in enc.categories_]
+    for c in cats:
+        if len(set(c.tolist())) != len(c):
+            raise NotCompilable("categories collide once converted to strings")
+    offsets = np.cumsum([0] + [len(c) for c in cats]).astype(np.int64)
+    flat = np.concatenate(cats) if cats else np.empty(0, dtype=np.str_)
+    return flat, offsets
+
+def _compile_column_transformer(ct: Any) -> dict[str, Any]:
+    names = getattr(ct, "feature_names_in_", None)
+    if names is None:
+        raise NotCompilable("column transformer was not fitted on named columns")
+    position = {str(c): i for i, c in enumerate(names)}
+    spec: dict[str, Any] = {"input_columns": _str_array(names), "blocks": []}
+
+    for name, trans, cols in ct.transformers_:
+        if isinstance(trans, str) or len(cols) == 0:
+            if trans != "drop" and len(cols):
+                raise NotCompilable(f"'{trans}' transformer is not supported")
+            continue
+        idx = np.asarray([position[str(c)] for c in cols], dtype=np.int64)
+        steps = dict(trans.steps)
+        if name == "num":
+            imputer, scaler = steps["imputer"], steps.get("scaler")
+            keep = _kept(imputer)
+            spec["num_idx"] = idx[keep]
+            spec["num_fill"] = np.asarray(imputer.statistics_, dtype=np.float64)[keep]
+            n = int(keep.sum())
+            spec["num_mean"] = np.asarray(scaler.mean_ if scaler is not None and scaler.with_mean else np.zeros(n), dtype=np.float64)
+            spec["num_scale"] = np.asarray(scaler.scale_ if scaler is not None and scaler.with_std else np.ones(n), dtype=np.float64)
+            spec["blocks"].append("num")
+            continue
+
+        strategy = name.removeprefix("cat_")
+        if strategy not in ("onehot", "ordinal"):
+            raise NotCompilable(f"'{strategy}' encoding is not supported")
+        imputer = steps["imputer"]
+        keep = _kept(imputer)
+        cats, offsets = _compile_categories(steps[strategy], strategy)
+        spec[f"{strategy}_idx"] = idx[keep]
+        spec[f"{strategy}_fill"] = _str_array(np.asarray(imputer.statistics_, dtype=object)[keep])
+        spec[f"{strategy}_cats"] = cats
+        spec[f"{strategy}_offsets"] = offsets
+        spec["blocks"].append(strategy)
+    return spec
+
+def _compile_preprocess(steps: list[tuple[str, Any]], n_features: int) -> dict[str, Any]:
+    if len(steps) == 1 and hasattr(steps[0][1], "transformers_"):
+        return _compile_column_transformer(steps[0][1])
+
+    # builtin datasets: plain numeric array, optionally scaled
+    spec: dict[str, Any] = {"blocks": ["num"], "num_idx": np.arange(n_features, dtype=np.int64)}
+    spec["num_fill"] = np.full(n_features, np.nan)
+    spec["num_mean"] = np.zeros(n_features)
+    spec["num_scale"] = np.ones(n_features)
+    if not steps:
+        return spec
+    if len(steps) == 1 and hasattr(steps[0][1], "scale_"):
+        scaler = steps[0][1]
+        if scaler.with_mean:
+            spec["num_mean"] = np.asarray(scaler.mean_, dtype=np.float64)
+        if scaler.with_std:
+            spec["num_scale"] = np.asarray(scaler.scale_, dtype=np.float64)
+        return spec
+    raise NotCompilable(f"unsupported preprocess steps: {[name for name, _ in steps]}")
+
+def _encoded_widths(spec: dict[str, Any]) -> dict[str, int]:
+    widths = {"num": len(spec.get("num_idx", ()))}
+    for strategy in ("onehot", "ordinal"):
+        if f"{strategy}_idx" in spec:
+            widths[strategy] = int(spec[f"{strategy}_offsets"][-1]) if strategy == "onehot" else len(spec[f"{strategy}_idx"])
+    return widths
+
+def _logistic_link(clf: Any) -> str:
+    # same branch LogisticRegression.predict_proba takes
+    multi_class = getattr(clf, "multi_class", "auto")
+    ovr = multi_class in ("ovr", "warn") or (
+        multi_class in ("auto", "deprecated")
+        and (len(clf.classes_) <= 2 or clf.solver in ("liblinear", "newton-cholesky"))
+    )
+    if not ovr:
+        return "softmax"
+    return "logistic" if clf.coef_.shape[0] == 1 else "ovr"
+
+def _compile_linear(clf: Any, spec: dict[str, Any]) -> dict[str, np.ndarray]:
+    coef = np.asarray(clf.coef_, dtype=np.float64)
+    intercept = np.asarray(clf.intercept_, dtype=np.float64).copy()
+    widths = _encoded_widths(spec)
+    if sum(widths.values()) != coef.shape[1]:
+        raise NotCompilable("encoded width does not match the model's coefficients")
+
+    out: dict[str, np.ndarray] = {"kind": np.asarray("linear"), "link": np.asarray(_logistic_link(clf))}
+    col = 0
+    for block in spec["blocks"]:
+        w = coef[:, col:col + widths[block]]
+        col += widths[block]
+        if block == "num" and "num_dtype" in spec:
+            # float32 frames are scaled with float32 rounding; folding would skip it
+            out["coef_num"] = w
+        elif block == "num":
+            # w . (x - mean) / scale  ==  (w / scale) . x  -  w . (mean / scale)
+            out["coef_num"] = w / spec["num_scale"]
+            intercept -= w @ (spec["num_mean"] / spec["num_scale"])
+        elif block == "onehot":
+            # one-hot dot product is a lookup; the extra zero column takes unknowns
+            out["coef_onehot"] = np.hstack([w, np.zeros((w.shape[0], 1))])
+        else:
+            out["coef_ordinal"] = w
+    out["intercept"] = intercept
+    if "num_dtype" not in spec:
+        # scaling is folded into the coefficients
+        spec.pop("num_mean", None)
+        spec.pop("num_scale", None)
+    return out
+
+def _compile_forest(clf: Any, spec: dict[str, Any]) -> dict[str, np.ndarray]:
+    if getattr(clf, "n_outputs_", 1) != 1:
+        raise NotCompilable("multi-output forests are not supported")
+    if sum(_encoded_widths(spec).values()) != clf.n_features_in_:
+        raise NotCompilable("encoded width does not match the forest's features")
+
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for est in clf.estimators_:
+        tree = est.tree_
+        n = tree.node_count
+        nodes = np.arange(n, dtype=np.int64) + offset
+        leaf = tree.children_left == -1
+        # leaves point at themselves, so walking past a leaf is a no-op
+        lefts.append(np.where(leaf, nodes, tree.children_left + offset))
+        rights.append(np.where(leaf, nodes, tree.children_right + offset))
+        features.append(np.where(leaf, 0, tree.feature).astype(np.int32))
+        thresholds.append(np.where(leaf, np.inf, tree.threshold))
+        # classifier trees store class fractions per node (sklearn >= 1.4)
+        values.append(tree.value[:, 0, :])
+        roots.append(offset)
+        offset += n
+
+    node_dtype = np.int32 if offset < np.iinfo(np.int32).max else np.int64
+    return {
+        "kind": np.asarray("forest"),
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "left": np.concatenate(lefts).astype(node_dtype),
+        "right": np.concatenate(rights).astype(node_dtype),
+        "value": np.concatenate(values).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.int64),
+    }
+
+def compile_model(model: Any, numeric_dtype: str = "float64") -> dict[str, np.ndarray]:
+    """Fit edilmiş pipeline / estimator'ı `CompiledPredictor` dizilerine derler.
+
+    `numeric_dtype`: pipeline'ın fit edildiği frame'deki numeric kolon dtype'ı
+    (bellek planı float32 seçebilir, bkz. app.ml.memory_plan).
+    """
+    steps = list(model.steps) if hasattr(model, "steps") else [("clf", model)]
+    prep, (_, clf) = steps[:-1], steps[-1]
+    classes = np.asarray(clf.classes_)
+    if classes.dtype == object:
+        classes = _str_array(classes)
+
+    if hasattr(clf, "coef_") and hasattr(clf, "predict_proba"):
+        compile_clf = _compile_linear
+    elif hasattr(clf, "estimators_") and all(hasattr(e, "tree_") for e in clf.estimators_):
+        compile_clf = _compile_forest
+    else:
+        # checked first: unsupported models also come with unsupported preprocessing (hgb)
+        raise NotCompilable(f"model {type(clf).__name__} is not supported")
+
+    spec = _compile_preprocess(prep, int(getattr(clf, "n_features_in_", 0)))
+    if numeric_dtype != "float64" and "input_columns" in spec:
+        spec["num_dtype"] = np.asarray(numeric_dtype)
+    out = compile_clf(clf, spec)
+
+    spec["blocks"] = np.asarray(spec["blocks"], dtype=np.str_)
+    return {"format": np.asarray(FORMAT_VERSION), "classes": classes, **spec, **out}
+
+class CompiledPredictor:
+    """`compile_model` çıktısı üzerinde numpy-only predict / predict_proba.
+
+    Girdi: tablo pipeline'ları için `{kolon: değerler}`, kayıt listesi
+    (`[{kolon: değer}, ...]`) ya da DataFrame; builtin'ler için 2D dizi.
+    """
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        self.arrays = dict(arrays)
+        a = self.arrays
+        if int(a["format"]) != FORMAT_VERSION:
+            raise ValueError(f"unsupported compiled format: {int(a['format'])}")
+        self.kind = str(a["kind"])
+        self.classes = a["classes"]
+        self.blocks = [str(b) for b in a["blocks"]]
+        self.input_columns = [str(c) for c in a["input_columns"]] if "input_columns" in a else None
+        # category -> code lookups are rebuilt on load instead of pickled
+        self._lookups = {
+            strategy: [
+                {v: i for i, v in enumerate(a[f"{strategy}_cats"][lo:hi].tolist())}
+                for lo, hi in zip(a[f"{strategy}_offsets"][:-1], a[f"{strategy}_offsets"][1:])
+            ]
+            for strategy in ("onehot", "ordinal")
+            if f"{strategy}_offsets" in a
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledPredictor":
+        with np.load(path, allow_pickle=False) as data:
+            return cls({k: data[k] for k in data.files})
+
+    def save(self, path: str) -> int:
+        # np.savez appends .npz unless the name already has it
+        with open(path, "wb") as f:
+            np.savez(f, **self.arrays)
+        return os.path.getsize(path)
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(v.nbytes for v in self.arrays.values()))
+
+    # input
+
+    def _columns(self, X: Any) -> tuple[int, Any]:
+        """(n_rows, j -> ham kolon j) erişimcisi."""
+        if self.input_columns is None:
+            A = np.asarray(X, dtype=np.float64)
+            A = A.reshape(1, -1) if A.ndim == 1 else A
+            return A.shape[0], lambda j: A[:, j]
+        cols = self.input_columns
+        if isinstance(X, (list, tuple)) and X and isinstance(X[0], Mapping):
+            return len(X), lambda j: [row.get(cols[j]) for row in X]
+        if hasattr(X, "keys"):
+            return len(X[cols[0]]), lambda j: X[cols[j]]
+        A = np.asarray(X, dtype=object)
+        A = A.reshape(1, -1) if A.ndim == 1 else A
+        return A.shape[0], lambda j: A[:, j]
+
+    def _numeric(self, n: int, column: Any) -> np.ndarray:
+        a = self.arrays
+        idx = a.get("num_idx")
+        if idx is None or not len(idx):
+            return np.empty((n, 0))
+        dtype = np.dtype(str(a["num_dtype"])) if "num_dtype" in a else np.float64
+        Xn = np.empty((n, len(idx)), dtype=dtype)
+        for k, j in enumerate(idx):
+            Xn[:, k] = np.asarray(column(j), dtype=np.float64)
+        fill = a["num_fill"]
+        missing = np.isnan(Xn)
+        if missing.any():
+            Xn[missing] = np.broadcast_to(fill, Xn.shape)[missing]
+        if "num_mean" in a:
+            # StandardScaler works in float64 and rounds back to the frame dtype after each step
+            Xn = (Xn - a["num_mean"]).astype(dtype, copy=False)
+            Xn = (Xn / a["num_scale"]).astype(dtype, copy=False)
+        return Xn
+
+    def _codes(self, strategy: str, n: int, column: Any) -> np.ndarray:
+        """Kolon başına kategori kodu; bilinmeyen -1."""
+        a = self.arrays
+        idx, fill = a[f"{strategy}_idx"], a[f"{strategy}_fill"]
+        codes = np.empty((n, len(idx)), dtype=np.int64)
+        for k, j in enumerate(idx):
+            lookup, default = self._lookups[strategy][k], str(fill[k])
+            codes[:, k] = [lookup.get(default if _is_missing(v) else str(v), -1) for v in column(j)]
+        return codes
+
+    def _encode(self, n: int, column: Any) -> np.ndarray:
+        """ColumnTransformer'ın ürettiği dense matris (forest için)."""
+        parts = []
+        for block in self.blocks:
+            if block == "num":
+                parts.append(self._numeric(n, column))
+            elif block == "ordinal":
+                parts.append(self._codes("ordinal", n, column).astype(np.float64))
+            else:
+                codes = self._codes("onehot", n, column)
+                offsets = self.arrays["onehot_offsets"]
+                onehot = np.zeros((n, int(offsets[-1])))
+                rows, cols = np.nonzero(codes >= 0)
+                onehot[rows, offsets[cols] + codes[rows, cols]] = 1.0
+                parts.append(onehot)
+        return np.hstack(parts) if len(parts) > 1 else parts[0]
+
+    # models
+
+    def _linear_proba(self, n: int, column: Any) -> np.ndarray:
+        a = self.arrays
+        z = np.broadcast_to(a["intercept"], (n, len(a["intercept"]))).copy()
+        if "coef_num" in a:
+            z += self._numeric(n, column) @ a["coef_num"].T
+        if "coef_onehot" in a:
+            codes = self._codes("onehot", n, column)
+            gidx = np.where(codes >= 0, codes + a["onehot_offsets"][:-1], a["coef_onehot"].shape[1] - 1)
+            z += a["coef_onehot"][:, gidx].sum(axis=2).T
+        if "coef_ordinal" in a:
+            z += self._codes("ordinal", n, column) @ a["coef_ordinal"].T
+
+        link = str(a["link"])
+        if link == "logistic":
+            p = 0.5 * (1.0 + np.tanh(0.5 * z[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        if link == "ovr":
+            p = 0.5 * (1.0 + np.tanh(0.5 * z))
+            return p / p.sum(axis=1, keepdims=True)
+        if z.shape[1] == 1:
+            z = np.column_stack([-z[:, 0], z[:, 0]])
+        z = np.exp(z - z.max(axis=1, keepdims=True))
+        return z / z.sum(axis=1, keepdims=True)
+
+    def _forest_proba(self, n: int, column: Any) -> np.ndarray:
+        a = self.arrays
+        # trees compare float32 features against float64 thresholds, like sklearn
+        X = self._encode(n, column).astype(np.float32)
+        feature, threshold, left, right, value = a["feature"], a["threshold"], a["left"], a["right"], a["value"]
+        roots = a["roots"].astype(left.dtype)
+        n_trees, n_features = len(roots), X.shape[1]
+
+        proba = np.empty((n, value.shape[1]))
+        step = max(1, _NODE_BATCH // n_trees)
+        for lo in range(0, n, step):
+            Xb = X[lo:lo + step]
+            m = len(Xb)
+            # one flat (row, tree) slot per walk; only slots still on an inner node move
+            nodes = np.tile(roots, m)
+            row_base = np.repeat(np.arange(m, dtype=np.int64) * n_features, n_trees)
+            flat = Xb.ravel()
+            active = np.flatnonzero(left[nodes] != nodes)
+            while active.size:
+                at = nodes[active]
+                go_left = flat[row_base[active] + feature[at]] <= threshold[at]
+                nxt = np.where(go_left, left[at], right[at])
+                nodes[active] = nxt
+                active = active[left[nxt] != nxt]
+            # sequential sum in tree order, as the forest accumulates its trees
+            leaf_values = value[nodes].reshape(m, n_trees, -1)
+            proba[lo:lo + m] = np.cumsum(leaf_values, axis=1)[:, -1] / n_trees
+        return proba
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        n, column = self._columns(X)
+        if self.kind == "linear":
+            return self._linear_proba(n, column)
+        return self._forest_proba(n, column)
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
+
+def export_compiled(model: Any, X_check: Any, path: str, numeric_dtype: str = "float64") -> dict[str, Any]:
+    """Derler, `X_check`'in ilk `VERIFY_ROWS` satırında orijinalle karşılaştırır,
+    birebir tutarsa `path`'e yazar. Sonuç metrics'e girecek özet."""
+    try:
+        predictor = CompiledPredictor(compile_model(model, numeric_dtype))
+    except NotCompilable as e:
+        return {"compiled": False, "reason": str(e)}
+
+    X_check = X_check[:VERIFY_ROWS]
+    expected = model.predict_proba(X_check)
+    got = predictor.predict_proba(X_check)
+    max_abs_diff = float(np.max(np.abs(expected - got))) if expected.size else 0.0
+    same_labels = bool(np.array_equal(np.argmax(expected, axis=1), np.argmax(got, axis=1)))
+    info: dict[str, Any] = {
+        "compiled": False,
+        "kind": predictor.kind,
+        "verify_rows": int(len(expected)),
+        "max_abs_diff": max_abs_diff,
+        "labels_identical": same_labels,
+    }
+    if not same_labels or max_abs_diff > VERIFY_ATOL:
+        info["reason"] = "compiled predictions differ from the pipeline"
+        return info
+
+    info["compiled"] = True
+    info["path"] = path
+    info["bytes"] = predictor.save(path)
+    return info
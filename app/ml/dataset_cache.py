@@ -0,0 +1,130 @@
+"""Worker process'inde yaşayan dataset cache'i (LRU + bellek bütçesi).
+
+Aynı worker'a düşen ardışık job'lar aynı dataset'i diskten tekrar okumasın,
+builtin'ler için load_iris()/load_digits() tekrar çağrılmasın diye yüklenmiş
+(tipleri çözülmüş) dataset'ler process içinde tutulur.
+
+- key: (dosya içerik hash'i | builtin adı, kolon projeksiyonu)
+- bütçe aşılınca en az yakın zamanda kullanılan entry düşer
+- cache sadece `configure_dataset_cache` çağıran process'te aktiftir (worker);
+  API process'i cache tutmaz
+
+Cache'ten dönen objeler paylaşımlıdır: tüketiciler yerinde değiştirmemeli.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+_HASH_BLOCK = 1 << 20
+
+def object_nbytes(obj: Any) -> int:
+    """DataFrame / ndarray / tuple için kaba bellek ölçümü."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True, index=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (tuple, list)):
+        return sum(object_nbytes(o) for o in obj)
+    return 0
+
+_content_hashes: dict[tuple[str, int, float], str] = {}
+
+def file_content_hash(path: str) -> str:
+    """Dosyanın sha256'sı; (path, size, mtime) değişmedikçe process içinde memoize edilir."""
+    st = os.stat(path)
+    sig = (path, int(st.st_size), float(st.st_mtime))
+    cached = _content_hashes.get(sig)
+    if cached:
+        return cached
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    _content_hashes[sig] = digest
+    return digest
+
+class DatasetCache:
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = int(budget_bytes)
+        self._entries: OrderedDict[Hashable, tuple[Any, int, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_resident = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        routing_key: str | None = None,
+    ) -> tuple[Any, bool]:
+        """(value, hit) döner. `routing_key` job routing için saklanır."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], True
+            self.misses += 1
+
+        # load outside the lock; a concurrent miss on the same key just loads twice
+        value = loader()
+        size = object_nbytes(value)
+        if size > self.budget_bytes:
+            return value, False
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0], False
+            while self._entries and self.bytes_resident + size > self.budget_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.bytes_resident -= evicted_size
+                self.evictions += 1
+            self._entries[key] = (value, size, routing_key)
+            self.bytes_resident += size
+        return value, False
+
+    def routing_keys(self) -> set[str]:
+        with self._lock:
+            return {rk for _, _, rk in self._entries.values() if rk}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes_resident = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes_resident": self.bytes_resident,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+_cache: DatasetCache | None = None
+
+def configure_dataset_cache(budget_mb: int) -> DatasetCache | None:
+    """Process için cache'i açar (budget_mb <= 0 kapatır)."""
+    global _cache
+    _cache = DatasetCache(budget_mb * 1024 * 1024) if budget_mb > 0 else None
+    return _cache
+
+def get_dataset_cache() -> DatasetCache | None:
+    return _cache
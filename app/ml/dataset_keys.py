@@ -0,0 +1,14 @@
+"""Dataset routing key'leri.
+
+API (job routing) ve worker (cache) aynı dataset'i aynı string ile anar.
+Bu modül bilerek bağımlılıksızdır; API process'i pandas import etmeden kullanabilir.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+def dataset_routing_key(dataset_cfg: dict[str, Any]) -> str:
+    if "csv_path" in dataset_cfg:
+        return f"csv:{dataset_cfg['csv_path']}"
+    return f"builtin:{str(dataset_cfg.get('name', 'iris')).lower().strip()}"
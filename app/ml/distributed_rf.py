@@ -0,0 +1,57 @@
+"""Random forest'ı ağaç shard'larına bölerek birden fazla worker'da eğitme.
+
+sklearn ormanı her ağaç için `random_state`'ten sırayla bir seed çeker
+(`randint(MAX_INT)`). Shard i, kendinden önceki shard'ların ağaç sayısı kadar
+RNG'yi ilerletip (sklearn'ün warm_start'ta yaptığı gibi) kendi ağaçlarını fit
+eder. Böylece shard'ların birleşimi, aynı seed'le tek makinede eğitilmiş
+ormanla ağaç ağaç aynıdır; metrikler de birebir tutar.
+
+Param örneği:
+{"model": {"name": "rf", "n_estimators": 2000, "random_state": 42, "distributed": {"shards": 4}}}
+`"distributed": 4` kısayolu da olur. random_state verilmezse enqueue sırasında seçilir.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+MAX_INT = np.iinfo(np.int32).max
+
+def shard_sizes(n_estimators: int, n_shards: int) -> list[int]:
+    """Ağaçları shard'lara olabildiğince eşit böler (ilk shard'lar +1 alır)."""
+    if n_shards < 1 or n_shards > n_estimators:
+        raise ValueError(f"shards must be between 1 and n_estimators ({n_estimators}), got {n_shards}")
+    base, extra = divmod(int(n_estimators), int(n_shards))
+    return [base + (1 if i < extra else 0) for i in range(n_shards)]
+
+def shard_forest_params(
+    n_estimators: int, random_state: Any, index: int, n_shards: int
+) -> tuple[int, np.random.RandomState]:
+    """Shard'ın (ağaç sayısı, önceki shard'ların seed'leri kadar ilerletilmiş RNG)'si."""
+    if random_state is None:
+        raise ValueError("distributed rf needs an integer model.random_state")
+    sizes = shard_sizes(n_estimators, n_shards)
+    offset = sum(sizes[:index])
+    rng = np.random.RandomState(int(random_state))
+    if offset:
+        # same advance BaseForest.fit does for warm_start
+        rng.randint(MAX_INT, size=offset)
+    return sizes[index], rng
+
+def merge_forests(forests: list[RandomForestClassifier], random_state: Any = None) -> RandomForestClassifier:
+    """Shard ormanlarını (shard sırasıyla) tek bir ormanda birleştirir."""
+    if not forests:
+        raise ValueError("no forests to merge")
+    first = forests[0]
+    for f in forests[1:]:
+        if not np.array_equal(f.classes_, first.classes_) or f.n_features_in_ != first.n_features_in_:
+            raise ValueError("shards were fitted on different data (classes or features differ)")
+    merged = copy.copy(first)
+    merged.estimators_ = [tree for f in forests for tree in f.estimators_]
+    # plain int seed in the artifact instead of a shard's advanced RandomState
+    merged.set_params(n_estimators=len(merged.estimators_), random_state=random_state)
+    return merged
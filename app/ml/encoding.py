@@ -0,0 +1,196 @@
+"""Kategorik kolonlar için kardinaliteye duyarlı encoding.
+
+Strateji (kolon başına, `preprocess` içinden override edilebilir):
+- onehot:     düşük kardinalite -> OneHotEncoder (sparse)
+- infrequent: orta kardinalite (linear) -> OneHotEncoder + nadir kategorileri tek kovada toplar
+- hash:       yüksek kardinalite (linear) -> sabit genişlikte feature hashing (sparse)
+- ordinal:    orta kardinalite (tree) -> OrdinalEncoder
+- target:     yüksek kardinalite (tree) -> TargetEncoder
+- native:     hgb, max_bins'e kadar -> OrdinalEncoder kodları; model kategorik olarak
+              böler, eksik / bilinmeyen değer NaN kalır (impute yok)
+
+Param örneği:
+{
+  "preprocess": {
+    "cat_encoding": "auto",          # auto|onehot|infrequent|hash|ordinal|target|native
+    "max_onehot_cardinality": 50,
+    "hash_cardinality": 1000,
+    "hash_n_features": 1024,
+    "min_frequency": 10,
+    "encodings": {"user_id": "hash"}  # kolon bazlı override
+  }
+}
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.pipeline import Pipeline
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, OrdinalEncoder, TargetEncoder
+
+STRATEGIES = ("onehot", "infrequent", "hash", "ordinal", "target", "native")
+
+TREE_MODELS = ("rf", "random_forest", "randomforest")
+# models that split on categorical codes themselves (HistGradientBoostingClassifier)
+NATIVE_CATEGORICAL_MODELS = ("hgb", "hist_gradient_boosting", "histgradientboosting")
+
+DEFAULT_MAX_ONEHOT_CARDINALITY = 50
+DEFAULT_HASH_CARDINALITY = 1000
+DEFAULT_HASH_N_FEATURES = 1024
+DEFAULT_MIN_FREQUENCY = 10
+# HistGradientBoosting's default; native categoricals must fit in the bins
+DEFAULT_MAX_BINS = 255
+
+class HashingEncoder(TransformerMixin, BaseEstimator):
+    """Kategorik kolonları sabit genişlikte sparse matrise hash'ler.
+
+    `pd.util.hash_array` sabit anahtarlı siphash kullanır; yani hash'ler
+    process'ler arası stabildir ve joblib ile kaydedilen model aynı kolonları
+    aynı index'lere düşürür. Her kolon ayrı bir anahtarla hash'lenir ki farklı
+    kolonlardaki aynı değer çakışmasın.
+    """
+
+    def __init__(self, n_features: int = DEFAULT_HASH_N_FEATURES, alternate_sign: bool = True, dtype: Any = np.float64):
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+        self.dtype = dtype
+
+    def fit(self, X, y=None):
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def transform(self, X) -> sp.csr_matrix:
+        X = np.asarray(X, dtype=object)
+        n_rows, n_cols = X.shape
+        n_features = int(self.n_features)
+
+        indices = np.empty((n_rows, n_cols), dtype=np.int64)
+        # artifacts pickled before `dtype` existed stay float64
+        data = np.ones((n_rows, n_cols), dtype=getattr(self, "dtype", np.float64))
+        for j in range(n_cols):
+            # hash each distinct value once; a per-row str copy dominated peak memory
+            key = f"{j:016d}"
+            codes, uniques = pd.factorize(X[:, j])
+            h = pd.util.hash_array(np.asarray(uniques, dtype=object).astype(str), hash_key=key)[codes]
+            na = codes < 0
+            if na.any():
+                # factorize folds None/NaN together; their str() differs
+                h[na] = pd.util.hash_array(X[na, j].astype(str), hash_key=key)
+            indices[:, j] = (h % np.uint64(n_features)).astype(np.int64)
+            if self.alternate_sign:
+                # top bit as sign, keeps collisions unbiased in expectation
+                data[(h >> np.uint64(63)).astype(bool), j] = -1.0
+
+        indptr = np.arange(0, n_rows * n_cols + 1, n_cols, dtype=np.int64)
+        out = sp.csr_matrix((data.ravel(), indices.ravel(), indptr), shape=(n_rows, n_features))
+        out.sum_duplicates()
+        return out
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray([f"hash_{i}" for i in range(int(self.n_features))], dtype=object)
+
+def is_tree_model(model_cfg: dict[str, Any]) -> bool:
+    name = (model_cfg.get("name") or "logreg").lower().strip()
+    return name in TREE_MODELS
+
+def supports_native_categorical(model_cfg: dict[str, Any]) -> bool:
+    name = (model_cfg.get("name") or "logreg").lower().strip()
+    return name in NATIVE_CATEGORICAL_MODELS
+
+def choose_strategy(n_unique: int, tree: bool, preprocess_cfg: dict[str, Any], native_max: int | None = None) -> str:
+    """Kolon istatistiğinden encoding stratejisi seçer.
+
+    `native_max`: model kategorileri kendisi bölüyorsa (hgb) kaç kategoriye kadar.
+    """
+    forced = (preprocess_cfg.get("cat_encoding") or "auto").lower()
+    if forced != "auto":
+        if forced not in STRATEGIES:
+            raise ValueError(f"unknown cat_encoding: {forced}. expected one of {STRATEGIES}")
+        return forced
+
+    max_onehot = int(preprocess_cfg.get("max_onehot_cardinality", DEFAULT_MAX_ONEHOT_CARDINALITY))
+    hash_card = int(preprocess_cfg.get("hash_cardinality", DEFAULT_HASH_CARDINALITY))
+
+    if native_max is not None:
+        return "native" if n_unique <= native_max else "target"
+    if n_unique <= max_onehot:
+        return "onehot"
+    if tree:
+        return "ordinal" if n_unique <= hash_card else "target"
+    return "infrequent" if n_unique <= hash_card else "hash"
+
+def plan_categorical(
+    cardinalities: dict[str, int],
+    model_cfg: dict[str, Any],
+    preprocess_cfg: dict[str, Any],
+) -> dict[str, list[str]]:
+    """Kolonları stratejiye göre gruplar: {strategy: [col, ...]}."""
+    tree = is_tree_model(model_cfg)
+    native = supports_native_categorical(model_cfg)
+    native_max = int(model_cfg.get("max_bins", DEFAULT_MAX_BINS)) if native else None
+    overrides = preprocess_cfg.get("encodings") or {}
+    plan: dict[str, list[str]] = {}
+    for col, n_unique in cardinalities.items():
+        strategy = overrides.get(col) or choose_strategy(n_unique, tree, preprocess_cfg, native_max)
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown encoding for column '{col}': {strategy}")
+        if strategy == "native" and not native:
+            raise ValueError(f"native encoding for column '{col}' needs a model with categorical support: {NATIVE_CATEGORICAL_MODELS}")
+        plan.setdefault(strategy, []).append(col)
+    return plan
+
+def as_float32(X: Any) -> Any:
+    return X.astype(np.float32)
+
+def build_categorical_pipe(strategy: str, preprocess_cfg: dict[str, Any], dtype: Any = np.float64) -> Pipeline:
+    """`dtype`: encoder çıktısının dtype'ı (bellek planı float32 seçebilir, bkz. app.ml.memory_plan)."""
+    if strategy == "hash":
+        # constant fill is O(n) and keeps "missing" as its own bucket
+        return Pipeline(
+            steps=[
+                ("imputer", SimpleImputer(strategy="constant", fill_value="__missing__")),
+                ("hash", HashingEncoder(n_features=int(preprocess_cfg.get("hash_n_features", DEFAULT_HASH_N_FEATURES)), dtype=dtype)),
+            ]
+        )
+
+    if strategy == "native":
+        # codes only; the model routes NaN (missing or unseen) on its own
+        encoder = OrdinalEncoder(
+            handle_unknown="use_encoded_value", unknown_value=np.nan, encoded_missing_value=np.nan, dtype=dtype
+        )
+        return Pipeline(steps=[(strategy, encoder)])
+
+    imputer = ("imputer", SimpleImputer(strategy="most_frequent"))
+    if strategy == "onehot":
+        encoder = OneHotEncoder(handle_unknown="ignore", dtype=dtype)
+    elif strategy == "infrequent":
+        encoder = OneHotEncoder(
+            handle_unknown="infrequent_if_exist",
+            min_frequency=int(preprocess_cfg.get("min_frequency", DEFAULT_MIN_FREQUENCY)),
+            max_categories=preprocess_cfg.get("max_categories"),
+            dtype=dtype,
+        )
+    elif strategy == "ordinal":
+        encoder = OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1, dtype=dtype)
+    elif strategy == "target":
+        encoder = TargetEncoder(random_state=preprocess_cfg.get("random_state", 42))
+        if np.dtype(dtype) == np.float32:
+            # TargetEncoder has no dtype option; cast so the stacked matrix stays float32
+            return Pipeline(steps=[imputer, (strategy, encoder), ("cast", FunctionTransformer(as_float32, feature_names_out="one-to-one"))])
+    else:
+        raise ValueError(f"unknown encoding strategy: {strategy}")
+    return Pipeline(steps=[imputer, (strategy, encoder)])
+
+def matrix_nbytes(X: Any) -> int:
+    """Dense/sparse matrisin bellekte kapladığı byte."""
+    if sp.issparse(X):
+        X = X.tocsr()
+        return int(X.data.nbytes + X.indices.nbytes + X.indptr.nbytes)
+    return int(np.asarray(X).nbytes)
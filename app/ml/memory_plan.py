@@ -0,0 +1,421 @@
+"""Fit öncesi bellek planı: dtype ve gösterim seçimi.
+
+run_baseline CSV'yi yüklemeden önce dataset profilinden (yoksa dosya boyutu +
+ilk satırlardan) ve param'lardan üç aşamanın belleğini tahmin eder:
+- load:   DataFrame + feature kopyası + train/test split kopyaları
+- encode: ColumnTransformer çıktısı (one-hot / hash sparse, numeric / ordinal dense);
+          blok'lar birleştirilirken (sparse hstack coo üzerinden gider) ~3 katı
+- fit:    modelin girdi kopyası (rf float32'ye, lbfgs / hgb float64'e çevirir;
+          hgb ayrıca early stopping split'i ve uint8 bin'ler) + çalışma belleği +
+          fit edilen model (ağaç düğümleri)
+
+Plan, worker'ın kullanılabilir belleğine (`WORKER_MEMORY_MB`, yoksa cgroup
+limiti / fiziksel RAM, eksi process'in o anki RSS'i) göre seçilir:
+- full:    tahmin sığıyorsa hiçbir şey değişmez
+- compact: numeric kolonlar float32, kategorik kolonlar pandas `category`
+           (hücre başına 8 byte pointer yerine 1-2 byte kod), ağaç modellerinde
+           encode çıktısı float32; one-hot / hash çıktısı zaten sparse kalır.
+           CSV parça parça okunur, her parça okunur okunmaz küçültülür
+- sığmıyorsa run iş başlamadan, neyin ne kadar yer tuttuğunu söyleyen bir
+  hatayla reddedilir
+
+Plan ve gerçek tepe RSS metrics["memory"]'ye yazılır.
+
+Param: {"memory": {"plan": "auto"}}  # auto|full|compact|off
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import resource
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from app.core.config import settings
+from app.ml.encoding import (
+    DEFAULT_HASH_N_FEATURES,
+    DEFAULT_MAX_BINS,
+    DEFAULT_MIN_FREQUENCY,
+    is_tree_model,
+    plan_categorical,
+    supports_native_categorical,
+)
+
+MB = 1024 * 1024
+PLANS = ("auto", "full", "compact", "off")
+
+# share of the worker limit a single run may plan for
+HEADROOM = 0.85
+# rows read to size string cells when sniffing the file
+_SNIFF_ROWS = 1000
+# rows parsed at a time by the compact reader
+_CHUNK_ROWS = 100_000
+# CPython str object header; ascii text adds one byte per char
+_STR_OVERHEAD = 49
+# sklearn tree Node struct
+_TREE_NODE_BYTES = 64
+# nodes per training row of a fully grown tree (measured ~0.45 on noisy tabular data)
+_NODES_PER_ROW = 0.5
+# lbfgs keeps m=10 correction pairs of the coefficient vector
+_LBFGS_HISTORY = 10
+# hgb histogram bin: sum_gradients, sum_hessians (float64) + count (uint32)
+_HGB_BIN_BYTES = 20
+
+@dataclass
+class MemoryPlan:
+    mode: str  # full|compact|off
+    numeric_dtype: str = "float64"
+    categorical_dtype: str = "object"
+    encoded_dtype: str = "float64"
+    sparse: bool = False
+    estimate: dict[str, int] = field(default_factory=dict)
+    full_peak_bytes: int | None = None
+    available_bytes: int | None = None
+    numeric_cols: list[str] = field(default_factory=list)
+
+    @property
+    def compact(self) -> bool:
+        return self.mode == "compact"
+
+    def to_dict(self) -> dict[str, Any]:
+        out = asdict(self)
+        out.pop("numeric_cols")
+        out["estimate_mb"] = {k: round(v / MB, 1) for k, v in out.pop("estimate").items()}
+        for key in ("full_peak_bytes", "available_bytes"):
+            value = out.pop(key)
+            out[key.replace("_bytes", "_mb")] = round(value / MB, 1) if value is not None else None
+        return out
+
+# process memory
+
+def _read_int(path: str) -> int | None:
+    try:
+        with open(path) as f:
+            raw = f.read().strip()
+    except OSError:
+        return None
+    return int(raw) if raw.isdigit() else None
+
+def memory_limit_bytes() -> int:
+    """Worker'ın bellek sınırı: config > cgroup (v2 / v1) > fiziksel RAM."""
+    if settings.worker_memory_mb > 0:
+        return settings.worker_memory_mb * MB
+    limits = [
+        _read_int("/sys/fs/cgroup/memory.max"),
+        _read_int("/sys/fs/cgroup/memory/memory.limit_in_bytes"),
+        os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"),
+    ]
+    # cgroup v1 reports "no limit" as a huge number
+    return min(v for v in limits if v and v < 1 << 60)
+
+def cpu_limit() -> int:
+    """Worker'a ayrılan CPU sayısı: config > cgroup kotası (v2 / v1) > cpu affinity.
+
+    OpenMP (hgb) kotayı görmez, container'da host'un tüm çekirdeklerini açar.
+    """
+    if settings.worker_cpus > 0:
+        return settings.worker_cpus
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = period = None
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            raw_quota, raw_period = f.read().split()
+        if raw_quota != "max":
+            quota, period = int(raw_quota), int(raw_period)
+    except (OSError, ValueError):
+        # v1 reports "no quota" as -1, which _read_int skips
+        quota = _read_int("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period = _read_int("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period:
+        cpus = min(cpus, math.ceil(quota / period))
+    return max(1, cpus)
+
+def _status_kb(key: str) -> int | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def current_rss_bytes() -> int:
+    kb = _status_kb("VmRSS")
+    return kb * 1024 if kb is not None else peak_rss_bytes()
+
+def reset_peak_rss() -> bool:
+    """Tepe RSS sayacını sıfırlar (Linux clear_refs); long-lived worker'da run başına ölçüm için."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def peak_rss_bytes() -> int:
+    kb = _status_kb("VmHWM")
+    if kb is None:
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(kb) * 1024
+
+# dataset shape
+
+def _sniff(csv_path: str, usecols: list[str] | None) -> tuple[pd.DataFrame, int]:
+    """İlk satırlar + dosya boyutundan satır sayısı tahmini."""
+    head = pd.read_csv(csv_path, nrows=_SNIFF_ROWS, usecols=usecols)
+    with open(csv_path, "rb") as f:
+        head_bytes = sum(len(line) for _, line in zip(range(len(head) + 1), f))
+    size = os.path.getsize(csv_path)
+    if len(head) < _SNIFF_ROWS:
+        return head, len(head)
+    return head, int(size / max(1.0, head_bytes / (len(head) + 1)))
+
+def _columns(
+    csv_path: str, target_col: str, usecols: list[str] | None, profile: dict[str, Any] | None
+) -> tuple[int, dict[str, dict[str, Any]]]:
+    """(n_rows, {kolon: {numeric, distinct, str_len}}) — profil varsa sayılar oradan."""
+    head, n_rows = _sniff(csv_path, usecols)
+    profiled = (profile or {}).get("columns", {})
+    if profile and profile.get("n_rows") is not None:
+        n_rows = int(profile["n_rows"])
+    cols = {}
+    for c in head.columns:
+        s = head[c]
+        numeric = pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype)
+        if c in profiled:
+            numeric = profiled[c]["kind"] == "numeric"
+            distinct = int(profiled[c]["distinct"])
+        else:
+            uniq = int(s.nunique(dropna=True))
+            # mostly-unique head: assume the column keeps growing with the file
+            distinct = int(uniq * n_rows / max(1, len(s))) if uniq > len(s) // 2 else uniq
+        str_len = 0.0 if numeric else float(s.dropna().astype(str).str.len().mean() or 0.0)
+        cols[c] = {"numeric": numeric, "distinct": max(1, min(distinct, n_rows)), "str_len": str_len}
+    if target_col not in cols:
+        raise ValueError(f"target_col '{target_col}' not found. columns={list(cols)}")
+    return n_rows, cols
+
+# estimate
+
+def _code_bytes(distinct: int) -> int:
+    return 1 if distinct < 2**7 else 2 if distinct < 2**15 else 4
+
+def _estimate(
+    n_rows: int,
+    cols: dict[str, dict[str, Any]],
+    target_col: str,
+    params: dict[str, Any],
+    compact: bool,
+) -> tuple[dict[str, int], bool]:
+    model_cfg = params.get("model") or {}
+    preprocess_cfg = params.get("preprocess") or {"scale_numeric": True, "onehot": True}
+    test_size = float((params.get("split") or {}).get("test_size", 0.2))
+    tree = is_tree_model(model_cfg)
+    native = supports_native_categorical(model_cfg)
+    item = 4 if compact else 8
+    enc_item = 4 if compact and tree else 8
+    n_train = max(1, int(n_rows * (1 - test_size)))
+    n_classes = max(2, cols[target_col]["distinct"])
+
+    # load: one frame, the feature copy (drop target), the split copies (train + test)
+    # and pandas' take buffers; unique strings are shared, only the cells are copied
+    frame = cells = 0
+    for name, c in cols.items():
+        if c["numeric"]:
+            # the target is never downcast
+            col_cells, strings = n_rows * (8 if name == target_col else item), 0
+        elif compact and name != target_col:
+            col_cells, strings = n_rows * _code_bytes(c["distinct"]), c["distinct"] * (_STR_OVERHEAD + c["str_len"] + 8)
+        else:
+            col_cells, strings = n_rows * 8, c["distinct"] * (_STR_OVERHEAD + c["str_len"])
+        frame += col_cells + strings
+        if name != target_col:
+            cells += col_cells
+    load = int(frame + 3 * cells + n_rows * 16)
+
+    # encode: train matrix, test matrix at predict time
+    features = {n: c for n, c in cols.items() if n != target_col}
+    n_num = sum(1 for c in features.values() if c["numeric"])
+    categorical = {n: c["distinct"] for n, c in features.items() if not c["numeric"]}
+    strategies = plan_categorical(categorical, model_cfg, preprocess_cfg) if preprocess_cfg.get("onehot", True) else {}
+    # hgb needs dense input, the preprocessor densifies forced onehot / hash blocks
+    sparse = not native and any(s in strategies for s in ("onehot", "infrequent", "hash"))
+    width = n_num
+    nnz_row = n_num
+    for strategy, names in strategies.items():
+        if strategy == "onehot":
+            width += sum(categorical[n] for n in names)
+        elif strategy == "infrequent":
+            min_freq = int(preprocess_cfg.get("min_frequency", DEFAULT_MIN_FREQUENCY))
+            width += sum(min(categorical[n], n_rows // max(1, min_freq) + 1) for n in names)
+        elif strategy == "hash":
+            width += int(preprocess_cfg.get("hash_n_features", DEFAULT_HASH_N_FEATURES))
+        elif strategy == "target":
+            width += len(names) * (1 if n_classes <= 2 else n_classes)
+            nnz_row += len(names) * (0 if n_classes <= 2 else n_classes - 1)
+        else:
+            width += len(names)
+        nnz_row += len(names)
+    if sparse:
+        per_row = nnz_row * (enc_item + 4) + 4
+    else:
+        per_row = width * enc_item
+    enc_train = n_train * per_row
+    enc_test = (n_rows - n_train) * per_row
+    # hstack holds the blocks, the coo intermediate and the csr result together
+    encode = 3 * enc_train
+
+    # fit: input copy + working memory + fitted model
+    if tree:
+        n_estimators = int(model_cfg.get("n_estimators", 200))
+        max_depth = model_cfg.get("max_depth")
+        nodes = n_train * _NODES_PER_ROW
+        if max_depth is not None:
+            nodes = min(nodes, 2 ** (int(max_depth) + 1) - 1)
+        model = int(n_estimators * nodes * (_TREE_NODE_BYTES + 8 * n_classes))
+        # forests fit on float32 (csc when sparse); float64 input is copied
+        copy = 0 if enc_item == 4 and not sparse else n_train * (nnz_row * 8 + 4 if sparse else width * 4)
+        working = cpu_limit() * n_train * 16
+    elif native:
+        k = 1 if n_classes <= 2 else n_classes
+        leaves = int(model_cfg.get("max_leaf_nodes") or 31)
+        bins = int(model_cfg.get("max_bins", DEFAULT_MAX_BINS)) + 1
+        model = int(model_cfg.get("max_iter", 200)) * k * 2 * leaves * _TREE_NODE_BYTES
+        # the early-stopping split copies the input, then both parts are binned to uint8
+        copy = enc_train + n_train * width
+        # gradients / hessians (float32) + raw predictions (float64), histograms of open leaves
+        working = n_train * k * 16 + leaves * width * bins * _HGB_BIN_BYTES
+    else:
+        k = 1 if n_classes <= 2 else n_classes
+        model = width * k * 8
+        # lbfgs always fits on float64
+        copy = 0 if enc_item == 8 else enc_train * 2
+        working = n_train * k * 8 * 3 + width * k * 8 * 2 * _LBFGS_HISTORY
+    fit = int(enc_train + copy + working + model)
+
+    estimate = {
+        "load": load,
+        "encode": int(encode),
+        "fit": fit,
+        "predict": int(enc_test + (n_rows - n_train) * n_classes * 8 * 2),
+        "peak": int(load + max(encode, fit + enc_test)),
+    }
+    return estimate, sparse
+
+def _reject(estimate: dict[str, int], available: int) -> ValueError:
+    parts = ", ".join(f"{k} {v / MB:.0f} MB" for k, v in estimate.items() if k != "peak")
+    return ValueError(
+        f"run needs about {estimate['peak'] / MB:.0f} MB ({parts}) even with float32 / category "
+        f"columns, but the worker has {available / MB:.0f} MB available. "
+        f"Use dataset.sample, dataset.columns, fewer trees / max_depth or a larger worker."
+    )
+
+def plan_csv_memory(
+    params: dict[str, Any],
+    csv_path: str,
+    target_col: str,
+    usecols: list[str] | None = None,
+    profile: dict[str, Any] | None = None,
+    n_rows: int | None = None,
+) -> MemoryPlan:
+    """Yüklemeden önce planı seçer; sığmıyorsa ValueError.
+
+    `n_rows`: gerçekten belleğe alınacak satır sayısı (örneklemde sample.n).
+    """
+    requested = ((params.get("memory") or {}).get("plan") or "auto").lower()
+    if requested not in PLANS:
+        raise ValueError(f"unknown memory.plan: {requested}. expected one of {PLANS}")
+    if requested == "off":
+        return MemoryPlan(mode="off")
+
+    total_rows, cols = _columns(csv_path, target_col, usecols, profile)
+    rows = min(total_rows, n_rows) if n_rows else total_rows
+    available = int(memory_limit_bytes() * HEADROOM) - current_rss_bytes()
+
+    full, sparse = _estimate(rows, cols, target_col, params, compact=False)
+    if requested == "full" or (requested == "auto" and full["peak"] <= available):
+        if requested == "full" and full["peak"] > available:
+            raise _reject(full, available)
+        return MemoryPlan("full", sparse=sparse, estimate=full, full_peak_bytes=full["peak"], available_bytes=available)
+
+    compact, sparse = _estimate(rows, cols, target_col, params, compact=True)
+    if compact["peak"] > available:
+        raise _reject(compact, available)
+    tree = is_tree_model(params.get("model") or {})
+    return MemoryPlan(
+        "compact",
+        numeric_dtype="float32",
+        categorical_dtype="category",
+        encoded_dtype="float32" if tree else "float64",
+        sparse=sparse,
+        estimate=compact,
+        full_peak_bytes=full["peak"],
+        available_bytes=available,
+        numeric_cols=[n for n, c in cols.items() if c["numeric"]],
+    )
+
+def apply_plan(df: pd.DataFrame, plan: MemoryPlan, target_col: str) -> pd.DataFrame:
+    """Belleğe alınmış frame'i (örneklem, read_csv_compact fallback'i) plana göre küçültür."""
+    if not plan.compact:
+        return df
+    for c in df.columns:
+        if c == target_col:
+            continue
+        dt = df[c].dtype
+        if isinstance(dt, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_bool_dtype(dt):
+            # string categories like read_csv(dtype="category") gives; sklearn can't
+            # validate a frame mixing bool / bool-category and string-category columns
+            df[c] = df[c].astype(str).astype(plan.categorical_dtype)
+        elif pd.api.types.is_numeric_dtype(dt):
+            if dt != plan.numeric_dtype:
+                df[c] = df[c].astype(plan.numeric_dtype)
+        else:
+            df[c] = df[c].astype(plan.categorical_dtype)
+    return df
+
+def read_csv_compact(
+    csv_path: str, plan: MemoryPlan, target_col: str, usecols: list[str] | None = None
+) -> pd.DataFrame:
+    """Compact planda CSV'yi `_CHUNK_ROWS`'luk parçalarla okur.
+
+    `read_csv(dtype="category")` kolonu önce object olarak parse ettiği için tepe
+    full okumadan da yüksek çıkar; burada bir anda yalnızca bir parça object'tir.
+    Kategorik kolonlar str okunur (bool'lar da "True"/"False" olur), parçaların
+    kategorileri `union_categoricals` ile birleştirilir.
+    """
+    numeric = set(plan.numeric_cols)
+    head = pd.read_csv(csv_path, nrows=0, usecols=usecols)
+    dtype = {c: (plan.numeric_dtype if c in numeric else str) for c in head.columns if c != target_col}
+    categorical = [c for c, t in dtype.items() if t is str]
+    try:
+        parts = [
+            _categorize(chunk, categorical)
+            for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtype, chunksize=_CHUNK_ROWS)
+        ]
+    except ValueError:
+        # a column the first rows showed as numeric holds text further down
+        return apply_plan(pd.read_csv(csv_path, usecols=usecols, dtype=dict.fromkeys(categorical, str)), plan, target_col)
+    if not parts:
+        return apply_plan(head, plan, target_col)
+
+    out = {}
+    for c in head.columns:
+        pieces = [p.pop(c) for p in parts]
+        if isinstance(pieces[0].dtype, pd.CategoricalDtype):
+            out[c] = union_categoricals(pieces, sort_categories=True)
+        else:
+            out[c] = pd.concat(pieces, ignore_index=True).to_numpy()
+        del pieces
+    return pd.DataFrame(out, columns=head.columns)
+
+def _categorize(chunk: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    for c in columns:
+        chunk[c] = chunk[c].astype("category")
+    return chunk
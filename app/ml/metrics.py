@@ -0,0 +1,170 @@
+"""Tek geçişli, vektörize sınıflandırma metrikleri.
+
+Confusion matrix bir kez `np.bincount` ile kurulur; accuracy, precision /
+recall / f1 (macro + sınıf bazlı) hepsi ondan türetilir. `predict_proba`
+verilirse ROC-AUC (binary ya da one-vs-rest macro) ve log-loss eklenir.
+
+`MetricsAccumulator` chunk chunk beslenebilir (streamed evaluation); sonuçlar
+sklearn'ün `accuracy_score`, `precision_recall_fscore_support(average="macro",
+zero_division=0)`, `confusion_matrix`, `roc_auc_score` ve `log_loss` ile aynı
+formülleri aynı sırada uygular, yani sayılar birebir eşleşir.
+
+Not: AUC sıralama gerektirdiğinden skorlar, log-loss ise sklearn ile aynı
+toplama sırası için satır bazlı kayıplar olarak tutulur (satır başına birkaç float).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from scipy.special import xlogy
+
+def _safe_divide(num: np.ndarray, denom: np.ndarray) -> np.ndarray:
+    # zero_division=0, same as sklearn's _prf_divide
+    mask = denom == 0.0
+    denom = denom.copy()
+    denom[mask] = 1
+    out = num / denom
+    out[mask] = 0.0
+    return out
+
+def _binary_auc(y_true: np.ndarray, score: np.ndarray) -> float:
+    """sklearn roc_curve(drop_intermediate=True) + trapezoid ile aynı hesap."""
+    desc = np.argsort(score, kind="mergesort")[::-1]
+    score = score[desc]
+    y = y_true[desc].astype(np.float64)
+
+    distinct = np.where(np.diff(score))[0]
+    threshold_idxs = np.r_[distinct, y.size - 1]
+    tps = np.cumsum(y, dtype=np.float64)[threshold_idxs]
+    fps = 1 + threshold_idxs - tps
+
+    if len(fps) > 2:
+        optimal = np.where(np.r_[True, np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), True])[0]
+        fps, tps = fps[optimal], tps[optimal]
+
+    tps = np.r_[0, tps]
+    fps = np.r_[0, fps]
+    if fps[-1] <= 0 or tps[-1] <= 0:
+        return float("nan")
+    fpr = fps / fps[-1]
+    tpr = tps / tps[-1]
+    return float(np.trapezoid(tpr, fpr))
+
+class MetricsAccumulator:
+    """Chunk'lar üzerinden biriken confusion matrix + olasılık metrikleri.
+
+    `classes`: modelin `classes_` sırası; predict_proba kolonları bu sırada kabul edilir.
+    """
+
+    def __init__(self, classes: np.ndarray | list | None = None):
+        self.classes = np.asarray(classes) if classes is not None else None
+        self.labels = np.empty(0, dtype=self.classes.dtype if self.classes is not None else object)
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self._y_true: list[np.ndarray] = []
+        self._proba: list[np.ndarray] = []
+        self._losses: list[np.ndarray] = []
+        self.n = 0
+
+    def _grow_labels(self, new_labels: np.ndarray) -> None:
+        merged = np.union1d(self.labels, new_labels) if self.labels.size else new_labels
+        if merged.size == self.labels.size:
+            return
+        old_pos = np.searchsorted(merged, self.labels)
+        counts = np.zeros((merged.size, merged.size), dtype=np.int64)
+        counts[np.ix_(old_pos, old_pos)] = self.counts
+        self.labels, self.counts = merged, counts
+
+    def update(self, y_true: Any, y_pred: Any, proba: np.ndarray | None = None) -> None:
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred)
+        if y_true.shape[0] != y_pred.shape[0]:
+            raise ValueError("y_true and y_pred have different lengths")
+        self._grow_labels(np.unique(np.concatenate([y_true, y_pred])))
+
+        k = self.labels.size
+        t = np.searchsorted(self.labels, y_true)
+        p = np.searchsorted(self.labels, y_pred)
+        self.counts += np.bincount(t * k + p, minlength=k * k).reshape(k, k)
+        self.n += int(y_true.shape[0])
+
+        if proba is not None:
+            if self.classes is None:
+                raise ValueError("classes are required for probability metrics")
+            proba = np.asarray(proba, dtype=np.float64)
+            self._y_true.append(y_true)
+            self._proba.append(proba)
+            self._losses.append(self._row_log_loss(y_true, proba))
+
+    def _row_log_loss(self, y_true: np.ndarray, proba: np.ndarray) -> np.ndarray:
+        eps = np.finfo(proba.dtype).eps
+        if proba.ndim == 1:
+            proba = proba[:, np.newaxis]
+        if proba.shape[1] == 1:
+            proba = np.append(1 - proba, proba, axis=1)
+        proba = np.clip(proba, eps, 1 - eps)
+        onehot = (y_true[:, np.newaxis] == self.classes[np.newaxis, :]).astype(np.int64)
+        # scipy's xlogy (not np.log) so the last bits agree with sklearn
+        return -xlogy(onehot, proba).sum(axis=1)
+
+    def confusion_matrix(self) -> np.ndarray:
+        return self.counts
+
+    def _roc_auc(self) -> float | None:
+        y_true = np.concatenate(self._y_true)
+        proba = np.concatenate(self._proba)
+        present = np.unique(y_true)
+        if present.size < 2 or self.classes is None or present.size != self.classes.size:
+            # sklearn refuses AUC when the evaluated set lacks a class
+            return None
+        if present.size == 2:
+            return _binary_auc(y_true == self.classes[1], proba[:, 1])
+        scores = np.array([_binary_auc(y_true == c, proba[:, j]) for j, c in enumerate(self.classes)])
+        return float(np.average(scores))
+
+    def compute(self, per_class: bool = True) -> dict[str, Any]:
+        cm = self.counts
+        tp = np.diag(cm)
+        pred_sum = cm.sum(axis=0)
+        true_sum = cm.sum(axis=1)
+
+        precision = _safe_divide(tp.astype(np.float64), pred_sum.astype(np.float64))
+        recall = _safe_divide(tp.astype(np.float64), true_sum.astype(np.float64))
+        beta2 = 1.0
+        f1 = _safe_divide((1 + beta2) * tp, beta2 * true_sum + pred_sum)
+
+        out: dict[str, Any] = {
+            "accuracy": float(tp.sum() / self.n) if self.n else 0.0,
+            "f1_macro": float(np.average(f1)) if f1.size else 0.0,
+            "precision_macro": float(np.average(precision)) if precision.size else 0.0,
+            "recall_macro": float(np.average(recall)) if recall.size else 0.0,
+            "confusion_matrix": cm.tolist(),
+            "labels": self.labels.tolist(),
+        }
+        if per_class:
+            out["per_class"] = {
+                str(label): {
+                    "precision": float(precision[i]),
+                    "recall": float(recall[i]),
+                    "f1": float(f1[i]),
+                    "support": int(true_sum[i]),
+                }
+                for i, label in enumerate(self.labels.tolist())
+            }
+        if self._losses:
+            out["log_loss"] = float(np.average(np.concatenate(self._losses)))
+            out["roc_auc"] = self._roc_auc()
+        return out
+
+def classification_metrics(
+    y_true: Any,
+    y_pred: Any,
+    proba: np.ndarray | None = None,
+    classes: np.ndarray | list | None = None,
+    per_class: bool = True,
+) -> dict[str, Any]:
+    """Tek seferlik hesap (tek chunk'lık accumulator)."""
+    acc = MetricsAccumulator(classes)
+    acc.update(y_true, y_pred, proba)
+    return acc.compute(per_class=per_class)
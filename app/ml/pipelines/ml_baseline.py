@@ -4,14 +4,28 @@
 - Built-in dataset: iris|wine|breast_cancer|digits
 - CSV dataset: csv_path + target_col
 - CSV doğrulama: target_col var mı, target'ta null var mı, en az 1 feature var mı
+  (dataset profili varsa null/kardinalite bilgisi oradan okunur, yeniden taranmaz)
 - Preprocess:
   - numeric: median impute + (opsiyon) StandardScaler
-  - categorical: most_frequent impute + OneHotEncoder
+  - categorical: kardinaliteye göre onehot / infrequent / hash / ordinal / target (bkz. app.ml.encoding)
+  - onehot/hash çıktısı sparse kalır
+  - hgb: numeric kolonlar olduğu gibi (NaN'ı model yönlendirir), kategorikler native
+    (OrdinalEncoder kodları, one-hot yok)
 - Model:
   - Logistic Regression (Pipeline)
   - Random Forest
-- Metrics: accuracy, f1/precision/recall macro + confusion matrix
-- Opsiyonel: modeli joblib ile kaydetme (registry)
+  - HistGradientBoosting (`hgb`): validation_fraction üzerinde early stopping,
+    thread sayısı worker'ın CPU payı kadar (`WORKER_CPUS`, yoksa cgroup kotası)
+- Metrics (tek geçiş, bkz. app.ml.metrics): accuracy, f1/precision/recall macro + sınıf bazlı,
+  confusion matrix, predict_proba'dan ROC-AUC ve log-loss
+  + encoded feature sayısı ve matris belleği
+- Opsiyonel: modeli joblib ile kaydetme (registry) + numpy-only derlenmiş
+  predictor (`artifacts.compile`, varsayılan açık; bkz. app.ml.compiled)
+- Opsiyonel: kolon projeksiyonu (`dataset.columns`)
+- Worker'da yüklenen dataset'ler process içi LRU cache'te tutulur (bkz. app.ml.dataset_cache)
+- Opsiyonel: stratified subsample (`dataset.sample`) + progressive mod / learning curve (bkz. app.ml.sampling)
+- CSV yüklenmeden önce bellek planı: gerekirse float32 / category kolonlar ya da
+  net bir hatayla red; plan + gerçek tepe RSS metrics'te (bkz. app.ml.memory_plan)
 
 Param örnekleri:
 {
@@ -29,17 +43,26 @@ CSV ile:
   "preprocess": {"onehot": true},
   "artifacts": {"save_model": true}
 }
+
+Gradient boosting:
+{
+  "model": {"name": "hgb", "max_iter": 300, "learning_rate": 0.1, "max_leaf_nodes": 31,
+            "early_stopping": true, "validation_fraction": 0.1, "n_iter_no_change": 10}
+}
 """
 
 from __future__ import annotations
 
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Any, Tuple, Optional
+from typing import Any, Callable, Tuple, Optional
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 
 from sklearn.datasets import load_iris, load_wine, load_breast_cancer, load_digits
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split
 
 from sklearn.compose import ColumnTransformer
@@ -48,24 +71,52 @@ from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.impute import SimpleImputer
 
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-
-from sklearn.metrics import (
-    accuracy_score,
-    f1_score,
-    precision_score,
-    recall_score,
-    confusion_matrix,
-)
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from threadpoolctl import threadpool_limits
 
 import joblib
 import os
+import time
+
+from app.ml.metrics import classification_metrics
+from app.ml.encoding import (
+    DEFAULT_MAX_BINS,
+    NATIVE_CATEGORICAL_MODELS,
+    build_categorical_pipe,
+    matrix_nbytes,
+    plan_categorical,
+    supports_native_categorical,
+)
+from app.ml.profiling import is_profile_fresh
+from app.ml.dataset_cache import get_dataset_cache, file_content_hash
+from app.ml.dataset_keys import dataset_routing_key
+from app.ml.distributed_rf import shard_forest_params, shard_sizes
+from app.ml.compiled import export_compiled
+from app.ml.memory_plan import (
+    MemoryPlan,
+    apply_plan,
+    cpu_limit,
+    current_rss_bytes,
+    peak_rss_bytes,
+    plan_csv_memory,
+    read_csv_compact,
+    reset_peak_rss,
+)
+from app.ml.sampling import (
+    parse_sample_cfg,
+    stratified_reservoir_csv,
+    stratified_take,
+    progressive_sizes,
+    has_converged,
+)
 
 REGISTRY_DIR = "/app/app/ml/registry"
 
 @dataclass
 class BaselineResult:
     metrics: dict[str, Any]
+    # fitted estimator, only set for distributed rf shards (see app.ml.distributed_rf)
+    model: Any = None
 
 def _load_builtin(name: str) -> Tuple[np.ndarray, np.ndarray, Optional[list[str]]]:
     name = name.lower().strip()
@@ -84,58 +135,104 @@ def _load_builtin(name: str) -> Tuple[np.ndarray, np.ndarray, Optional[list[str]
     feature_names = list(getattr(ds, "feature_names", [])) or None
     return X, y, feature_names
 
-def _load_csv_df(csv_path: str) -> pd.DataFrame:
+def _load_csv_df(csv_path: str, usecols: list[str] | None = None) -> pd.DataFrame:
     if not os.path.exists(csv_path):
         raise ValueError(f"csv_path not found: {csv_path}")
     # default read; advanced settings can go to meta_json later
-    return pd.read_csv(csv_path)
+    return pd.read_csv(csv_path, usecols=usecols)
 
-def _validate_tabular(df: pd.DataFrame, target_col: str) -> None:
+def _cached(key: tuple, routing_key: str, loader: Callable[[], Any]) -> tuple[Any, bool | None]:
+    """Worker cache'i açıksa oradan, değilse doğrudan yükler. (value, hit|None)"""
+    cache = get_dataset_cache()
+    if cache is None:
+        return loader(), None
+    return cache.get_or_load(key, loader, routing_key=routing_key)
+
+def _validate_tabular(df: pd.DataFrame, target_col: str, profile: dict[str, Any] | None = None) -> None:
     if target_col not in df.columns:
         raise ValueError(f"target_col '{target_col}' not found. columns={list(df.columns)}")
-    if df[target_col].isna().any():
+    # cached profile already knows the null count; only rescan the target without one
+    target_stats = (profile or {}).get("columns", {}).get(target_col)
+    has_null = target_stats["null_count"] > 0 if target_stats else df[target_col].isna().any()
+    if has_null:
         raise ValueError("target column contains null/NaN values. Clean or fill them before training.")
     if len(df.columns) <= 1:
         raise ValueError("dataset must contain at least 1 feature column besides target_col")
 
-def _build_preprocessor(df: pd.DataFrame, target_col: str, preprocess_cfg: dict[str, Any]) -> tuple[ColumnTransformer, list[str], list[str]]:
+def _column_types(df: pd.DataFrame, target_col: str) -> tuple[list[str], list[str]]:
+    feature_dtypes = df.dtypes.drop(target_col)
+    numeric_cols = [
+        c for c, dt in feature_dtypes.items()
+        if pd.api.types.is_numeric_dtype(dt) and not pd.api.types.is_bool_dtype(dt)
+    ]
+    categorical_cols = [c for c in feature_dtypes.index if c not in numeric_cols]
+    return numeric_cols, categorical_cols
+
+def _cardinalities(df: pd.DataFrame, cols: list[str], profile: dict[str, Any] | None) -> dict[str, int]:
+    profiled = (profile or {}).get("columns", {})
+    return {
+        c: int(profiled[c]["distinct"]) if c in profiled else int(df[c].nunique(dropna=True))
+        for c in cols
+    }
+
+def _build_preprocessor(
+    df: pd.DataFrame,
+    target_col: str,
+    preprocess_cfg: dict[str, Any],
+    model_cfg: dict[str, Any] | None = None,
+    profile: dict[str, Any] | None = None,
+    dtype: Any = np.float64,
+) -> tuple[ColumnTransformer, list[str], list[str], dict[str, list[str]]]:
+    """`dtype`: kategorik encoder çıktısı; numeric kolonlar frame'deki dtype'ı korur."""
     onehot = bool(preprocess_cfg.get("onehot", True))
     scale_numeric = bool(preprocess_cfg.get("scale_numeric", True))
 
-    X_df = df.drop(columns=[target_col])
+    # detect column types (dtype metadata only, no copy of the frame)
+    numeric_cols, categorical_cols = _column_types(df, target_col)
 
-    # detect column types
-    numeric_cols = list(X_df.select_dtypes(include=["number"]).columns)
-    categorical_cols = [c for c in X_df.columns if c not in numeric_cols]
+    native = supports_native_categorical(model_cfg or {})
 
-    # numeric pipeline
+    # numeric pipeline; hgb bins raw values and routes NaN itself
     num_steps = [("imputer", SimpleImputer(strategy="median"))]
     if scale_numeric:
         num_steps.append(("scaler", StandardScaler()))
-    num_pipe = Pipeline(steps=num_steps)
+    num_pipe = "passthrough" if native else Pipeline(steps=num_steps)
 
-    # categorical pipeline
+    transformers: list[tuple[str, Any, list[str]]] = [("num", num_pipe, numeric_cols)]
+
+    # categorical pipelines, one per encoding strategy
+    encoding_plan: dict[str, list[str]] = {}
     if onehot and categorical_cols:
-        cat_pipe = Pipeline(
-            steps=[
-                ("imputer", SimpleImputer(strategy="most_frequent")),
-                ("onehot", OneHotEncoder(handle_unknown="ignore")),
-            ]
-        )
+        cardinalities = _cardinalities(df, categorical_cols, profile)
+        encoding_plan = plan_categorical(cardinalities, model_cfg or {}, preprocess_cfg)
+        for strategy, cols in encoding_plan.items():
+            block = (f"cat_{strategy}", build_categorical_pipe(strategy, preprocess_cfg, dtype), cols)
+            # native codes go first: their output indices are then known before fit
+            if strategy == "native":
+                transformers.insert(0, block)
+            else:
+                transformers.append(block)
     else:
         # if we don't onehot, drop categoricals (baseline choice)
-        cat_pipe = "drop"
+        transformers.append(("cat", "drop", categorical_cols))
 
     preprocessor = ColumnTransformer(
-        transformers=[
-            ("num", num_pipe, numeric_cols),
-            ("cat", cat_pipe, categorical_cols),
-        ],
+        transformers=transformers,
         remainder="drop",
+        # keep onehot/hash output sparse end-to-end; logreg and rf both accept csr, hgb doesn't
+        sparse_threshold=0.0 if native else 1.0,
     )
-    return preprocessor, numeric_cols, categorical_cols
+    return preprocessor, numeric_cols, categorical_cols, encoding_plan
+
+def _build_model(
+    model_cfg: dict[str, Any],
+    rf_shard: tuple[int, int] | None = None,
+    categorical_features: list[int] | None = None,
+) -> Any:
+    """`rf_shard=(index, count)`: tam ormanın sadece o shard'a düşen ağaçları.
 
-def _build_model(model_cfg: dict[str, Any]) -> Any:
+    `categorical_features`: hgb'nin kategorik böldüğü encoded kolon index'leri.
+    """
     name = (model_cfg.get("name") or "logreg").lower().strip()
     if name in ("logreg", "logistic", "logistic_regression"):
         C = float(model_cfg.get("C", 1.0))
@@ -146,85 +243,319 @@ def _build_model(model_cfg: dict[str, Any]) -> Any:
         n_estimators = int(model_cfg.get("n_estimators", 200))
         random_state = model_cfg.get("random_state", 42)
         max_depth = model_cfg.get("max_depth", None)
+        if rf_shard is not None:
+            n_estimators, random_state = shard_forest_params(n_estimators, random_state, *rf_shard)
         return RandomForestClassifier(
             n_estimators=n_estimators,
             random_state=random_state,
             max_depth=max_depth,
             n_jobs=-1,
         )
+    if name in NATIVE_CATEGORICAL_MODELS:
+        max_depth = model_cfg.get("max_depth")
+        return HistGradientBoostingClassifier(
+            learning_rate=float(model_cfg.get("learning_rate", 0.1)),
+            max_iter=int(model_cfg.get("max_iter", 200)),
+            max_leaf_nodes=int(model_cfg.get("max_leaf_nodes", 31)),
+            max_depth=int(max_depth) if max_depth is not None else None,
+            min_samples_leaf=int(model_cfg.get("min_samples_leaf", 20)),
+            l2_regularization=float(model_cfg.get("l2_regularization", 0.0)),
+            max_bins=int(model_cfg.get("max_bins", DEFAULT_MAX_BINS)),
+            categorical_features=categorical_features or None,
+            # sklearn's "auto" only stops early above 10k rows; here it is opt-out
+            early_stopping=bool(model_cfg.get("early_stopping", True)),
+            validation_fraction=float(model_cfg.get("validation_fraction", 0.1)),
+            n_iter_no_change=int(model_cfg.get("n_iter_no_change", 10)),
+            random_state=model_cfg.get("random_state", 42),
+        )
     raise ValueError(f"unknown model name: {name}")
 
-def run_baseline(params: dict[str, Any], run_id: str | None = None) -> BaselineResult:
+def _model_threads(model_cfg: dict[str, Any]) -> int | None:
+    """hgb'nin OpenMP thread sayısı; OpenMP cgroup kotasını görmez, sınır burada konur."""
+    if not supports_native_categorical(model_cfg):
+        return None
+    return int(model_cfg.get("n_threads") or cpu_limit())
+
+def _take_rows(X: Any, idx: np.ndarray) -> Any:
+    return X.iloc[idx] if isinstance(X, pd.DataFrame) else X[idx]
+
+def _fit_evaluate(
+    model: Any,
+    X: Any,
+    y: np.ndarray,
+    split_cfg: dict[str, Any],
+    is_csv: bool,
+    prefit_clf: Any = None,
+    evaluate: bool = True,
+    n_threads: int | None = None,
+) -> dict[str, Any]:
+    """split + fit + predict; kullanılan parçaları döner.
+
+    `prefit_clf` verilirse sadece preprocess adımları fit edilir, classifier
+    olarak o kullanılır (dağıtık rf merge). `evaluate=False` predict'i atlar.
+    `n_threads`: fit / predict süresince OpenMP thread sınırı (hgb).
+    """
+    test_size = float(split_cfg.get("test_size", 0.2))
+    random_state = int(split_cfg.get("random_state", 42))
+    stratify = split_cfg.get("stratify", True)
+    stratify_y = y if stratify else None
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=stratify_y
+    )
+
+    limit = threadpool_limits(limits=n_threads, user_api="openmp") if n_threads else nullcontext()
+    with limit:
+        t0 = time.perf_counter()
+        if is_csv:
+            # fit steps separately so the encoded matrix can be measured without a second transform
+            X_train_enc = model.named_steps["preprocess"].fit_transform(X_train, y_train)
+            if prefit_clf is None:
+                model.named_steps["clf"].fit(X_train_enc, y_train)
+            else:
+                model.steps[-1] = ("clf", prefit_clf)
+        elif prefit_clf is not None:
+            if isinstance(model, Pipeline):
+                # slicing shares the step objects, so this fits the scaler etc. in place
+                model[:-1].fit(X_train, y_train)
+                model.steps[-1] = ("clf", prefit_clf)
+            else:
+                model = prefit_clf
+            X_train_enc = X_train
+        else:
+            model.fit(X_train, y_train)
+            X_train_enc = X_train
+        fit_seconds = time.perf_counter() - t0
+        y_pred, proba = _predict_with_proba(model, X_test) if evaluate else (None, None)
+
+    return {
+        "model": model,
+        "test_size": test_size,
+        "X_test": X_test,
+        "y_test": y_test,
+        "y_pred": y_pred,
+        "proba": proba,
+        "X_train_enc": X_train_enc,
+        "fit_seconds": fit_seconds,
+    }
+
+def _predict_with_proba(model: Any, X: Any) -> tuple[np.ndarray, np.ndarray | None]:
+    """Tek inference: predict_proba varsa label'lar onun argmax'ından türetilir
+    (logreg ve rf'nin predict'i de aynı argmax'ı yapar)."""
+    if hasattr(model, "predict_proba"):
+        proba = model.predict_proba(X)
+        return model.classes_.take(np.argmax(proba, axis=1)), proba
+    return model.predict(X), None
+
+def _score(step: dict[str, Any], per_class: bool = True) -> dict[str, Any]:
+    classes = getattr(step["model"], "classes_", None)
+    return classification_metrics(step["y_test"], step["y_pred"], step["proba"], classes, per_class=per_class)
+
+def run_baseline(
+    params: dict[str, Any],
+    run_id: str | None = None,
+    profile: dict[str, Any] | None = None,
+    rf_shard: tuple[int, int] | None = None,
+    prefit_clf: Any = None,
+) -> BaselineResult:
+    """`profile`: app.ml.profiling çıktısı; verilirse validation ve encoding
+    kararları için kolonlar yeniden taranmaz.
+
+    Dağıtık rf (bkz. app.ml.distributed_rf):
+    - `rf_shard=(index, count)`: sadece o shard'ın ağaçlarını fit eder, metrik
+      hesaplamaz; fit edilmiş orman `BaselineResult.model`'de döner
+    - `prefit_clf`: birleştirilmiş orman; preprocess fit edilir, değerlendirme
+      ve artifact normal akışta yapılır
+    """
     dataset_cfg = params.get("dataset") or {"name": "iris"}
     model_cfg = params.get("model") or {"name": "logreg"}
     split_cfg = params.get("split") or {}
     preprocess_cfg = params.get("preprocess") or {"scale_numeric": True, "onehot": True}
     artifacts_cfg = params.get("artifacts") or {"save_model": False}
+    sample_cfg = parse_sample_cfg(dataset_cfg.get("sample"))
 
     # dataset
     feature_names = None
     dataset_name = None
     is_csv = False
+    encoding_plan: dict[str, list[str]] = {}
+    sample_keys = None
+    class_counts = None
+    cache_hit = None
+    memory_plan: MemoryPlan | None = None
+    # per-run peak in long-lived workers / pool children
+    reset_peak_rss()
+    start_rss = current_rss_bytes()
 
     if "csv_path" in dataset_cfg:
         is_csv = True
         csv_path = dataset_cfg["csv_path"]
         target_col = dataset_cfg.get("target_col") or "target"
-        df = _load_csv_df(csv_path)
-        _validate_tabular(df, target_col)
+        if profile and not is_profile_fresh(profile, csv_path):
+            profile = None
+        # optional column projection (features + target)
+        projection = dataset_cfg.get("columns")
+        usecols = list(dict.fromkeys([*projection, target_col])) if projection else None
+        routing_key = dataset_routing_key(dataset_cfg)
+        if not os.path.exists(csv_path):
+            raise ValueError(f"csv_path not found: {csv_path}")
+        content_key = file_content_hash(csv_path) if get_dataset_cache() is not None else csv_path
+        proj_key = tuple(usecols) if usecols else None
+
+        # choose dtypes before anything is loaded; raises if even the compact plan can't fit
+        plan_params = params
+        if rf_shard is not None:
+            shard_trees = shard_sizes(int(model_cfg.get("n_estimators", 200)), rf_shard[1])[rf_shard[0]]
+            plan_params = {**params, "model": {**model_cfg, "n_estimators": shard_trees}}
+        memory_plan = plan_csv_memory(
+            plan_params, csv_path, target_col, usecols, profile, n_rows=sample_cfg["n"] if sample_cfg else None
+        )
+
+        if sample_cfg:
+            # stream the file, keep only a per-class reservoir in memory
+            known_counts = profile.get("target_distribution") if profile and profile.get("target_col") == target_col else None
+            n, seed = sample_cfg["n"], int(sample_cfg["seed"])
+
+            def load_sample():
+                sample, keys, counts = stratified_reservoir_csv(
+                    csv_path, target_col, n, seed=seed, class_counts=known_counts, usecols=usecols
+                )
+                return apply_plan(sample, memory_plan, target_col), keys, counts
+
+            (df, sample_keys, class_counts), cache_hit = _cached(
+                ("csv_sample", content_key, proj_key, target_col, n, seed, memory_plan.mode), routing_key, load_sample
+            )
+        else:
+            df, cache_hit = _cached(
+                ("csv", content_key, proj_key, memory_plan.mode),
+                routing_key,
+                lambda: (
+                    read_csv_compact(csv_path, memory_plan, target_col, usecols)
+                    if memory_plan.compact
+                    else _load_csv_df(csv_path, usecols)
+                ),
+            )
+        _validate_tabular(df, target_col, profile)
 
         y = df[target_col].values
         dataset_name = f"csv:{csv_path}"
 
-        preprocessor, numeric_cols, categorical_cols = _build_preprocessor(df, target_col, preprocess_cfg)
-        clf = _build_model(model_cfg)
+        preprocessor, numeric_cols, categorical_cols, encoding_plan = _build_preprocessor(
+            df, target_col, preprocess_cfg, model_cfg, profile, dtype=np.dtype(memory_plan.encoded_dtype)
+        )
+        # native block is the preprocessor's first (see _build_preprocessor)
+        clf = _build_model(model_cfg, rf_shard, categorical_features=list(range(len(encoding_plan.get("native", [])))))
         model = Pipeline(steps=[("preprocess", preprocessor), ("clf", clf)])
 
         X = df.drop(columns=[target_col])
         n_features_raw = int(X.shape[1])
     else:
         builtin = dataset_cfg.get("name", "iris")
-        X_arr, y, feature_names = _load_builtin(builtin)
+        (X_arr, y, feature_names), cache_hit = _cached(
+            ("builtin", builtin.lower().strip()), dataset_routing_key(dataset_cfg), lambda: _load_builtin(builtin)
+        )
         dataset_name = f"builtin:{builtin}"
         n_features_raw = int(X_arr.shape[1])
 
         # builtins are numeric arrays; simple pipeline
-        clf = _build_model(model_cfg)
+        clf = _build_model(model_cfg, rf_shard)
         # for logreg, scaling helps
         if model_cfg.get("name","logreg").lower().startswith("log"):
             model = Pipeline([("scaler", StandardScaler()), ("clf", clf)])
         else:
             model = clf
         X = X_arr
+        if sample_cfg:
+            sample_keys = np.random.default_rng(int(sample_cfg["seed"])).random(len(y))
+            labels, cnts = np.unique(y, return_counts=True)
+            class_counts = dict(zip(labels.tolist(), cnts.tolist()))
+
+    n_population = int(sum(class_counts.values())) if class_counts else int(len(y))
+    learning_curve = None
+    n_threads = _model_threads(model_cfg)
+
+    distributed = rf_shard is not None or prefit_clf is not None
+    if distributed and sample_cfg and sample_cfg["progressive"]:
+        raise ValueError("distributed rf does not support progressive sampling")
+
+    if sample_cfg and sample_cfg["progressive"]:
+        # nested stratified samples of growing size until the metric stabilizes
+        metric = sample_cfg["metric"]
+        learning_curve = []
+        for n in progressive_sizes(sample_cfg, len(y)):
+            idx = stratified_take(y, sample_keys, n, class_counts)
+            step = _fit_evaluate(clone(model), _take_rows(X, idx), y[idx], split_cfg, is_csv, n_threads=n_threads)
+            point = {"n_samples": int(len(idx)), "fit_seconds": step["fit_seconds"]}
+            scores = _score(step, per_class=False)
+            point.update({k: v for k, v in scores.items() if k not in ("confusion_matrix", "labels")})
+            learning_curve.append(point)
+            if has_converged(learning_curve, metric, float(sample_cfg["tol"]), int(sample_cfg["patience"])):
+                break
+        y_used = y[idx]
+    else:
+        if sample_cfg:
+            idx = stratified_take(y, sample_keys, sample_cfg["n"], class_counts)
+            X, y = _take_rows(X, idx), y[idx]
+        step = _fit_evaluate(
+            model, X, y, split_cfg, is_csv, prefit_clf=prefit_clf, evaluate=rf_shard is None, n_threads=n_threads
+        )
+        y_used = y
+
+    model = step["model"]
+    if rf_shard is not None:
+        clf = model.steps[-1][1] if isinstance(model, Pipeline) else model
+        return BaselineResult(
+            metrics={"shard": rf_shard[0], "n_trees": len(clf.estimators_), "fit_seconds": step["fit_seconds"]},
+            model=clf,
+        )
+    X_train_enc = step["X_train_enc"]
 
-    # split
-    test_size = float(split_cfg.get("test_size", 0.2))
-    random_state = int(split_cfg.get("random_state", 42))
-    stratify = split_cfg.get("stratify", True)
-    stratify_y = y if stratify else None
-
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state, stratify=stratify_y
-    )
-
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
-
-    average = "macro"
     metrics = {
         "dataset": dataset_name,
-        "n_samples": int(len(y)),
+        "n_samples": int(len(y_used)),
         "n_features_raw": n_features_raw,
-        "test_size": test_size,
+        "test_size": step["test_size"],
         "model": model_cfg,
         "preprocess": preprocess_cfg,
-        "accuracy": float(accuracy_score(y_test, y_pred)),
-        "f1_macro": float(f1_score(y_test, y_pred, average=average)),
-        "precision_macro": float(precision_score(y_test, y_pred, average=average, zero_division=0)),
-        "recall_macro": float(recall_score(y_test, y_pred, average=average, zero_division=0)),
-        "confusion_matrix": confusion_matrix(y_test, y_pred).tolist(),
+        **_score(step),
         "feature_names": feature_names,
+        "n_features_encoded": int(X_train_enc.shape[1]),
+        "encoded_matrix_bytes": matrix_nbytes(X_train_enc),
+        "encoded_sparse": bool(sp.issparse(X_train_enc)),
+        "fit_seconds": step["fit_seconds"],
+    }
+    if encoding_plan:
+        metrics["encoding"] = encoding_plan
+    fitted_clf = model.steps[-1][1] if isinstance(model, Pipeline) else model
+    if isinstance(fitted_clf, HistGradientBoostingClassifier):
+        metrics["boosting"] = {
+            "n_iter": int(fitted_clf.n_iter_),
+            "max_iter": int(fitted_clf.max_iter),
+            "stopped_early": int(fitted_clf.n_iter_) < int(fitted_clf.max_iter),
+            # negative log-loss on validation_fraction at the last iteration
+            "validation_score": (
+                float(fitted_clf.validation_score_[-1]) if len(getattr(fitted_clf, "validation_score_", [])) else None
+            ),
+            "n_threads": n_threads,
+        }
+    if is_csv:
+        metrics["profile_used"] = profile is not None
+    if sample_cfg:
+        metrics["sample"] = {
+            "n_requested": sample_cfg["n"],
+            "n_population": n_population,
+            "progressive": bool(sample_cfg["progressive"]),
+        }
+    if cache_hit is not None:
+        metrics["dataset_cache"] = {"hit": cache_hit, **get_dataset_cache().stats()}
+    metrics["memory"] = {
+        **(memory_plan.to_dict() if memory_plan is not None else {}),
+        "start_rss_mb": round(start_rss / 2**20, 1),
+        "peak_rss_mb": round(peak_rss_bytes() / 2**20, 1),
     }
+    if learning_curve is not None:
+        metrics["learning_curve"] = learning_curve
+        metrics["sample"]["stopped_early"] = len(y_used) < min(sample_cfg["n"], len(y))
 
     # save model artifact
     if artifacts_cfg.get("save_model") and run_id:
@@ -232,5 +563,16 @@ def run_baseline(params: dict[str, Any], run_id: str | None = None) -> BaselineR
         model_path = os.path.join(REGISTRY_DIR, f"{run_id}.joblib")
         joblib.dump(model, model_path)
         metrics["artifacts"] = {"model_path": model_path}
+        if artifacts_cfg.get("compile", True):
+            # numpy-only predictor next to the joblib file (see app.ml.compiled)
+            compiled = export_compiled(
+                model,
+                step["X_test"],
+                os.path.join(REGISTRY_DIR, f"{run_id}.compiled.npz"),
+                numeric_dtype=memory_plan.numeric_dtype if memory_plan is not None else "float64",
+            )
+            if compiled.get("compiled"):
+                metrics["artifacts"]["compiled_path"] = compiled.pop("path")
+            metrics["compiled"] = compiled
 
     return BaselineResult(metrics=metrics)
@@ -0,0 +1,210 @@
+"""Tabular dataset profiling (tek geçiş, streaming).
+
+CSV dosyası chunk chunk okunur; tüm dosya belleğe alınmaz. Kolon başına:
+- dtype / kind (numeric|categorical)
+- null_count
+- distinct (küçük kolonlarda tam, büyüklerde HyperLogLog ile yaklaşık)
+- numeric: min / max / mean + quantile'lar (bottom-k örneklem sketch'i)
+- target kolonu için sınıf dağılımı
+
+Çıktı JSON'a serialize edilebilir bir dict'tir; Dataset.profile_json'da saklanır
+ve run_baseline validation / preprocess kararlarında bunu kullanır.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+PROFILE_VERSION = 1
+
+DEFAULT_CHUNKSIZE = 100_000
+EXACT_DISTINCT_LIMIT = 65_536
+HLL_PRECISION = 14
+QUANTILE_SAMPLE_SIZE = 10_000
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+def _hash_values(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values, dtype=object).astype(str), categorize=True)
+
+class DistinctCounter:
+    """Tam set + HyperLogLog; limit aşılınca set bırakılır, HLL tahmini kullanılır."""
+
+    def __init__(self, exact_limit: int = EXACT_DISTINCT_LIMIT, p: int = HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+        self.exact: set[int] | None = set()
+        self.exact_limit = exact_limit
+
+    def update(self, hashes: np.ndarray) -> None:
+        if hashes.size == 0:
+            return
+        hashes = np.unique(hashes)
+        if self.exact is not None:
+            self.exact.update(hashes.tolist())
+            if len(self.exact) > self.exact_limit:
+                self.exact = None
+
+        tail_bits = 64 - self.p
+        idx = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        w = hashes & np.uint64((1 << tail_bits) - 1)
+        # bit_length(w) via float exponent; tail_bits <= 53 keeps the conversion exact
+        bit_len = np.frexp(w.astype(np.float64))[1]
+        rank = (tail_bits - bit_len + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    @property
+    def approximate(self) -> bool:
+        return self.exact is None
+
+    def estimate(self) -> int:
+        if self.exact is not None:
+            return len(self.exact)
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.power(2.0, -self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # small-range correction (linear counting)
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+class QuantileSketch:
+    """Bottom-k örneklem: her değere rastgele öncelik verilir, en küçük k tutulur.
+
+    Uniform örneklemdir, chunk'lar arası vektörize güncellenir.
+    """
+
+    def __init__(self, k: int = QUANTILE_SAMPLE_SIZE, seed: int = 0):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.values = np.empty(0, dtype=np.float64)
+        self.keys = np.empty(0, dtype=np.float64)
+
+    def update(self, values: np.ndarray) -> None:
+        if values.size == 0:
+            return
+        keys = self.rng.random(values.size)
+        all_values = np.concatenate([self.values, values.astype(np.float64)])
+        all_keys = np.concatenate([self.keys, keys])
+        if all_values.size > self.k:
+            keep = np.argpartition(all_keys, self.k - 1)[: self.k]
+            all_values, all_keys = all_values[keep], all_keys[keep]
+        self.values, self.keys = all_values, all_keys
+
+    def quantiles(self, qs: tuple[float, ...] = QUANTILES) -> dict[str, float] | None:
+        if self.values.size == 0:
+            return None
+        return {str(q): float(v) for q, v in zip(qs, np.quantile(self.values, qs))}
+
+class _ColumnStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.numeric = True
+        self.dtype: np.dtype | None = None
+        self.count = 0
+        self.null_count = 0
+        self.sum = 0.0
+        self.non_null = 0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.distinct = DistinctCounter()
+        self.sketch = QuantileSketch()
+
+    def update(self, s: pd.Series) -> None:
+        self.count += len(s)
+        nulls = s.isna()
+        self.null_count += int(nulls.sum())
+        values = s[~nulls]
+
+        is_num = pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype)
+        if self.numeric and not is_num and len(values):
+            # a non-numeric chunk makes the whole column object when pandas reads it in one go
+            self.numeric = False
+        if is_num:
+            self.dtype = s.dtype if self.dtype is None else np.result_type(self.dtype, s.dtype)
+        elif len(values) or self.dtype is None:
+            self.dtype = s.dtype
+
+        if is_num:
+            self.distinct.update(pd.util.hash_array(values.to_numpy(dtype=np.float64)))
+        else:
+            self.distinct.update(_hash_values(values.to_numpy()))
+
+        if self.numeric and len(values):
+            arr = values.to_numpy(dtype=np.float64)
+            self.sum += float(arr.sum())
+            self.non_null += int(arr.size)
+            lo, hi = float(arr.min()), float(arr.max())
+            self.min = lo if self.min is None else min(self.min, lo)
+            self.max = hi if self.max is None else max(self.max, hi)
+            self.sketch.update(arr)
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "dtype": str(self.dtype) if self.numeric else "object",
+            "kind": "numeric" if self.numeric else "categorical",
+            "null_count": self.null_count,
+            "distinct": self.distinct.estimate(),
+            "distinct_approx": self.distinct.approximate,
+        }
+        if self.numeric and self.non_null:
+            out.update(
+                {
+                    "min": self.min,
+                    "max": self.max,
+                    "mean": self.sum / self.non_null,
+                    "quantiles": self.sketch.quantiles(),
+                    "quantiles_approx": self.non_null > self.sketch.k,
+                }
+            )
+        return out
+
+def file_signature(path: str) -> dict[str, Any]:
+    st = os.stat(path)
+    return {"uri": path, "size": int(st.st_size), "mtime": float(st.st_mtime)}
+
+def profile_csv(csv_path: str, target_col: str | None = None, chunksize: int = DEFAULT_CHUNKSIZE) -> dict[str, Any]:
+    """CSV'yi tek geçişte profiller."""
+    if not os.path.exists(csv_path):
+        raise ValueError(f"csv_path not found: {csv_path}")
+
+    columns: dict[str, _ColumnStats] = {}
+    class_counts: pd.Series | None = None
+    n_rows = 0
+
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        n_rows += len(chunk)
+        for c in chunk.columns:
+            if c not in columns:
+                columns[c] = _ColumnStats(c)
+            columns[c].update(chunk[c])
+        if target_col and target_col in chunk.columns:
+            vc = chunk[target_col].value_counts(dropna=True)
+            class_counts = vc if class_counts is None else class_counts.add(vc, fill_value=0)
+
+    profile: dict[str, Any] = {
+        "version": PROFILE_VERSION,
+        "source": file_signature(csv_path),
+        "n_rows": n_rows,
+        "target_col": target_col,
+        "columns": {name: st.to_dict() for name, st in columns.items()},
+    }
+    if class_counts is not None:
+        profile["target_distribution"] = {
+            str(k): int(v) for k, v in sorted(class_counts.items(), key=lambda kv: str(kv[0]))
+        }
+    return profile
+
+def is_profile_fresh(profile: dict[str, Any] | None, csv_path: str) -> bool:
+    """Profil hâlâ diskteki dosyayı mı anlatıyor?"""
+    if not profile or profile.get("version") != PROFILE_VERSION:
+        return False
+    try:
+        return profile.get("source") == file_signature(csv_path)
+    except OSError:
+        return False
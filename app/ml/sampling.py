@@ -0,0 +1,163 @@
+"""Stratified subsampling (quick-look training).
+
+CSV tamamen belleğe alınmadan chunk chunk okunur; her sınıf için bottom-k
+reservoir tutulur (her satıra rastgele bir key verilir, sınıf başına en küçük
+k key'li satırlar kalır). Bottom-k örneklemin en küçük j elemanı da uniform bir
+örneklem olduğundan, progressive modda küçük örneklemler tek okumadan iç içe
+(nested) çıkarılır.
+
+Param örneği:
+{
+  "dataset": {
+    "csv_path": "...", "target_col": "label",
+    "sample": {"n": 50000, "seed": 0, "progressive": true, "start": 1000, "factor": 2,
+               "metric": "accuracy", "tol": 0.005, "patience": 1}
+  }
+}
+`"sample": 5000` kısayolu `{"n": 5000}` ile aynıdır.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.ml.profiling import DEFAULT_CHUNKSIZE
+
+KEY_COL = "__sample_key"
+
+# learning-curve point keys that are always present and numeric (see app.ml.metrics);
+# roc_auc / log_loss need predict_proba and roc_auc can be None
+CURVE_METRICS = ("accuracy", "f1_macro", "precision_macro", "recall_macro")
+
+def parse_sample_cfg(sample: Any) -> dict[str, Any] | None:
+    if sample is None or sample is False:
+        return None
+    if isinstance(sample, (int, float)) and not isinstance(sample, bool):
+        sample = {"n": sample}
+    if not isinstance(sample, dict):
+        raise ValueError("dataset.sample must be an int or an object like {\"n\": 5000}")
+    cfg = dict(sample)
+    n = cfg.get("n")
+    if n is None or int(n) < 2:
+        raise ValueError("dataset.sample.n must be an integer >= 2")
+    cfg["n"] = int(n)
+    cfg.setdefault("seed", 0)
+    cfg.setdefault("progressive", False)
+    cfg.setdefault("start", min(1000, cfg["n"]))
+    cfg.setdefault("factor", 2.0)
+    cfg.setdefault("metric", "accuracy")
+    if cfg["metric"] not in CURVE_METRICS:
+        raise ValueError(f"dataset.sample.metric must be one of {CURVE_METRICS}, got {cfg['metric']!r}")
+    cfg.setdefault("tol", 0.005)
+    cfg.setdefault("patience", 1)
+    return cfg
+
+def allocate(class_counts: dict[Any, int], n: int) -> dict[Any, int]:
+    """n satırı sınıflara popülasyon oranıyla (largest remainder) dağıtır.
+
+    Mümkünse her sınıfa en az 2 satır verir ki stratified split çalışsın.
+    """
+    total = sum(class_counts.values())
+    if n >= total:
+        return dict(class_counts)
+    quotas = {c: n * cnt / total for c, cnt in class_counts.items()}
+    alloc = {c: min(class_counts[c], max(2, int(q))) for c, q in quotas.items()}
+    # largest remainder until n is reached (or overshoot from the min-2 floor is trimmed)
+    order = sorted(class_counts, key=lambda c: quotas[c] - int(quotas[c]), reverse=True)
+    i = 0
+    while sum(alloc.values()) < n and i < 10 * len(order):
+        c = order[i % len(order)]
+        if alloc[c] < class_counts[c]:
+            alloc[c] += 1
+        i += 1
+    while sum(alloc.values()) > n:
+        c = max(alloc, key=lambda k: alloc[k] - quotas[k])
+        if alloc[c] <= 1:
+            break
+        alloc[c] -= 1
+    return alloc
+
+def stratified_take(y: np.ndarray, keys: np.ndarray, n: int, class_counts: dict[Any, int]) -> np.ndarray:
+    """Her sınıftan en küçük key'li satırların index'lerini döner (nested)."""
+    alloc = allocate(class_counts, n)
+    idx = []
+    for c, k in alloc.items():
+        members = np.flatnonzero(y == c)
+        if k < members.size:
+            members = members[np.argpartition(keys[members], k - 1)[:k]]
+        idx.append(members)
+    return np.sort(np.concatenate(idx)) if idx else np.empty(0, dtype=np.int64)
+
+def stratified_reservoir_csv(
+    csv_path: str,
+    target_col: str,
+    n: int,
+    seed: int = 0,
+    class_counts: dict[Any, int] | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    usecols: list[str] | None = None,
+) -> tuple[pd.DataFrame, np.ndarray, dict[Any, int]]:
+    """CSV'den tek geçişte sınıf başına reservoir örneklemi çeker.
+
+    `class_counts` (ör. profilden) biliniyorsa sınıf başına kapasite önceden
+    ayrılır; bilinmiyorsa her sınıf n satıra kadar tutulur ve dağılım sonda
+    gerçek sayımlardan yapılır.
+
+    Dönüş: (örneklem df, satır key'leri, popülasyon sınıf sayıları)
+    """
+    if not os.path.exists(csv_path):
+        raise ValueError(f"csv_path not found: {csv_path}")
+
+    rng = np.random.default_rng(seed)
+    # profile keys are stringified class labels, so caps are looked up by str(label)
+    caps = {str(c): k for c, k in allocate(class_counts, n).items()} if class_counts else None
+    reservoirs: dict[Any, pd.DataFrame] = {}
+    counts: dict[Any, int] = {}
+    columns = None
+
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, usecols=usecols):
+        if columns is None:
+            columns = list(chunk.columns)
+            if target_col not in columns:
+                raise ValueError(f"target_col '{target_col}' not found. columns={columns}")
+        if chunk[target_col].isna().any():
+            raise ValueError("target column contains null/NaN values. Clean or fill them before training.")
+        chunk[KEY_COL] = rng.random(len(chunk))
+        for c, part in chunk.groupby(target_col, sort=False):
+            counts[c] = counts.get(c, 0) + len(part)
+            cap = caps.get(str(c), n) if caps is not None else n
+            if cap <= 0:
+                continue
+            res = reservoirs.get(c)
+            merged = part if res is None else pd.concat([res, part], ignore_index=True)
+            if len(merged) > cap:
+                merged = merged.nsmallest(cap, KEY_COL)
+            reservoirs[c] = merged
+
+    if columns is None:
+        raise ValueError(f"csv is empty: {csv_path}")
+    df = pd.concat(list(reservoirs.values()), ignore_index=True) if reservoirs else pd.DataFrame(columns=columns + [KEY_COL])
+    keys = df.pop(KEY_COL).to_numpy()
+    return df, keys, counts
+
+def progressive_sizes(cfg: dict[str, Any], n_available: int) -> list[int]:
+    n_max = min(int(cfg["n"]), n_available)
+    size = min(int(cfg["start"]), n_max)
+    factor = max(float(cfg["factor"]), 1.1)
+    sizes = []
+    while size < n_max:
+        sizes.append(size)
+        size = int(size * factor)
+    sizes.append(n_max)
+    return sizes
+
+def has_converged(curve: list[dict[str, Any]], metric: str, tol: float, patience: int) -> bool:
+    """Son `patience` adımda metrik değişimi tol'ün altında mı?"""
+    if len(curve) <= patience:
+        return False
+    recent = [p[metric] for p in curve[-(patience + 1):]]
+    return all(abs(b - a) < tol for a, b in zip(recent, recent[1:]))
@@ -1,3 +1,5 @@
 # import all models for Alembic autogenerate
 from app.models.project import Project, Experiment, Run
 from app.models.dataset import Dataset
+from app.models.summary import ExperimentSummary, ProjectSummary
+from app.models.upload import UploadSession
@@ -21,4 +21,7 @@ class Dataset(Base, UUIDMixin, TimestampMixin):
     # free-form json (as text) for dataset-specific metadata (encoding, delimiter, etc.)
     meta_json: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # cached column statistics from the profiling job (see app.ml.profiling)
+    profile_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     project = relationship("Project", lazy="joined")
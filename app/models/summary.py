@@ -0,0 +1,39 @@
+import uuid
+from sqlalchemy import Integer, Float, ForeignKey, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.common import TimestampMixin
+
+# metrics whose best/latest values are rolled up; keep in sync with the columns below
+SUMMARY_METRICS = ("accuracy", "f1_macro")
+
+class RunRollupMixin(TimestampMixin):
+    """Run status sayıları + anahtar metriklerin best/latest değerleri.
+
+    update_run_status her geçişte atomik UPDATE'lerle günceller; okumak O(1).
+    """
+    n_queued: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    n_running: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    n_succeeded: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    n_failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    n_canceled: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    best_accuracy: Mapped[float | None] = mapped_column(Float)
+    latest_accuracy: Mapped[float | None] = mapped_column(Float)
+    best_f1_macro: Mapped[float | None] = mapped_column(Float)
+    latest_f1_macro: Mapped[float | None] = mapped_column(Float)
+    # run with the best accuracy so far
+    best_run_id: Mapped[uuid.UUID | None] = mapped_column(Uuid)
+
+    total_fit_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+
+class ExperimentSummary(Base, RunRollupMixin):
+    __tablename__ = "experiment_summaries"
+
+    experiment_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("experiments.id", ondelete="CASCADE"), primary_key=True)
+
+class ProjectSummary(Base, RunRollupMixin):
+    __tablename__ = "project_summaries"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
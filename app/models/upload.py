@@ -0,0 +1,33 @@
+import uuid
+from sqlalchemy import BigInteger, Integer, String, Text, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.common import UUIDMixin, TimestampMixin
+
+class UploadSession(Base, UUIDMixin, TimestampMixin):
+    """Parça parça (resumable) dataset yüklemesi.
+
+    Alınan chunk'lar diskte tutulur (bkz. app.services.uploads); bu satır
+    dosyanın beklenen boyutu / checksum'ı ve tamamlanınca açılacak Dataset'in
+    alanlarını saklar.
+    """
+    __tablename__ = "upload_sessions"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+
+    # fields of the Dataset created on completion
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False, default="tabular")
+    description: Mapped[str | None] = mapped_column(Text)
+    target_col: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    meta_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    filename: Mapped[str] = mapped_column(String(500), nullable=False)
+    total_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    chunk_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    # hex sha256 of the whole file, checked before the Dataset row is created
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="open")  # open/completed/aborted
+    dataset_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("datasets.id", ondelete="SET NULL"), nullable=True)
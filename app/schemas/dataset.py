@@ -19,3 +19,29 @@ class DatasetOut(UUIDOut):
     uri: str
     target_col: str | None = None
     meta_json: str | None = None
+
+class UploadSessionCreate(BaseModel):
+    project_id: uuid.UUID
+    name: str = Field(min_length=2, max_length=200)
+    kind: str = Field(default="tabular")
+    description: str | None = None
+    target_col: str | None = None
+    meta_json: str | None = None
+    filename: str = Field(min_length=1, max_length=500)
+    total_size: int = Field(gt=0)
+    # hex sha256 of the whole file
+    sha256: str = Field(pattern=r"^[0-9a-fA-F]{64}$")
+    chunk_size: int | None = None
+
+class UploadSessionOut(UUIDOut):
+    project_id: uuid.UUID
+    name: str
+    filename: str
+    total_size: int
+    chunk_size: int
+    sha256: str
+    status: str
+    dataset_id: uuid.UUID | None = None
+    n_chunks: int
+    n_received: int
+    missing_chunks: list[int]
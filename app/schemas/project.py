@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from app.schemas.common import UUIDOut
+from app.schemas.common import ORMBase, UUIDOut
 from app.models.project import AIBranch, RunStatus
 import uuid
 from datetime import datetime
@@ -38,3 +38,23 @@ class RunOut(UUIDOut):
     params_json: str | None = None
     metrics_json: str | None = None
     error: str | None = None
+
+class RunRollupOut(ORMBase):
+    n_queued: int = 0
+    n_running: int = 0
+    n_succeeded: int = 0
+    n_failed: int = 0
+    n_canceled: int = 0
+    best_accuracy: float | None = None
+    latest_accuracy: float | None = None
+    best_f1_macro: float | None = None
+    latest_f1_macro: float | None = None
+    best_run_id: uuid.UUID | None = None
+    total_fit_seconds: float = 0.0
+    updated_at: datetime | None = None
+
+class ExperimentSummaryOut(RunRollupOut):
+    experiment_id: uuid.UUID
+
+class ProjectSummaryOut(RunRollupOut):
+    project_id: uuid.UUID
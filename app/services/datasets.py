@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.models.dataset import Dataset
+from app.ml.dataset_keys import dataset_routing_key
+
+def _apply_dataset_shortcut(db: Session, params: dict[str, Any]) -> Dataset | None:
+    ds_id = params.get("dataset_id")
+    if not ds_id:
+        return None
+    ds = db.get(Dataset, ds_id)
+    if not ds:
+        raise ValueError(f"dataset not found: {ds_id}")
+    dataset_cfg = params.get("dataset") or {}
+    dataset_cfg.setdefault("csv_path", ds.uri)
+    if ds.target_col:
+        dataset_cfg.setdefault("target_col", ds.target_col)
+    params["dataset"] = dataset_cfg
+    return ds
+
+def resolve_dataset_params(db: Session, params: dict[str, Any]) -> dict[str, Any] | None:
+    """`dataset_id` kısayolunu `dataset` cfg'ye açar, cache'li profili döner.
+
+    Profil yoksa ya da dosya değişmişse None döner; run_baseline o zaman
+    veriyi kendisi tarar.
+    """
+    ds = _apply_dataset_shortcut(db, params)
+    if ds is None:
+        return None
+    if not ds.profile_json or params["dataset"]["csv_path"] != ds.uri:
+        return None
+    # ML stack is imported lazily so the API process stays lean (see scripts/check_import_budget.py)
+    from app.ml.profiling import is_profile_fresh
+
+    profile = json.loads(ds.profile_json)
+    return profile if is_profile_fresh(profile, ds.uri) else None
+
+def dataset_profile_hint(db: Session, params: dict[str, Any]) -> dict[str, Any] | None:
+    """Maliyet tahmini için cache'li profil; tazelik kontrolü yok, pandas import etmez."""
+    ds = _apply_dataset_shortcut(db, params)
+    if ds is None or not ds.profile_json or params["dataset"]["csv_path"] != ds.uri:
+        return None
+    return json.loads(ds.profile_json)
+
+def profile_dataset(db: Session, ds: Dataset) -> dict[str, Any]:
+    from app.ml.profiling import profile_csv
+
+    profile = profile_csv(ds.uri, target_col=ds.target_col)
+    ds.profile_json = json.dumps(profile, ensure_ascii=False)
+    db.add(ds)
+    db.commit()
+    db.refresh(ds)
+    return profile
+
+def run_routing_key(db: Session, params_json: str | None) -> str | None:
+    """Run'ın okuyacağı dataset için routing key (worker cache affinity)."""
+    try:
+        params = json.loads(params_json) if params_json else {}
+        _apply_dataset_shortcut(db, params)
+    except ValueError:
+        # unknown dataset etc. surfaces when the job runs; route to the shared queue
+        return None
+    return dataset_routing_key(params.get("dataset") or {"name": "iris"})
@@ -0,0 +1,162 @@
+"""Dağıtık random forest job'ları (worker tarafı).
+
+execute_train_job, `model.distributed` isteyen rf run'ında eğitmek yerine
+`enqueue_rf_shards` ile N shard job'ı + bir merge job'ı kuyruğa atar; run
+RUNNING kalır.
+
+- shard: aynı dataset kopyasını ve aynı split seed'ini kullanarak ormanın kendi
+  ağaçlarını fit eder, `registry/shards/{run_id}/{attempt}/{i}.joblib` olarak yazar
+  (registry tüm worker'ların gördüğü paylaşımlı volume'dur)
+- merge: shard'ları birleştirir, preprocess'i fit edip test split'inde metrikleri
+  hesaplar, tek modeli registry'ye kaydeder ve run'ı SUCCEEDED yapar
+- herhangi bir job düşerse failure callback önce attempt'in başlamamış shard'larını
+  ve merge'ünü iptal eder, sonra run'ı FAILED yapar ve shard'ları siler; o sırada
+  çalışan shard fit'i bitince attempt'in iptal edildiğini görüp kendi çıktısını siler
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+
+import joblib
+from loguru import logger
+from rq import get_current_job
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.project import Run, RunStatus
+from app.services.projects import update_run_status
+from app.services.datasets import resolve_dataset_params
+from app.ml.pipelines.ml_baseline import REGISTRY_DIR, run_baseline
+from app.ml.distributed_rf import merge_forests
+
+SHARD_ROOT = os.path.join(REGISTRY_DIR, "shards")
+
+def _attempt_dir(run_id: str, attempt: str) -> str:
+    return os.path.join(SHARD_ROOT, run_id, attempt)
+
+def _cleanup(run_id: str, attempt: str) -> None:
+    shutil.rmtree(_attempt_dir(run_id, attempt), ignore_errors=True)
+    try:
+        os.rmdir(os.path.join(SHARD_ROOT, run_id))
+    except OSError:
+        # another attempt still has shards there
+        pass
+
+def _attempt_abandoned(job: Job | None) -> bool:
+    """Merge iptal edildiyse (ya da yoksa) attempt düşmüştür; shard çıktısı artık kimsenin değil."""
+    ids = job.meta.get("attempt_jobs") if job is not None else None
+    if not ids:
+        return False
+    try:
+        return Job.fetch(ids[-1], connection=job.connection).get_status() == JobStatus.CANCELED
+    except NoSuchJobError:
+        return True
+
+def _cancel_attempt_jobs(job: Job, connection) -> None:
+    # running shards can't be stopped safely (SimpleWorker has no horse to kill);
+    # they notice the canceled merge after their fit, see _attempt_abandoned
+    ids = [i for i in job.meta.get("attempt_jobs", []) if i != job.id]
+    for sibling in Job.fetch_many(ids, connection=connection):
+        if sibling is not None and sibling.get_status() in (JobStatus.QUEUED, JobStatus.DEFERRED, JobStatus.SCHEDULED):
+            sibling.cancel()
+
+def _run_params(db: Session, run_id: str, seed: int) -> tuple[Run, dict, dict | None]:
+    run = db.get(Run, run_id)
+    if not run:
+        raise ValueError(f"run not found: {run_id}")
+    params = json.loads(run.params_json) if run.params_json else {}
+    profile = resolve_dataset_params(db, params)
+    # every shard and the merge must agree on the forest seed
+    params.setdefault("model", {})["random_state"] = seed
+    # ... and on frame dtypes: "auto" could pick a different memory plan per worker
+    memory = params["memory"] = dict(params.get("memory") or {})
+    if memory.get("plan", "auto") == "auto":
+        memory["plan"] = "full"
+    return run, params, profile
+
+def execute_rf_shard_job(run_id: str, attempt: str, index: int, n_shards: int, seed: int) -> dict:
+    db: Session = SessionLocal()
+    try:
+        _, params, profile = _run_params(db, run_id, seed)
+    finally:
+        db.close()
+
+    t0 = time.time()
+    result = run_baseline(params, profile=profile, rf_shard=(index, n_shards))
+    out_dir = _attempt_dir(run_id, attempt)
+    os.makedirs(out_dir, exist_ok=True)
+    # write then rename: the merge never sees a half-written shard
+    tmp = os.path.join(out_dir, f".{index}.joblib")
+    joblib.dump(result.model, tmp)
+    os.replace(tmp, os.path.join(out_dir, f"{index}.joblib"))
+
+    info = {**result.metrics, "started_at": t0, "finished_at": time.time()}
+    with open(os.path.join(out_dir, f"{index}.json"), "w") as f:
+        json.dump(info, f)
+    # checked after writing: the failure handler cancels before it deletes, so either
+    # its rmtree sees these files or this check sees the cancel
+    if _attempt_abandoned(get_current_job()):
+        logger.info(f"attempt {attempt} of run {run_id} was abandoned; dropping shard {index}")
+        _cleanup(run_id, attempt)
+    return info
+
+def execute_rf_merge_job(run_id: str, attempt: str, n_shards: int, seed: int, enqueued_at: float) -> None:
+    db: Session = SessionLocal()
+    out_dir = _attempt_dir(run_id, attempt)
+    try:
+        run, params, profile = _run_params(db, run_id, seed)
+
+        t0 = time.time()
+        forests = [joblib.load(os.path.join(out_dir, f"{i}.joblib")) for i in range(n_shards)]
+        shards = []
+        for i in range(n_shards):
+            with open(os.path.join(out_dir, f"{i}.json")) as f:
+                shards.append(json.load(f))
+        merged = merge_forests(forests, random_state=seed)
+        del forests
+
+        # the merged forest is always persisted; shards are deleted below
+        params["artifacts"] = {**(params.get("artifacts") or {}), "save_model": True}
+        result = run_baseline(params, run_id=str(run.id), profile=profile, prefit_clf=merged)
+        metrics = result.metrics
+
+        shard_fit = [s["fit_seconds"] for s in shards]
+        metrics["distributed"] = {
+            "shards": n_shards,
+            "trees_per_shard": [s["n_trees"] for s in shards],
+            "shard_fit_seconds": shard_fit,
+            # wall time from enqueue to merged model, vs the compute the shards spent
+            "wall_seconds": time.time() - enqueued_at,
+            "shards_wall_seconds": max(s["finished_at"] for s in shards) - enqueued_at,
+            "merge_seconds": time.time() - t0,
+        }
+        # total tree-fitting compute, what a single-node fit would have spent
+        metrics["fit_seconds"] = float(sum(shard_fit))
+        update_run_status(db, run, RunStatus.SUCCEEDED, metrics_json=json.dumps(metrics, ensure_ascii=False))
+    finally:
+        db.close()
+        _cleanup(run_id, attempt)
+
+def on_distributed_job_failure(job, connection, exc_type, exc_value, tb) -> None:
+    """RQ failure callback (shard ya da merge): kalan job'ları iptal eder, run'ı FAILED yapar."""
+    run_id, attempt = job.args[0], job.args[1]
+    try:
+        # before the cleanup below: a deferred merge would otherwise wait forever
+        _cancel_attempt_jobs(job, connection)
+    except Exception as e:
+        logger.warning(f"could not cancel remaining jobs of run {run_id} attempt {attempt}: {e}")
+    db: Session = SessionLocal()
+    try:
+        run = db.get(Run, run_id)
+        if run and run.status == RunStatus.RUNNING:
+            update_run_status(db, run, RunStatus.FAILED, error=f"{job.id}: {exc_value}")
+    except Exception as e:
+        logger.warning(f"could not mark distributed run {run_id} failed: {e}")
+    finally:
+        db.close()
+        _cleanup(run_id, attempt)
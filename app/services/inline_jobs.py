@@ -0,0 +1,124 @@
+"""API process'ine bağlı, sınırlı bir process pool'da kısa eğitim job'ları.
+
+- Pool opt-in'dir (`INLINE_POOL_WORKERS`, varsayılan 0). Açıksa API açılırken arka planda
+  ısıtılır (spawn); child'lar ML stack'ini bir kez yükler, job'lar sıcak process'te çalışır.
+  API process'i pandas/sklearn import etmez, ama her child ~200 MB RSS tutar ve bu her
+  uvicorn worker'ı için ayrıca ödenir; yalın API tier'ında pool kapalı kalmalı.
+- Child başına BLAS / joblib thread sayısı `INLINE_POOL_THREADS` ile sınırlanır
+  ki inline job'lar request'lere ayrılan CPU'yu yemesin.
+- Aynı anda en fazla `INLINE_POOL_WORKERS + INLINE_MAX_PENDING` job kabul edilir;
+  dolu ise `try_reserve_slot` False döner ve çağıran iş RQ'ya gider.
+
+Job, worker'daki `execute_train_job` ile aynıdır (status geçişleri + metrics DB'ye yazılır).
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from loguru import logger
+
+from app.core.config import settings
+
+# children are recycled so a leaky fit can't grow them forever
+MAX_TASKS_PER_CHILD = 100
+
+_executor: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+_in_flight = 0
+
+def _init_child(threads: int) -> None:
+    # before numpy/sklearn load: BLAS pools are sized at import
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "LOKY_MAX_CPU_COUNT"):
+        os.environ[var] = str(threads)
+    import app.services.train_job  # noqa: F401
+
+def _run_train_job(run_id: str) -> None:
+    from app.services.train_job import execute_train_job
+
+    execute_train_job(run_id)
+
+def pool_enabled() -> bool:
+    return settings.inline_pool_workers > 0
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.inline_pool_workers,
+                # never fork the API process: it holds DB connections and server threads
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_child,
+                initargs=(settings.inline_pool_threads,),
+                max_tasks_per_child=MAX_TASKS_PER_CHILD,
+            )
+        return _executor
+
+def try_reserve_slot() -> bool:
+    global _in_flight
+    if not pool_enabled():
+        # no pool, no inline fits: training never runs in the API process itself
+        return False
+    with _lock:
+        if _in_flight >= settings.inline_pool_workers + settings.inline_max_pending:
+            return False
+        _in_flight += 1
+        return True
+
+def release_slot() -> None:
+    global _in_flight
+    with _lock:
+        _in_flight = max(0, _in_flight - 1)
+
+def run_train_inline(run_id: str) -> None:
+    """Slot'u `try_reserve_slot` ile almış çağıran için job'ı pool'da çalıştırır, bitince döner.
+
+    Bloklar; sync endpoint'lerden çağrılır (Starlette threadpool'u), event loop'tan değil.
+    """
+    global _executor
+    future = None
+    try:
+        future = _get_executor().submit(_run_train_job, run_id)
+        # the slot follows the child, not the caller: a dropped request must not free it mid-fit
+        future.add_done_callback(lambda _: release_slot())
+        future.result()
+    except BrokenProcessPool:
+        logger.error("inline pool broke (child died); recreating on next use")
+        with _lock:
+            _executor = None
+        raise
+    finally:
+        if future is None:
+            # submit itself failed; no callback will fire
+            release_slot()
+
+def _noop() -> None:
+    return None
+
+def warm_inline_pool() -> None:
+    """Child'ları arka planda başlatır ki ilk inline run spawn + ML import beklemesin."""
+    if not pool_enabled():
+        return
+    executor = _get_executor()
+    for _ in range(settings.inline_pool_workers):
+        executor.submit(_noop)
+
+def pool_stats() -> dict[str, int]:
+    with _lock:
+        return {
+            "workers": settings.inline_pool_workers,
+            "max_pending": settings.inline_max_pending,
+            "in_flight": _in_flight,
+            "started": int(_executor is not None),
+        }
+
+def shutdown_inline_pool() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,153 @@
+"""Run'ları maliyetine göre inline (API process pool) ya da RQ'ya yönlendirir.
+
+Maliyet, dataset boyutu (satır x kolon) ve model config'inden kaba bir
+"tek çekirdekte saniye" tahminidir; katsayılar builtin dataset'ler ve 20k
+satırlık bir CSV üzerinde ölçülerek ayarlandı. Amaç doğru süre değil, iris
+boyutundaki işleri Redis + worker turundan kurtarıp büyükleri worker'a bırakmak.
+
+Bu modül bilerek bağımlılıksızdır (pandas/sklearn yok); API process'inde çalışır.
+"""
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.core.config import settings
+
+# (n_rows, n_features) of the sklearn builtin datasets
+BUILTIN_SHAPES = {
+    "iris": (150, 4),
+    "wine": (178, 13),
+    "breast_cancer": (569, 30),
+    "digits": (1797, 64),
+}
+
+MODES = ("auto", "inline", "queue")
+
+# fitted against run_baseline timings (see scripts/bench_job_routing.py)
+_OVERHEAD_S = 0.01
+_CSV_PARSE_S_PER_CELL = 2e-6
+_LOGREG_S_PER_CELL = 3e-7
+_RF_S_PER_TREE = 1e-3
+_RF_S_PER_SPLIT_UNIT = 1.5e-8
+_HGB_S_PER_ITER = 2e-3
+_HGB_S_PER_CELL_ITER = 1.1e-8
+
+_SNIFF_BYTES = 64 * 1024
+
+@dataclass
+class JobEstimate:
+    n_rows: int | None
+    n_cols: int | None
+    model: str
+    est_seconds: float | None
+    source: str  # builtin|profile|file_size|unknown
+    shards: int = 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+def rf_shard_count(model_cfg: dict[str, Any] | None) -> int:
+    """`model.distributed` ile istenen shard sayısı; dağıtık değilse 1."""
+    model_cfg = model_cfg or {}
+    name = (model_cfg.get("name") or "logreg").lower().strip()
+    dist = model_cfg.get("distributed")
+    if not dist or name not in ("rf", "random_forest", "randomforest"):
+        return 1
+    shards = dist.get("shards", 1) if isinstance(dist, dict) else dist
+    return max(1, int(shards))
+
+def _csv_shape_from_file(csv_path: str) -> tuple[int, int] | None:
+    """Dosya boyutu + ilk 64KB'tan satır / kolon tahmini (pandas'sız)."""
+    try:
+        size = os.path.getsize(csv_path)
+        with open(csv_path, "rb") as f:
+            head = f.read(_SNIFF_BYTES)
+    except OSError:
+        return None
+    lines = head.splitlines()
+    if len(lines) < 2:
+        return None
+    n_cols = lines[0].count(b",") + 1
+    body = lines[1:-1] if len(head) == _SNIFF_BYTES else lines[1:]
+    avg_line = max(1.0, sum(len(line) + 1 for line in body) / max(1, len(body)))
+    return int(size / avg_line), n_cols
+
+def _dataset_shape(dataset_cfg: dict[str, Any], profile: dict[str, Any] | None) -> tuple[int | None, int | None, str]:
+    if "csv_path" in dataset_cfg:
+        target = dataset_cfg.get("target_col")
+        if profile and profile.get("n_rows") is not None:
+            cols = [c for c in (profile.get("columns") or {}) if c != target]
+            return int(profile["n_rows"]), len(cols), "profile"
+        shape = _csv_shape_from_file(dataset_cfg["csv_path"])
+        if shape is None:
+            return None, None, "unknown"
+        return shape[0], max(1, shape[1] - 1), "file_size"
+    name = str(dataset_cfg.get("name", "iris")).lower().strip()
+    if name in BUILTIN_SHAPES:
+        n_rows, n_cols = BUILTIN_SHAPES[name]
+        return n_rows, n_cols, "builtin"
+    return None, None, "unknown"
+
+def _fit_seconds(model_cfg: dict[str, Any], n_rows: int, n_cols: int) -> float:
+    name = (model_cfg.get("name") or "logreg").lower().strip()
+    if name in ("rf", "random_forest", "randomforest"):
+        n_estimators = int(model_cfg.get("n_estimators", 200))
+        per_tree = _RF_S_PER_TREE + n_rows * math.log2(n_rows + 1) * math.sqrt(n_cols) * _RF_S_PER_SPLIT_UNIT
+        return n_estimators * per_tree
+    if name in ("hgb", "hist_gradient_boosting", "histgradientboosting"):
+        # early stopping usually ends sooner; max_iter is the upper bound
+        max_iter = int(model_cfg.get("max_iter", 200))
+        return max_iter * (_HGB_S_PER_ITER + n_rows * n_cols * _HGB_S_PER_CELL_ITER)
+    max_iter = int(model_cfg.get("max_iter", 500))
+    return n_rows * n_cols * _LOGREG_S_PER_CELL * max(1.0, max_iter / 500)
+
+def estimate_job(params: dict[str, Any], profile: dict[str, Any] | None = None) -> JobEstimate:
+    dataset_cfg = params.get("dataset") or {"name": "iris"}
+    model_cfg = params.get("model") or {"name": "logreg"}
+    model = (model_cfg.get("name") or "logreg").lower().strip()
+
+    shards = rf_shard_count(model_cfg)
+    n_rows, n_cols, source = _dataset_shape(dataset_cfg, profile)
+    if n_rows is None or n_cols is None:
+        return JobEstimate(n_rows, n_cols, model, None, source, shards)
+
+    est = _OVERHEAD_S
+    if "csv_path" in dataset_cfg:
+        # the whole file is read even when a sample is trained on
+        est += n_rows * (n_cols + 1) * _CSV_PARSE_S_PER_CELL
+
+    fit_rows = n_rows
+    sample = dataset_cfg.get("sample")
+    if isinstance(sample, (int, float)) and not isinstance(sample, bool):
+        sample = {"n": sample}
+    if isinstance(sample, dict) and sample.get("n"):
+        fit_rows = min(n_rows, int(sample["n"]))
+        if sample.get("progressive"):
+            # geometric sizes up to n sum to about factor/(factor-1) x n
+            factor = max(float(sample.get("factor", 2.0)), 1.1)
+            fit_rows = int(fit_rows * factor / (factor - 1))
+
+    train_rows = max(1, int(fit_rows * (1 - float((params.get("split") or {}).get("test_size", 0.2)))))
+    est += _fit_seconds(model_cfg, train_rows, n_cols)
+    return JobEstimate(n_rows, n_cols, model, round(est, 4), source, shards)
+
+def choose_mode(estimate: JobEstimate, requested: str = "auto") -> str:
+    """"inline" ya da "queue". Tahmin yapılamıyorsa ya da rf dağıtıksa iş worker'a gider."""
+    if requested not in MODES:
+        raise ValueError(f"unknown mode: {requested}. expected one of {MODES}")
+    if requested == "inline" and estimate.shards > 1:
+        raise ValueError("distributed rf runs on the queue only")
+    if requested == "inline" and settings.inline_pool_workers <= 0:
+        raise ValueError("inline pool is disabled (INLINE_POOL_WORKERS=0); use mode=queue or auto")
+    if requested != "auto":
+        return requested
+    if estimate.shards > 1:
+        return "queue"
+    if settings.inline_pool_workers <= 0 or estimate.est_seconds is None:
+        return "queue"
+    if estimate.n_rows is not None and estimate.n_rows > settings.inline_max_rows:
+        return "queue"
+    return "inline" if estimate.est_seconds <= settings.inline_max_seconds else "queue"
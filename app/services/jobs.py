@@ -1,17 +1,78 @@
 from __future__ import annotations
 
 import json
+import time
+import uuid
 from redis import Redis
 from rq import Queue
+from rq.job import Callback
 
 from app.core.config import settings
+from app.services.routing import pick_worker, requeue_orphaned, worker_queue_name
 
-def get_queue() -> Queue:
-    redis_conn = Redis.from_url(settings.redis_url)
-    return Queue(settings.rq_queue_name, connection=redis_conn)
+def get_redis() -> Redis:
+    return Redis.from_url(settings.redis_url)
 
-def enqueue_training(run_id: str) -> str:
-    """Train job'ını queue'ya atar, job_id döner."""
+def get_queue(name: str | None = None, connection: Redis | None = None) -> Queue:
+    redis_conn = connection or get_redis()
+    return Queue(name or settings.rq_queue_name, connection=redis_conn)
+
+def enqueue_training(run_id: str, routing_key: str | None = None) -> str:
+    """Train job'ını queue'ya atar, job_id döner.
+
+    `routing_key` verilirse ve dataset'i cache'inde tutan canlı ve müsait bir
+    worker varsa job o worker'ın özel queue'suna gider (bkz. app.services.routing).
+    """
+    redis_conn = get_redis()
+    queue_name = None
+    if routing_key:
+        requeue_orphaned(redis_conn)
+        worker_name = pick_worker(redis_conn, routing_key)
+        if worker_name:
+            queue_name = worker_queue_name(worker_name)
+    q = get_queue(queue_name, connection=redis_conn)
+    job = q.enqueue("app.services.train_job.execute_train_job", run_id, job_timeout=settings.train_job_timeout)
+    return job.id
+
+def enqueue_rf_shards(run_id: str, n_shards: int, seed: int, connection: Redis | None = None) -> list[str]:
+    """Dağıtık rf: shard job'ları + hepsine bağımlı merge job'ı (bkz. app.services.distributed_train).
+
+    Shard'lar shared queue'ya gider ki boştaki worker'lar paralel alsın. Herhangi
+    bir job düşerse failure callback attempt'in kalan job'larını iptal eder ve run'ı
+    FAILED yapar; merge o zaman hiç çalışmaz. Her job attempt'in tüm job id'lerini
+    `meta["attempt_jobs"]` içinde taşır (son eleman merge).
+    """
+    q = get_queue(connection=connection)
+    # per-attempt id: a retried run never mixes shards with an earlier attempt
+    attempt = uuid.uuid4().hex[:8]
+    shard_ids = [f"rf-{run_id}-{attempt}-{i}" for i in range(n_shards)]
+    merge_id = f"rf-{run_id}-{attempt}-merge"
+    meta = {"attempt_jobs": [*shard_ids, merge_id]}
+    on_failure = Callback("app.services.distributed_train.on_distributed_job_failure")
+    shards = [
+        q.enqueue(
+            "app.services.distributed_train.execute_rf_shard_job",
+            run_id, attempt, i, n_shards, seed,
+            job_id=shard_ids[i],
+            job_timeout=settings.train_job_timeout,
+            on_failure=on_failure,
+            meta=meta,
+        )
+        for i in range(n_shards)
+    ]
+    merge = q.enqueue(
+        "app.services.distributed_train.execute_rf_merge_job",
+        run_id, attempt, n_shards, seed, time.time(),
+        job_id=merge_id,
+        depends_on=shards,
+        job_timeout=settings.train_job_timeout,
+        on_failure=on_failure,
+        meta=meta,
+    )
+    return [j.id for j in shards] + [merge.id]
+
+def enqueue_profiling(dataset_id: str) -> str:
+    """Dataset profiling job'ını queue'ya atar, job_id döner."""
     q = get_queue()
-    job = q.enqueue("app.services.train_job.execute_train_job", run_id)
+    job = q.enqueue("app.services.profile_job.execute_profile_job", dataset_id)
     return job.id
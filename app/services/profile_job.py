@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.dataset import Dataset
+from app.services.datasets import profile_dataset
+
+def execute_profile_job(dataset_id: str) -> None:
+    """Worker içinde çalışır: dataset'i tek geçişte profiller ve DB'ye yazar."""
+    db: Session = SessionLocal()
+    try:
+        ds = db.get(Dataset, dataset_id)
+        if not ds:
+            return
+        profile_dataset(db, ds)
+    finally:
+        db.close()
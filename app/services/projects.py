@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from app.models.project import Project, Experiment, Run, RunStatus
+from app.services.summaries import apply_run_transition, ensure_summary_rows
 
 def list_projects(db: Session) -> list[Project]:
     return list(db.scalars(select(Project).order_by(Project.created_at.desc())).all())
@@ -9,6 +10,8 @@ def list_projects(db: Session) -> list[Project]:
 def create_project(db: Session, *, name: str, slug: str, branch, description: str | None):
     p = Project(name=name, slug=slug, branch=branch, description=description)
     db.add(p)
+    db.flush()
+    ensure_summary_rows(db, project_id=p.id)
     db.commit()
     db.refresh(p)
     return p
@@ -16,6 +19,8 @@ def create_project(db: Session, *, name: str, slug: str, branch, description: st
 def create_experiment(db: Session, *, project_id, name: str, note: str | None):
     e = Experiment(project_id=project_id, name=name, note=note)
     db.add(e)
+    db.flush()
+    ensure_summary_rows(db, experiment_id=e.id)
     db.commit()
     db.refresh(e)
     return e
@@ -23,17 +28,25 @@ def create_experiment(db: Session, *, project_id, name: str, note: str | None):
 def create_run(db: Session, *, experiment_id, name: str, params_json: str | None):
     r = Run(experiment_id=experiment_id, name=name, params_json=params_json, status=RunStatus.QUEUED)
     db.add(r)
+    db.flush()
+    apply_run_transition(db, r, None, RunStatus.QUEUED)
     db.commit()
     db.refresh(r)
     return r
 
 def update_run_status(db: Session, run: Run, status: RunStatus, metrics_json: str | None = None, error: str | None = None):
+    # committed status under a row lock, not the (possibly stale) instance: concurrent
+    # transitions of the same run serialize here and each rollup delta starts from the truth
+    old_status = db.scalar(select(Run.status).where(Run.id == run.id).with_for_update())
     run.status = status
     if metrics_json is not None:
         run.metrics_json = metrics_json
     if error is not None:
         run.error = error
     db.add(run)
+    db.flush()
+    # rollups move in the same transaction as the run itself
+    apply_run_transition(db, run, old_status, status, metrics_json)
     db.commit()
     db.refresh(run)
     return run
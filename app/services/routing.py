@@ -0,0 +1,135 @@
+"""Dataset-affinity job routing.
+
+Her worker shared queue'nun yanında kendine özel bir queue dinler. Worker,
+cache'inde tuttuğu dataset'leri Redis'e yayınlar; API bir train job'ını
+enqueue ederken dataset'i cache'inde tutan canlı, boşta ve özel queue'su
+birikmemiş bir worker varsa job'ı onun özel queue'suna atar, yoksa shared
+queue'ya. Affinity bir tercihtir: meşgul tutucu beklenmez, job boştaki bir
+worker'da cache'siz çalışır.
+
+Özel queue'yu sadece sahibi dinler; sahibi ölürse (heartbeat key'i düşünce)
+`requeue_orphaned` oradaki job'ları shared queue'ya taşır. Worker'lar bunu
+açılışta, kapanışta ve periyodik olarak, API her yönlendirmeden önce çağırır.
+
+Redis key'leri (prefix = RQ queue adı):
+- {prefix}:holders:{routing_key}  ZSET worker_name -> son yayın zamanı
+- {prefix}:cache_stats:{worker}   cache istatistikleri (JSON, TTL'li)
+- {prefix}:cache_workers          cache yayınlayan worker'lar (SET)
+"""
+from __future__ import annotations
+
+import json
+import time
+
+from loguru import logger
+from redis import Redis
+from rq import Queue, Worker
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+
+from app.core.config import settings
+
+STATS_TTL_SECONDS = 24 * 3600
+
+# routing keys this process last published, per worker name
+_published: dict[str, set[str]] = {}
+
+def worker_queue_name(worker_name: str) -> str:
+    return f"{settings.rq_queue_name}.worker.{worker_name}"
+
+def _worker_queue_prefix() -> str:
+    return worker_queue_name("")
+
+def _holders_key(routing_key: str) -> str:
+    return f"{settings.rq_queue_name}:holders:{routing_key}"
+
+def _stats_key(worker_name: str) -> str:
+    return f"{settings.rq_queue_name}:cache_stats:{worker_name}"
+
+def _workers_key() -> str:
+    return f"{settings.rq_queue_name}:cache_workers"
+
+def _is_alive(redis_conn: Redis, worker_name: str) -> bool:
+    # rq drops the worker key once its heartbeat expires
+    return bool(redis_conn.exists(Worker.redis_worker_namespace_prefix + worker_name))
+
+def _is_available(redis_conn: Redis, worker_name: str) -> bool:
+    """Boşta ve özel queue'su `affinity_max_queued`'un altında mı."""
+    state = redis_conn.hget(Worker.redis_worker_namespace_prefix + worker_name, "state")
+    if (state.decode() if isinstance(state, bytes) else state) == "busy":
+        return False
+    queued = Queue(worker_queue_name(worker_name), connection=redis_conn).count
+    return queued < settings.affinity_max_queued
+
+def publish_cache_state(redis_conn: Redis, worker_name: str, routing_keys: set[str], stats: dict) -> None:
+    """Worker tarafı: resident dataset'leri ve cache istatistiklerini yayınlar."""
+    now = time.time()
+    previous = _published.get(worker_name, set())
+    pipe = redis_conn.pipeline()
+    for rk in routing_keys:
+        pipe.zadd(_holders_key(rk), {worker_name: now})
+    for rk in previous - routing_keys:
+        pipe.zrem(_holders_key(rk), worker_name)
+    pipe.set(_stats_key(worker_name), json.dumps(stats), ex=STATS_TTL_SECONDS)
+    pipe.sadd(_workers_key(), worker_name)
+    pipe.execute()
+    _published[worker_name] = set(routing_keys)
+
+def pick_worker(redis_conn: Redis, routing_key: str) -> str | None:
+    """Dataset'i tutan, canlı ve müsait worker'lardan en son yayınlamış olanı döner.
+
+    Hepsi meşgulse None: job shared queue'ya gider, boştaki worker alır.
+    """
+    for raw in redis_conn.zrevrange(_holders_key(routing_key), 0, -1):
+        name = raw.decode() if isinstance(raw, bytes) else raw
+        if not _is_alive(redis_conn, name):
+            redis_conn.zrem(_holders_key(routing_key), name)
+            continue
+        if _is_available(redis_conn, name):
+            return name
+    return None
+
+def requeue_orphaned(redis_conn: Redis, include: str | None = None) -> int:
+    """Canlı dinleyicisi olmayan özel queue'lardaki job'ları shared queue'ya taşır.
+
+    `include`: canlı olsa bile boşaltılacak worker (kapanan worker'ın kendisi).
+    Taşınan job sayısını döner.
+    """
+    shared = Queue(settings.rq_queue_name, connection=redis_conn)
+    prefix = _worker_queue_prefix()
+    moved = 0
+    for q in Queue.all(connection=redis_conn):
+        if not q.name.startswith(prefix):
+            continue
+        worker_name = q.name[len(prefix):]
+        if worker_name != include and _is_alive(redis_conn, worker_name):
+            continue
+        # reversed + at_front keeps their original order
+        for job_id in reversed(q.get_job_ids()):
+            # LREM first: only one sweeper gets to move a given job
+            if not q.remove(job_id):
+                continue
+            try:
+                job = Job.fetch(job_id, connection=redis_conn)
+            except NoSuchJobError:
+                continue
+            # front: these jobs already waited their turn once
+            shared.enqueue_job(job, at_front=True)
+            moved += 1
+        if q.count == 0:
+            q.delete(delete_jobs=False)
+    if moved:
+        logger.info(f"requeued {moved} job(s) from dead workers' queues to {shared.name}")
+    return moved
+
+def cache_stats(redis_conn: Redis) -> list[dict]:
+    """Canlı worker'ların cache istatistikleri."""
+    out = []
+    for raw in sorted(redis_conn.smembers(_workers_key())):
+        name = raw.decode() if isinstance(raw, bytes) else raw
+        if not _is_alive(redis_conn, name):
+            redis_conn.srem(_workers_key(), name)
+            continue
+        stats = redis_conn.get(_stats_key(name))
+        out.append({"worker": name, **(json.loads(stats) if stats else {})})
+    return out
@@ -0,0 +1,113 @@
+"""Experiment / project run rollup'ları.
+
+Her run status geçişinde özet satırları atomik `UPDATE ... SET n = n + 1`
+ifadeleriyle, run değişikliğiyle aynı transaction içinde güncellenir; böylece
+eşzamanlı worker'lar birbirinin artışını ezmez ve özet okumak run sayısından
+bağımsız olarak O(1) kalır.
+"""
+from __future__ import annotations
+
+import json
+import uuid
+from typing import Any
+
+from sqlalchemy import update, func, case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.project import Experiment, Run, RunStatus
+from app.models.summary import ExperimentSummary, ProjectSummary, SUMMARY_METRICS
+
+STATUS_COLUMNS = {
+    RunStatus.QUEUED: "n_queued",
+    RunStatus.RUNNING: "n_running",
+    RunStatus.SUCCEEDED: "n_succeeded",
+    RunStatus.FAILED: "n_failed",
+    RunStatus.CANCELED: "n_canceled",
+}
+
+def ensure_summary_rows(db: Session, *, experiment_id: Any = None, project_id: Any = None) -> None:
+    if experiment_id is not None:
+        db.execute(insert(ExperimentSummary).values(experiment_id=experiment_id).on_conflict_do_nothing())
+    if project_id is not None:
+        db.execute(insert(ProjectSummary).values(project_id=project_id).on_conflict_do_nothing())
+
+def _metric_values(metrics_json: str | None) -> dict[str, float]:
+    if not metrics_json:
+        return {}
+    try:
+        metrics = json.loads(metrics_json)
+    except ValueError:
+        return {}
+    keys = (*SUMMARY_METRICS, "fit_seconds")
+    return {k: float(metrics[k]) for k in keys if isinstance(metrics.get(k), (int, float))}
+
+def _rollup_values(model, run_id: uuid.UUID, old: RunStatus | None, new: RunStatus, metrics: dict[str, float]) -> dict:
+    values: dict[str, Any] = {"updated_at": func.now()}
+    if old != new:
+        new_col = STATUS_COLUMNS[new]
+        values[new_col] = getattr(model, new_col) + 1
+        if old is not None:
+            old_col = STATUS_COLUMNS[old]
+            values[old_col] = getattr(model, old_col) - 1
+
+    if new == RunStatus.SUCCEEDED and metrics:
+        for name in SUMMARY_METRICS:
+            if name not in metrics:
+                continue
+            best = getattr(model, f"best_{name}")
+            # postgres GREATEST ignores NULLs
+            values[f"best_{name}"] = func.greatest(best, metrics[name])
+            values[f"latest_{name}"] = metrics[name]
+        if "accuracy" in metrics:
+            values["best_run_id"] = case(
+                (model.best_accuracy.is_(None) | (model.best_accuracy < metrics["accuracy"]), run_id),
+                else_=model.best_run_id,
+            )
+        if "fit_seconds" in metrics:
+            values["total_fit_seconds"] = model.total_fit_seconds + metrics["fit_seconds"]
+    return values
+
+def apply_run_transition(
+    db: Session,
+    run: Run,
+    old: RunStatus | None,
+    new: RunStatus,
+    metrics_json: str | None = None,
+) -> None:
+    """Özetleri günceller; commit çağırana aittir.
+
+    `old` run satırı kilitlenerek DB'den okunmuş olmalıdır (bkz. `update_run_status`).
+    """
+    metrics = _metric_values(metrics_json) if new == RunStatus.SUCCEEDED else {}
+    if old == new and not metrics:
+        return
+    project_id = db.get(Experiment, run.experiment_id).project_id
+    ensure_summary_rows(db, experiment_id=run.experiment_id, project_id=project_id)
+    db.execute(
+        update(ExperimentSummary)
+        .where(ExperimentSummary.experiment_id == run.experiment_id)
+        .values(**_rollup_values(ExperimentSummary, run.id, old, new, metrics))
+    )
+    db.execute(
+        update(ProjectSummary)
+        .where(ProjectSummary.project_id == project_id)
+        .values(**_rollup_values(ProjectSummary, run.id, old, new, metrics))
+    )
+
+def get_experiment_summary(db: Session, experiment_id: Any) -> ExperimentSummary:
+    s = db.get(ExperimentSummary, experiment_id)
+    if s is None:
+        # row is created with the experiment; this only covers rows lost to manual edits
+        ensure_summary_rows(db, experiment_id=experiment_id)
+        db.commit()
+        s = db.get(ExperimentSummary, experiment_id)
+    return s
+
+def get_project_summary(db: Session, project_id: Any) -> ProjectSummary:
+    s = db.get(ProjectSummary, project_id)
+    if s is None:
+        ensure_summary_rows(db, project_id=project_id)
+        db.commit()
+        s = db.get(ProjectSummary, project_id)
+    return s
@@ -4,18 +4,48 @@ import json
 import os
 
 from sqlalchemy.orm import Session
+from loguru import logger
+from rq import get_current_job
 
 from app.db.session import SessionLocal
 from app.models.project import Run, RunStatus
-from app.models.dataset import Dataset
 from app.services.projects import update_run_status
+from app.services.datasets import resolve_dataset_params
+from app.services.routing import publish_cache_state
+from app.services.jobs import enqueue_rf_shards
+from app.services.job_router import rf_shard_count
 from app.ml.pipelines.ml_baseline import run_baseline
+from app.ml.dataset_cache import get_dataset_cache
+from app.ml.distributed_rf import MAX_INT, shard_sizes
+
+def _publish_cache_state() -> None:
+    cache = get_dataset_cache()
+    job = get_current_job()
+    if cache is None or job is None or not job.worker_name:
+        return
+    try:
+        publish_cache_state(job.connection, job.worker_name, cache.routing_keys(), cache.stats())
+    except Exception as e:
+        # routing is a hint; never fail a finished run because of it
+        logger.warning(f"cache state publish failed: {e}")
+
+def _start_distributed(run_id: str, model_cfg: dict, n_shards: int) -> None:
+    shard_sizes(int(model_cfg.get("n_estimators", 200)), n_shards)  # validates before enqueueing
+    seed = model_cfg.get("random_state", 42)
+    if seed is None:
+        seed = int.from_bytes(os.urandom(4), "little") % MAX_INT
+    job = get_current_job()
+    job_ids = enqueue_rf_shards(run_id, n_shards, int(seed), connection=job.connection if job else None)
+    logger.info(f"run {run_id}: distributed rf over {n_shards} shards ({job_ids[-1]})")
 
 def execute_train_job(run_id: str) -> None:
     """Worker içinde çalışır.
 
     - Run status: RUNNING -> SUCCEEDED/FAILED
-    - dataset_id shortcut çözümü
+    - dataset_id shortcut çözümü (+ cache'li dataset profili)
+    - worker dataset cache durumunu routing için yayınlar
+    - `model.distributed` isteyen rf run'ını shard job'larına böler
+      (bkz. app.services.distributed_train); run RUNNING kalır, merge bitirir
     """
     db: Session = SessionLocal()
     try:
@@ -26,18 +56,13 @@ def execute_train_job(run_id: str) -> None:
         update_run_status(db, run, RunStatus.RUNNING)
 
         params = json.loads(run.params_json) if run.params_json else {}
-        ds_id = params.get("dataset_id")
-        if ds_id:
-            ds = db.get(Dataset, ds_id)
-            if not ds:
-                raise ValueError(f"dataset not found: {ds_id}")
-            dataset_cfg = params.get("dataset") or {}
-            dataset_cfg.setdefault("csv_path", ds.uri)
-            if ds.target_col:
-                dataset_cfg.setdefault("target_col", ds.target_col)
-            params["dataset"] = dataset_cfg
-
-        result = run_baseline(params, run_id=str(run.id))
+        n_shards = rf_shard_count(params.get("model"))
+        if n_shards > 1:
+            _start_distributed(run_id, params.get("model") or {}, n_shards)
+            return
+        profile = resolve_dataset_params(db, params)
+
+        result = run_baseline(params, run_id=str(run.id), profile=profile)
         metrics_json = json.dumps(result.metrics, ensure_ascii=False)
         update_run_status(db, run, RunStatus.SUCCEEDED, metrics_json=metrics_json)
     except Exception as e:
@@ -46,3 +71,4 @@ def execute_train_job(run_id: str) -> None:
             update_run_status(db, run, RunStatus.FAILED, error=str(e))
     finally:
         db.close()
+        _publish_cache_state()
@@ -0,0 +1,351 @@
+"""Parça parça (chunked, resumable) dataset yüklemesi.
+
+Akış:
+1. `POST /datasets/uploads` -> session açılır; dosya boyutu + sha256 baştan bildirilir,
+   diskte `total_size` boyutunda (sparse) bir data dosyası ayrılır
+2. `PUT /datasets/uploads/{id}/chunks/{index}` -> her chunk kendi offset'ine yazılır;
+   chunk'lar paralel ve herhangi bir sırada gelebilir, tekrar gönderilen chunk üzerine yazar
+3. `GET /datasets/uploads/{id}` -> eksik chunk index'leri (kopan bağlantıdan sonra devam)
+4. `POST /datasets/uploads/{id}/complete` -> sha256 doğrulanır, dosya uploads'a taşınır
+   (kopyalama yok, rename) ve Dataset satırı açılır
+
+Chunk body'leri stream edilir; ne chunk ne de dosyanın tamamı belleğe alınır.
+Chunk yazarları data dosyasında paylaşımlı, complete ise exclusive `flock` tutar:
+complete yarım kalan chunk yazımlarını bekler, başladıktan sonra gelen chunk'lar reddedilir.
+Belirli süre (UPLOAD_SESSION_TTL_HOURS) hareketsiz kalan açık session'lar
+API process'indeki arka plan thread'inde (SWEEP_INTERVAL_SECONDS'ta bir) ve
+session açılıp tamamlanırken süpürülür; yeni upload gelmese de disk boşalır.
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid as uuidlib
+from datetime import datetime, timezone
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.dataset import Dataset
+from app.models.upload import UploadSession
+
+UPLOAD_DIR = "/app/app/ml/datasets/uploads"
+
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 256 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+SWEEP_INTERVAL_SECONDS = 300
+
+_HASH_BLOCK = 4 * 1024 * 1024
+
+_last_sweep = 0.0
+_sweep_lock = threading.Lock()
+_sweeper_stop: threading.Event | None = None
+
+def stored_filename(name: str, filename: str | None) -> str:
+    """Yüklenen dosyanın uploads altındaki (çakışmasız) adı."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    if not ext:
+        ext = ".bin"
+    return f"{name.lower().replace(' ', '_')}_{uuidlib.uuid4().hex}{ext}"
+
+def sessions_root() -> str:
+    # under UPLOAD_DIR so completion is a same-filesystem rename
+    return os.path.join(UPLOAD_DIR, ".sessions")
+
+def session_dir(session_id: Any) -> str:
+    return os.path.join(sessions_root(), str(session_id))
+
+def _data_path(session_id: Any) -> str:
+    return os.path.join(session_dir(session_id), "data")
+
+def _chunks_dir(session_id: Any) -> str:
+    return os.path.join(session_dir(session_id), "chunks")
+
+def n_chunks(s: UploadSession) -> int:
+    return -(-int(s.total_size) // int(s.chunk_size))
+
+def chunk_span(s: UploadSession, index: int) -> tuple[int, int]:
+    """Chunk'ın (offset, length)'i; son chunk kısa olabilir."""
+    if index < 0 or index >= n_chunks(s):
+        raise ValueError(f"chunk index out of range: {index} (n_chunks={n_chunks(s)})")
+    offset = index * int(s.chunk_size)
+    return offset, min(int(s.chunk_size), int(s.total_size) - offset)
+
+def received_chunks(s: UploadSession) -> set[int]:
+    try:
+        names = os.listdir(_chunks_dir(s.id))
+    except FileNotFoundError:
+        return set()
+    return {int(n) for n in names if n.isdigit()}
+
+def missing_chunks(s: UploadSession) -> list[int]:
+    got = received_chunks(s)
+    return [i for i in range(n_chunks(s)) if i not in got]
+
+def session_state(s: UploadSession) -> dict[str, Any]:
+    """UploadSessionOut için alanlar (+ diskteki chunk durumu)."""
+    missing = missing_chunks(s) if s.status == "open" else []
+    total = n_chunks(s)
+    return {
+        "id": s.id,
+        "created_at": s.created_at,
+        "updated_at": s.updated_at,
+        "project_id": s.project_id,
+        "name": s.name,
+        "filename": s.filename,
+        "total_size": s.total_size,
+        "chunk_size": s.chunk_size,
+        "sha256": s.sha256,
+        "status": s.status,
+        "dataset_id": s.dataset_id,
+        "n_chunks": total,
+        "n_received": total - len(missing),
+        "missing_chunks": missing,
+    }
+
+def create_session(db: Session, fields: dict[str, Any]) -> UploadSession:
+    chunk_size = int(fields.pop("chunk_size", None) or DEFAULT_CHUNK_SIZE)
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"chunk_size must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE} bytes")
+    sha256 = fields.pop("sha256").lower()
+    s = UploadSession(**fields, chunk_size=chunk_size, sha256=sha256, status="open")
+    db.add(s)
+    db.flush()
+
+    os.makedirs(_chunks_dir(s.id), exist_ok=True)
+    # sparse preallocation: chunks land at their offsets, completion is a rename
+    with open(_data_path(s.id), "wb") as f:
+        f.truncate(int(s.total_size))
+    db.commit()
+    db.refresh(s)
+    return s
+
+class ChunkWriter:
+    """Tek chunk'ı stream ederek kendi offset'ine yazar (pwrite, paralel chunk'larla güvenli).
+
+    Complete sürüyorsa `BlockingIOError` fırlatır; açıldıktan sonra çağıran session
+    status'unu yeniden okumalıdır (complete kilidi bırakmadan önce commit eder).
+    """
+
+    def __init__(self, s: UploadSession, index: int, expected_sha256: str | None = None):
+        self.index = index
+        self.offset, self.length = chunk_span(s, index)
+        self.session_id = s.id
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self._hash = hashlib.sha256() if expected_sha256 else None
+        self.written = 0
+        self._fd = os.open(_data_path(s.id), os.O_WRONLY)
+        try:
+            # shared with other chunks, excluded by complete_session; never wait on the event loop
+            fcntl.flock(self._fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.close()
+            raise
+        # a re-sent chunk overwrites bytes that were already marked good: unmark first,
+        # finish() marks it again once the new bytes are verified
+        try:
+            os.unlink(self._marker_path())
+        except FileNotFoundError:
+            pass
+
+    def _marker_path(self) -> str:
+        return os.path.join(_chunks_dir(self.session_id), str(self.index))
+
+    def write(self, piece: bytes) -> None:
+        if self.written + len(piece) > self.length:
+            raise ValueError(f"chunk {self.index} is larger than expected {self.length} bytes")
+        view = memoryview(piece)
+        while view:
+            n = os.pwrite(self._fd, view, self.offset + self.written)
+            self.written += n
+            view = view[n:]
+        if self._hash is not None:
+            self._hash.update(piece)
+
+    def finish(self) -> None:
+        """Boyut / checksum doğrulanınca chunk alındı olarak işaretlenir."""
+        self.close()
+        if self.written != self.length:
+            raise ValueError(f"chunk {self.index} has {self.written} bytes, expected {self.length}")
+        if self._hash is not None and self._hash.hexdigest() != self.expected_sha256:
+            raise ValueError(f"chunk {self.index} checksum mismatch")
+        # empty marker file; its presence is what missing_chunks() reads
+        open(self._marker_path(), "wb").close()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def complete_session(db: Session, session_id: Any) -> Dataset:
+    """Eksik chunk yoksa checksum'ı doğrular, dosyayı taşır ve Dataset'i açar.
+
+    Tamamlanmış session için tekrar çağrılırsa aynı Dataset döner (retry güvenli).
+    """
+    # row lock: concurrent completes of the same session serialize here
+    s = db.get(UploadSession, session_id, with_for_update=True)
+    if s is None:
+        raise LookupError("upload session not found")
+    if s.status == "completed" and s.dataset_id:
+        ds = db.get(Dataset, s.dataset_id)
+        if ds is not None:
+            db.commit()
+            return ds
+    if s.status != "open":
+        raise ValueError(f"upload session is {s.status}")
+
+    data = _data_path(s.id)
+    try:
+        fd = os.open(data, os.O_RDONLY)
+    except FileNotFoundError:
+        raise ValueError("upload session data is gone")
+    try:
+        # waits for chunk writes already in flight; new ones fail their LOCK_NB
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        missing = missing_chunks(s)
+        if missing:
+            raise ValueError(f"{len(missing)} chunk(s) missing, first: {missing[:10]}")
+        digest = _file_sha256(data)
+        if digest != s.sha256:
+            raise ValueError(f"checksum mismatch: expected {s.sha256}, got {digest}")
+
+        path = os.path.join(UPLOAD_DIR, stored_filename(s.name, s.filename))
+        os.replace(data, path)
+        d = Dataset(
+            project_id=s.project_id,
+            name=s.name,
+            kind=s.kind,
+            description=s.description,
+            uri=path,
+            target_col=s.target_col,
+            meta_json=s.meta_json,
+        )
+        db.add(d)
+        db.flush()
+        s.status = "completed"
+        s.dataset_id = d.id
+        # commit before unlocking: a writer that gets the lock next must read "completed"
+        db.commit()
+    finally:
+        os.close(fd)
+    db.refresh(d)
+    shutil.rmtree(session_dir(s.id), ignore_errors=True)
+    return d
+
+def abort_session(db: Session, s: UploadSession) -> None:
+    db.delete(s)
+    db.commit()
+    shutil.rmtree(session_dir(s.id), ignore_errors=True)
+
+def _last_activity(s: UploadSession) -> float:
+    # chunk markers bump the chunks dir mtime, so chunk PUTs need no DB write
+    ts = s.updated_at.timestamp() if s.updated_at is not None else 0.0
+    try:
+        return max(ts, os.stat(_chunks_dir(s.id)).st_mtime)
+    except FileNotFoundError:
+        return ts
+
+def sweep_stale_sessions(db: Session, ttl_seconds: float | None = None) -> int:
+    """TTL'den uzun süre hareketsiz açık session'ları ve sahipsiz dizinleri siler."""
+    ttl = float(ttl_seconds if ttl_seconds is not None else settings.upload_session_ttl_hours * 3600)
+    cutoff = time.time() - ttl
+    cutoff_dt = datetime.fromtimestamp(cutoff, tz=timezone.utc)
+
+    removed = 0
+    # rows a complete_session holds are skipped, not waited on
+    stale = db.scalars(
+        select(UploadSession)
+        .where(UploadSession.status == "open", UploadSession.updated_at < cutoff_dt)
+        .with_for_update(skip_locked=True)
+    ).all()
+    locked: list[int] = []
+    try:
+        for s in stale:
+            if s.status != "open" or _last_activity(s) >= cutoff:
+                continue
+            try:
+                fd = os.open(_data_path(s.id), os.O_RDONLY)
+            except FileNotFoundError:
+                fd = None
+            if fd is not None:
+                try:
+                    # a chunk write or a completion is running: not stale after all
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    os.close(fd)
+                    continue
+                locked.append(fd)
+            db.delete(s)
+            shutil.rmtree(session_dir(s.id), ignore_errors=True)
+            removed += 1
+        db.commit()
+    finally:
+        # after the commit: a writer that gets the lock next finds the row gone
+        for fd in locked:
+            os.close(fd)
+
+    # dirs left behind by a crash mid-completion or a cascaded project delete
+    root = sessions_root()
+    if os.path.isdir(root):
+        open_ids = {str(i) for i in db.scalars(select(UploadSession.id).where(UploadSession.status == "open"))}
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if name not in open_ids and os.stat(path).st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+    if removed:
+        logger.info(f"removed {removed} stale upload session(s)")
+    return removed
+
+def maybe_sweep_stale_sessions(db: Session) -> None:
+    """Process başına en fazla SWEEP_INTERVAL_SECONDS'ta bir süpürür (best effort)."""
+    global _last_sweep
+    with _sweep_lock:
+        now = time.monotonic()
+        if now - _last_sweep < SWEEP_INTERVAL_SECONDS:
+            return
+        _last_sweep = now
+    try:
+        sweep_stale_sessions(db)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"upload session sweep failed: {e}")
+
+def _sweep_loop(stop: threading.Event) -> None:
+    while not stop.wait(SWEEP_INTERVAL_SECONDS):
+        db = SessionLocal()
+        try:
+            maybe_sweep_stale_sessions(db)
+        finally:
+            db.close()
+
+def start_session_sweeper() -> None:
+    """API açılırken çağrılır: süpürmeyi upload trafiğinden bağımsız, periyodik yapar."""
+    global _sweeper_stop
+    if _sweeper_stop is not None:
+        return
+    _sweeper_stop = threading.Event()
+    threading.Thread(target=_sweep_loop, args=(_sweeper_stop,), name="upload-sweep", daemon=True).start()
+
+def stop_session_sweeper() -> None:
+    global _sweeper_stop
+    if _sweeper_stop is not None:
+        _sweeper_stop.set()
+        _sweeper_stop = None
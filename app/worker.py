@@ -1,17 +1,61 @@
 """RQ worker entrypoint.
 
 Docker compose'ta `worker` servisi bu modülü çalıştırır.
+API process'i ML stack'ini lazy import eder; worker ise pandas/sklearn'ü burada
+önceden yükler ki her job için fork edilen child tekrar import etmesin.
+
+Dataset cache varsayılan olarak kapalıdır ve her job fork edilen bir child'da
+çalışır. Açılırsa (DATASET_CACHE_MB > 0) job'lar fork edilmeden worker
+process'inde çalışır (SimpleWorker) ki cache job'lar arasında yaşasın; bedeli:
+OOM / segfault worker'ı düşürür, sızıntı worker'da birikir. Worker shared
+queue'nun önünde kendi özel queue'sunu dinler (bkz. app.services.routing);
+açılışta ve `ORPHAN_SWEEP_SECONDS`'ta bir ölü worker'ların özel queue'larını,
+kapanırken kendi özel queue'sunu shared queue'ya boşaltır.
 """
+import socket
+import threading
+import uuid
+
+from loguru import logger
 from redis import Redis
-from rq import Worker, Queue, Connection
+from rq import Worker, SimpleWorker, Queue, Connection
 from app.core.config import settings
+from app.ml.dataset_cache import configure_dataset_cache
+from app.services.routing import requeue_orphaned, worker_queue_name
+
+# preload once at startup; forked work horses inherit it, SimpleWorker reuses it
+import app.ml.pipelines.ml_baseline  # noqa: F401
+import app.services.train_job  # noqa: F401
+import app.services.profile_job  # noqa: F401
+import app.services.distributed_train  # noqa: F401
+
+def _sweep_orphans(stop: threading.Event) -> None:
+    # own connection: redis-py connections are not shared with the work loop
+    redis_conn = Redis.from_url(settings.redis_url)
+    while not stop.wait(settings.orphan_sweep_seconds):
+        try:
+            requeue_orphaned(redis_conn)
+        except Exception as e:
+            logger.warning(f"orphan sweep failed: {e}")
 
 def main():
     redis_conn = Redis.from_url(settings.redis_url)
-    with Connection(redis_conn):
-        q = Queue(settings.rq_queue_name)
-        w = Worker([q])
-        w.work(with_scheduler=False)
+    cache = configure_dataset_cache(settings.dataset_cache_mb)
+    name = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+    requeue_orphaned(redis_conn)
+    stop = threading.Event()
+    threading.Thread(target=_sweep_orphans, args=(stop,), name="orphan-sweep", daemon=True).start()
+    try:
+        with Connection(redis_conn):
+            # private queue first so routed jobs are picked before the shared backlog
+            queues = [Queue(worker_queue_name(name)), Queue(settings.rq_queue_name)]
+            worker_cls = SimpleWorker if cache is not None else Worker
+            w = worker_cls(queues, name=name)
+            w.work(with_scheduler=False)
+    finally:
+        stop.set()
+        # warm shutdown: whatever was routed here goes back to the shared queue
+        requeue_orphaned(redis_conn, include=name)
 
 if __name__ == "__main__":
     main()
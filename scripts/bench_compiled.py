@@ -0,0 +1,123 @@
+"""Derlenmiş (numpy-only) predictor vs kayıtlı sklearn pipeline benchmark'ı.
+
+Her senaryo için model `run_baseline` ile eğitilip geçici bir registry'ye
+kaydedilir (joblib + .compiled.npz), sonra:
+- artifact boyutu
+- soğuk yükleme: yeni bir process'te import + load (API/worker ilk isteği)
+- sıcak yükleme: aynı process'te tekrar load
+- predict_proba gecikmesi (p50): 1, 10 ve 1000 satırlık istekler; pipeline'a
+  request handler'ın kuracağı DataFrame, derlenmiş forma kayıt listesi verilir
+ölçülür ve iki formun çıktıları karşılaştırılır.
+
+Kullanım:
+    python scripts/bench_compiled.py [--rows 20000] [--trees 200] [--repeat 50]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from app.ml.compiled import CompiledPredictor
+from app.ml.pipelines import ml_baseline
+
+COLD_JOBLIB = "import joblib; joblib.load({path!r})"
+COLD_COMPILED = "from app.ml.compiled import CompiledPredictor; CompiledPredictor.load({path!r})"
+
+def make_csv(path: str, n: int) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "age": rng.normal(40, 12, n).round(),
+        "income": rng.lognormal(10, 1, n),
+        "visits": rng.poisson(3, n).astype(float),
+        "city": rng.choice([f"city_{i}" for i in range(30)], n),
+        "plan": rng.choice(["free", "basic", "pro"], n),
+        "device": rng.choice(["ios", "android", "web"], n),
+    })
+    df.loc[rng.random(n) < 0.05, "income"] = np.nan
+    score = (df["age"] - 40) / 12 + (df["plan"] == "pro") * 1.5 + np.log(df["income"].fillna(20000)) - 10
+    df["label"] = np.where(score + rng.normal(0, 1, n) > 0.5, "churn", "stay")
+    df.to_csv(path, index=False)
+
+def cold_seconds(snippet: str, path: str, repeat: int = 3) -> float:
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    code = f"import time; t = time.perf_counter(); {snippet.format(path=path)}; print(time.perf_counter() - t)"
+    runs = [float(subprocess.check_output([sys.executable, "-c", code], env=env)) for _ in range(repeat)]
+    return statistics.median(runs)
+
+def p50_ms(fn, repeat: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+def bench(name: str, params: dict, registry: str, repeat: int) -> None:
+    run_id = name.replace(" ", "_")
+    params = {**params, "artifacts": {"save_model": True}}
+    metrics = ml_baseline.run_baseline(params, run_id=run_id).metrics
+    compiled_info = metrics["compiled"]
+    if not compiled_info["compiled"]:
+        print(f"{name}: not compiled ({compiled_info['reason']})")
+        return
+    model_path = metrics["artifacts"]["model_path"]
+    compiled_path = metrics["artifacts"]["compiled_path"]
+    pipeline = joblib.load(model_path)
+    predictor = CompiledPredictor.load(compiled_path)
+
+    dataset = params["dataset"]
+    if "csv_path" in dataset:
+        frame = pd.read_csv(dataset["csv_path"]).drop(columns=[dataset["target_col"]])
+        records = frame.to_dict("records")
+        pipe_input = lambda n: frame.iloc[:n]
+        compiled_input = lambda n: records[:n]
+    else:
+        X = ml_baseline._load_builtin(dataset["name"])[0]
+        pipe_input = compiled_input = lambda n: X[:n]
+
+    print(f"\n{name}  (verified on {compiled_info['verify_rows']} rows, max |diff| {compiled_info['max_abs_diff']:.1e})")
+    print(f"  artifact     joblib {os.path.getsize(model_path) / 1e6:8.2f} MB   compiled {os.path.getsize(compiled_path) / 1e6:8.2f} MB")
+    print(f"  cold load    joblib {cold_seconds(COLD_JOBLIB, model_path) * 1000:8.1f} ms   compiled {cold_seconds(COLD_COMPILED, compiled_path) * 1000:8.1f} ms")
+    warm_j = p50_ms(lambda: joblib.load(model_path), max(3, repeat // 10))
+    warm_c = p50_ms(lambda: CompiledPredictor.load(compiled_path), max(3, repeat // 10))
+    print(f"  warm load    joblib {warm_j:8.2f} ms   compiled {warm_c:8.2f} ms")
+    for n in (1, 10, 1000):
+        a, b = pipe_input(n), compiled_input(n)
+        if len(a) < n:
+            continue
+        same = np.array_equal(pipeline.predict_proba(a).argmax(1), predictor.predict_proba(b).argmax(1))
+        t_pipe = p50_ms(lambda: pipeline.predict_proba(a), repeat)
+        t_comp = p50_ms(lambda: predictor.predict_proba(b), repeat)
+        print(f"  predict {n:>4}  pipeline {t_pipe:8.3f} ms   compiled {t_comp:8.3f} ms   x{t_pipe / t_comp:6.1f}   labels equal: {same}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ml_baseline.REGISTRY_DIR = tmp
+        csv_path = os.path.join(tmp, "churn.csv")
+        make_csv(csv_path, args.rows)
+        csv = {"csv_path": csv_path, "target_col": "label"}
+        rf = {"name": "rf", "n_estimators": args.trees}
+        bench("iris logreg", {"dataset": {"name": "iris"}, "model": {"name": "logreg"}}, tmp, args.repeat)
+        bench("digits rf", {"dataset": {"name": "digits"}, "model": rf}, tmp, args.repeat)
+        bench("csv logreg", {"dataset": csv, "model": {"name": "logreg"}}, tmp, args.repeat)
+        bench("csv rf", {"dataset": csv, "model": rf}, tmp, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Dağıtık rf ölçekleme benchmark'ı: 1, 2 ve 4 worker.
+
+Her worker sayısı k için orman k shard'a bölünür; shard'lar k ayrı process'te
+(worker başına `--threads` çekirdek) aynı anda fit edilir, sonra merge edilip
+test split'inde değerlendirilir. RQ/Redis turu ölçüme girmez; sadece hesap
+ölçeklenmesi ölçülür. Birleşik ormanın metrikleri tek process'te aynı seed'le
+eğitilen ormanla karşılaştırılır.
+
+    speedup(k)    = T(1) / T(k)
+    efficiency(k) = speedup(k) / k
+
+Gerçek ölçekleme için makinede en az 4 x --threads çekirdek olmalı.
+
+Kullanım:
+    python scripts/bench_distributed_rf.py [--dataset digits | --csv path --target label] [--trees 400]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _init(threads: int) -> None:
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "LOKY_MAX_CPU_COUNT"):
+        os.environ[var] = str(threads)
+
+def _fit_shard(params: dict, index: int, n_shards: int):
+    from app.ml.pipelines.ml_baseline import run_baseline
+
+    return run_baseline(params, rf_shard=(index, n_shards)).model
+
+def run_k(params: dict, k: int, threads: int) -> tuple[float, float, dict]:
+    from app.ml.distributed_rf import merge_forests
+    from app.ml.pipelines.ml_baseline import run_baseline
+
+    with ProcessPoolExecutor(k, mp_context=mp.get_context("spawn"), initializer=_init, initargs=(threads,)) as ex:
+        # warm the workers so process start + imports are not timed
+        list(ex.map(_init, [threads] * k))
+        t0 = time.perf_counter()
+        forests = list(ex.map(_fit_shard, [params] * k, range(k), [k] * k))
+        shards_s = time.perf_counter() - t0
+    t1 = time.perf_counter()
+    metrics = run_baseline(params, prefit_clf=merge_forests(forests, params["model"]["random_state"])).metrics
+    merge_s = time.perf_counter() - t1
+    return shards_s, merge_s, metrics
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default="digits")
+    parser.add_argument("--csv")
+    parser.add_argument("--target", default="label")
+    parser.add_argument("--trees", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=1, help="cores per simulated worker")
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+
+    dataset = {"csv_path": args.csv, "target_col": args.target} if args.csv else {"name": args.dataset}
+    params = {"dataset": dataset, "model": {"name": "rf", "n_estimators": args.trees, "random_state": 42}}
+
+    print(f"{args.trees} trees on {args.csv or args.dataset}, {args.threads} thread(s)/worker, {os.cpu_count()} cpu(s)")
+    print(f"{'workers':>7} {'shards s':>9} {'merge s':>8} {'speedup':>8} {'efficiency':>10} {'accuracy':>9}")
+    base = None
+    ref = None
+    for k in (int(w) for w in args.workers.split(",")):
+        shards_s, merge_s, m = run_k(params, k, args.threads)
+        base = base or shards_s
+        ref = ref or m
+        assert m["accuracy"] == ref["accuracy"] and m["log_loss"] == ref["log_loss"], "merged forest differs"
+        speedup = base / shards_s
+        print(f"{k:>7} {shards_s:>9.2f} {merge_s:>8.2f} {speedup:>8.2f} {speedup / k:>10.2f} {m['accuracy']:>9.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""HistGradientBoosting (`hgb`) vs random forest benchmark'ı.
+
+Sentetik bir CSV (numeric + farklı kardinalitede kategorik kolonlar, kolonlar
+arası etkileşimler) üretilir; her satır sayısı için iki model `run_baseline`
+ile eğitilip geçici registry'ye kaydedilir ve şunlar yazdırılır:
+- fit süresi ve run'ın toplam süresi (load + preprocess + fit + metrics)
+- joblib artifact boyutu
+- accuracy / f1_macro / roc_auc
+- encoded feature sayısı (rf'de one-hot, hgb'de native kategorikler)
+- hgb'nin early stopping'de durduğu iterasyon
+
+Kullanım:
+    python scripts/bench_hgb.py [--rows 50000 200000] [--trees 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from app.ml.memory_plan import cpu_limit
+from app.ml.pipelines import ml_baseline
+
+def make_csv(path: str, n: int) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "age": rng.normal(40, 12, n).round(),
+        "income": rng.lognormal(10, 1, n),
+        "visits": rng.poisson(3, n).astype(float),
+        "tenure": rng.exponential(24, n),
+        "region": rng.choice([f"region_{i}" for i in range(8)], n),
+        "city": rng.choice([f"city_{i}" for i in range(60)], n),
+        "shop": rng.choice([f"shop_{i}" for i in range(180)], n),
+        "product": rng.choice([f"product_{i}" for i in range(2000)], n),
+    })
+    df.loc[rng.random(n) < 0.05, "income"] = np.nan
+    city_effect = dict(zip([f"city_{i}" for i in range(60)], rng.normal(0, 1, 60)))
+    shop_effect = dict(zip([f"shop_{i}" for i in range(180)], rng.normal(0, 0.7, 180)))
+    score = (
+        df["city"].map(city_effect)
+        + df["shop"].map(shop_effect) * (df["visits"] > 2)
+        + np.log(df["income"].fillna(20000)) - 10
+        + np.where(df["age"] > 50, 0.8, -0.2) * (df["region"] == "region_1")
+        - df["tenure"] / 48
+    )
+    df["label"] = np.where(score + rng.normal(0, 1, n) > 0, "churn", "stay")
+    df.to_csv(path, index=False)
+
+def bench(csv_path: str, model: dict, run_id: str) -> dict:
+    params = {
+        "dataset": {"csv_path": csv_path, "target_col": "label"},
+        "model": model,
+        "artifacts": {"save_model": True, "compile": False},
+    }
+    t0 = time.perf_counter()
+    m = ml_baseline.run_baseline(params, run_id=run_id).metrics
+    return {
+        "run_s": time.perf_counter() - t0,
+        "fit_s": m["fit_seconds"],
+        "artifact_mb": os.path.getsize(m["artifacts"]["model_path"]) / 2**20,
+        "accuracy": m["accuracy"],
+        "f1": m["f1_macro"],
+        "roc_auc": m.get("roc_auc"),
+        "features": m["n_features_encoded"],
+        "n_iter": (m.get("boosting") or {}).get("n_iter"),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--trees", type=int, default=100)
+    args = parser.parse_args()
+
+    models = {
+        "rf": {"name": "rf", "n_estimators": args.trees},
+        "hgb": {"name": "hgb"},
+    }
+    print(f"worker cpus: {cpu_limit()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ml_baseline.REGISTRY_DIR = tmp
+        for n in args.rows:
+            csv_path = os.path.join(tmp, f"churn_{n}.csv")
+            make_csv(csv_path, n)
+            print(f"\n{n} rows")
+            print(f"{'model':>6} {'fit s':>8} {'run s':>8} {'MB':>8} {'acc':>7} {'f1':>7} {'auc':>7} {'feat':>5} {'iter':>5}")
+            results = {}
+            for name, model in models.items():
+                r = results[name] = bench(csv_path, model, f"{name}_{n}")
+                print(
+                    f"{name:>6} {r['fit_s']:>8.2f} {r['run_s']:>8.2f} {r['artifact_mb']:>8.2f} "
+                    f"{r['accuracy']:>7.4f} {r['f1']:>7.4f} {r['roc_auc']:>7.4f} {r['features']:>5} {r['n_iter'] or '':>5}"
+                )
+            rf, hgb = results["rf"], results["hgb"]
+            print(
+                f"hgb vs rf: fit x{rf['fit_s'] / hgb['fit_s']:.1f} faster, "
+                f"artifact x{rf['artifact_mb'] / hgb['artifact_mb']:.0f} smaller, "
+                f"accuracy {hgb['accuracy'] - rf['accuracy']:+.4f}"
+            )
+
+if __name__ == "__main__":
+    main()
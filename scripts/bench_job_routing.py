@@ -0,0 +1,105 @@
+"""Küçük run'lar için uçtan uca latency: inline pool vs RQ.
+
+Her run için `POST /runs/{id}/start` çağrılır ve run SUCCEEDED görünene kadar
+geçen süre ölçülür:
+- inline: `mode=inline`, cevap bitmiş run'ı içerir (API process pool)
+- queue:  `mode=queue`, RQ worker'ı işler; durum `GET /runs/{id}` ile 10 ms'de bir sorgulanır
+
+DB (DATABASE_URL) ve Redis (REDIS_URL) gerekir. Worker'ı script kendisi başlatır
+(`--worker fork` dataset cache kapalı, job başına fork; `--worker simple` cache açık),
+`--worker none` ile dışarıda çalışan bir worker kullanılır.
+
+Kullanım:
+    python scripts/bench_job_routing.py [--runs 20] [--dataset iris] [--model logreg] [--worker simple]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+TERMINAL = ("SUCCEEDED", "FAILED", "CANCELED")
+
+def start_worker(kind: str) -> subprocess.Popen | None:
+    if kind == "none":
+        return None
+    env = dict(os.environ, DATASET_CACHE_MB="0" if kind == "fork" else os.environ.get("DATASET_CACHE_MB", "1024"))
+    proc = subprocess.Popen([sys.executable, "-m", "app.worker"], cwd=ROOT, env=env)
+    time.sleep(5)  # worker imports the ML stack before it listens
+    return proc
+
+def new_runs(c: TestClient, n: int, params: dict) -> list[str]:
+    slug = f"bench-{uuid.uuid4().hex[:8]}"
+    p = c.post("/api/v1/projects", json={"name": slug, "slug": slug}).json()
+    e = c.post("/api/v1/projects/experiments", json={"project_id": p["id"], "name": "routing"}).json()
+    return [
+        c.post("/api/v1/runs", json={"experiment_id": e["id"], "name": f"r{i}", "params_json": json.dumps(params)}).json()["id"]
+        for i in range(n)
+    ]
+
+def time_inline(c: TestClient, run_id: str) -> float:
+    t0 = time.perf_counter()
+    out = c.post(f"/api/v1/runs/{run_id}/start", params={"mode": "inline"}).json()
+    elapsed = time.perf_counter() - t0
+    assert out["run"]["status"] == "SUCCEEDED", out
+    return elapsed
+
+def time_queue(c: TestClient, run_id: str, timeout: float = 120.0) -> float:
+    t0 = time.perf_counter()
+    c.post(f"/api/v1/runs/{run_id}/start", params={"mode": "queue"})
+    while time.perf_counter() - t0 < timeout:
+        status = c.get(f"/api/v1/runs/{run_id}").json()["status"]
+        if status in TERMINAL:
+            assert status == "SUCCEEDED", status
+            return time.perf_counter() - t0
+        time.sleep(0.01)
+    raise TimeoutError(f"run {run_id} did not finish; is a worker running?")
+
+def report(name: str, times: list[float]) -> None:
+    ms = sorted(t * 1000 for t in times)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    print(f"{name:<14} {statistics.median(ms):>10.1f} {p95:>10.1f} {ms[0]:>10.1f} {len(ms):>6}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--dataset", default="iris")
+    parser.add_argument("--model", default="logreg")
+    parser.add_argument("--worker", choices=("simple", "fork", "none"), default="simple")
+    args = parser.parse_args()
+
+    params = {"dataset": {"name": args.dataset}, "model": {"name": args.model}}
+    worker = start_worker(args.worker)
+    try:
+        with TestClient(app) as c:
+            inline_ids = new_runs(c, args.runs + 1, params)
+            queue_ids = new_runs(c, args.runs + 1, params)
+
+            cold_inline = time_inline(c, inline_ids[0])
+            inline = [time_inline(c, r) for r in inline_ids[1:]]
+            cold_queue = time_queue(c, queue_ids[0])
+            queue = [time_queue(c, r) for r in queue_ids[1:]]
+    finally:
+        if worker is not None:
+            worker.terminate()
+            worker.wait()
+
+    print(f"{args.dataset}/{args.model}, worker={args.worker}")
+    print(f"{'path':<14} {'p50 ms':>10} {'p95 ms':>10} {'min ms':>10} {'n':>6}")
+    print(f"{'inline (cold)':<14} {cold_inline * 1000:>10.1f}")
+    report("inline", inline)
+    print(f"{'queue (cold)':<14} {cold_queue * 1000:>10.1f}")
+    report("queue", queue)
+
+if __name__ == "__main__":
+    main()
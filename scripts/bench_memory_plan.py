@@ -0,0 +1,105 @@
+"""Bellek planı benchmark'ı: full vs compact tepe RSS, tahmin isabeti, red.
+
+Sentetik bir CSV (numeric + farklı kardinalitede kategorik kolonlar) üretilir ve
+upload sonrasındaki gibi profillenir; her model x plan kombinasyonu temiz bir process'te `run_baseline` ile
+eğitilir (dataset cache kapalı) ve şunlar yazdırılır:
+- planın tahmin ettiği tepe (yükleme + encode/fit) ve ölçülen tepe RSS artışı
+- full / compact oranı: aynı worker belleğine kaç kat büyük dataset sığar
+- accuracy ve fit süresi (float32 / category'nin sonuca etkisi)
+Sonunda küçük bir `WORKER_MEMORY_MB` ile run'ın iş başlamadan reddedildiği gösterilir.
+
+Kullanım:
+    python scripts/bench_memory_plan.py [--rows 1000000] [--trees 20] [--max-depth 14]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def make_csv(path: str, n: int) -> None:
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    cols = {f"x{i}": rng.normal(0, 1, n) for i in range(4)}
+    cols["count_a"] = rng.poisson(3, n)
+    cols["count_b"] = rng.integers(0, 1000, n)
+    for name, card in (("region", 5), ("city", 30), ("shop", 200), ("product", 3000)):
+        cols[name] = rng.choice([f"{name}_{i}" for i in range(card)], n)
+    df = pd.DataFrame(cols)
+    df.loc[rng.random(n) < 0.02, "x0"] = np.nan
+    score = df["x1"] + 0.5 * df["x2"] + (df["region"] == "region_1") - 0.3 * df["count_a"] / 3
+    df["label"] = np.where(score + rng.normal(0, 1, n) > 0.3, "yes", "no")
+    df.to_csv(path, index=False)
+
+def child(csv_path: str, model: dict, plan: str) -> None:
+    from app.ml.pipelines.ml_baseline import run_baseline
+
+    with open(csv_path + ".profile.json") as f:
+        profile = json.load(f)
+
+    params = {
+        "dataset": {"csv_path": csv_path, "target_col": "label"},
+        "model": model,
+        "memory": {"plan": plan},
+    }
+    try:
+        m = run_baseline(params, profile=profile).metrics
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        return
+    print(json.dumps({"accuracy": m["accuracy"], "fit_seconds": m["fit_seconds"], "memory": m["memory"]}))
+
+def run_child(csv_path: str, model: dict, plan: str, env: dict | None = None) -> dict:
+    env = {**os.environ, "PYTHONPATH": ROOT, "DATASET_CACHE_MB": "0", **(env or {})}
+    out = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), "--child", csv_path, json.dumps(model), plan], env=env
+    )
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--trees", type=int, default=20)
+    parser.add_argument("--max-depth", type=int, default=14)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], json.loads(args.child[1]), args.child[2])
+        return
+
+    models = {
+        "logreg": {"name": "logreg"},
+        "rf": {"name": "rf", "n_estimators": args.trees, "max_depth": args.max_depth},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "data.csv")
+        make_csv(csv_path, args.rows)
+        from app.ml.profiling import profile_csv
+
+        with open(csv_path + ".profile.json", "w") as f:
+            json.dump(profile_csv(csv_path, "label"), f)
+        print(f"{args.rows} rows, csv {os.path.getsize(csv_path) / 2**20:.0f} MB")
+        print(f"{'model':>7} {'plan':>8} {'est MB':>8} {'peak MB':>8} {'accuracy':>9} {'fit s':>7}")
+        for name, model in models.items():
+            used = {}
+            for plan in ("full", "compact"):
+                r = run_child(csv_path, model, plan)
+                mem = r["memory"]
+                used[plan] = mem["peak_rss_mb"] - mem["start_rss_mb"]
+                print(
+                    f"{name:>7} {plan:>8} {mem['estimate_mb']['peak']:>8.0f} {used[plan]:>8.0f} "
+                    f"{r['accuracy']:>9.4f} {r['fit_seconds']:>7.2f}"
+                )
+            print(f"{name:>7} full / compact peak: x{used['full'] / used['compact']:.2f}")
+
+        r = run_child(csv_path, models["rf"], "auto", env={"WORKER_MEMORY_MB": "300"})
+        print(f"\nWORKER_MEMORY_MB=300 -> {r.get('error') or r['memory']['mode']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Büyük liste cevapları için serialize + sıkıştırma benchmark'ı.
+
+10k run'lık bir `GET /runs` cevabı (metrics_json içinde digits boyutunda
+10x10 confusion matrix + sınıf bazlı metrikler) iki yolla üretilir:
+- pydantic: FastAPI'nin varsayılan yolu (response_model validation + jsonable_encoder + json.dumps)
+- orjson:   `rows_response` fast path'i (ORM satırı -> orjson)
+
+Sonra body'nin ham / gzip / brotli boyutları ve sıkıştırma süreleri ölçülür.
+DB gerekmez; satırlar bellekte üretilir.
+
+Kullanım:
+    python scripts/bench_responses.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import brotli
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import orjson_bytes
+from app.models.project import RunStatus
+from app.schemas.project import RunOut
+
+def fake_runs(n: int) -> list[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    experiment_id = uuid.uuid4()
+    labels = list(range(10))
+    rows = []
+    for i in range(n):
+        cm = [[(i + r * 7 + c * 3) % 40 if r != c else 30 + (i + r) % 10 for c in labels] for r in labels]
+        metrics = {
+            "accuracy": 0.9 + (i % 100) / 1000,
+            "f1_macro": 0.89 + (i % 97) / 1000,
+            "confusion_matrix": cm,
+            "labels": labels,
+            "per_class": {
+                str(k): {"precision": 0.9, "recall": 0.91, "f1": 0.905, "support": 36} for k in labels
+            },
+            "fit_seconds": 0.1234,
+        }
+        rows.append(
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                created_at=now - timedelta(seconds=i),
+                updated_at=now - timedelta(seconds=i),
+                experiment_id=experiment_id,
+                name=f"run-{i}",
+                status=RunStatus.SUCCEEDED,
+                params_json=json.dumps({"dataset": {"name": "digits"}, "model": {"name": "logreg", "C": 1.0}}),
+                metrics_json=json.dumps(metrics),
+                error=None,
+            )
+        )
+    return rows
+
+def pydantic_body(rows, adapter: TypeAdapter) -> bytes:
+    # what FastAPI does for a plain `return rows` with response_model=list[RunOut]
+    validated = adapter.validate_python(rows, from_attributes=True)
+    content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def orjson_body(rows) -> bytes:
+    fields = tuple(RunOut.model_fields)
+    return orjson_bytes([{f: getattr(r, f) for f in fields} for r in rows])
+
+def timed(fn, repeat: int):
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), out
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = fake_runs(args.rows)
+    adapter = TypeAdapter(list[RunOut])
+
+    slow_ms, slow = timed(lambda: pydantic_body(rows, adapter), args.repeat)
+    fast_ms, fast = timed(lambda: orjson_body(rows), args.repeat)
+    assert json.loads(slow) == json.loads(fast), "fast path output differs from pydantic"
+
+    print(f"{args.rows} runs")
+    print(f"{'serializer':<10} {'ms (median)':>12} {'bytes':>12}")
+    print(f"{'pydantic':<10} {slow_ms:>12.1f} {len(slow):>12}")
+    print(f"{'orjson':<10} {fast_ms:>12.1f} {len(fast):>12}   x{slow_ms / fast_ms:.1f}")
+
+    print()
+    print(f"{'encoding':<10} {'ms (median)':>12} {'bytes':>12} {'ratio':>8}")
+    print(f"{'identity':<10} {0.0:>12.1f} {len(fast):>12} {1.0:>8.2f}")
+    codecs = {
+        "gzip-6": lambda: (lambda c: c.compress(fast) + c.flush())(zlib.compressobj(6, zlib.DEFLATED, 31)),
+        "br-4": lambda: brotli.compress(fast, quality=4),
+    }
+    for name, fn in codecs.items():
+        ms, body = timed(fn, args.repeat)
+        print(f"{name:<10} {ms:>12.1f} {len(body):>12} {len(fast) / len(body):>8.2f}")
+
+if __name__ == "__main__":
+    main()
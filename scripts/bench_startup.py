@@ -0,0 +1,58 @@
+"""API vs worker cold start benchmark: import süresi ve RSS.
+
+Her senaryo ayrı, temiz bir process'te ölçülür:
+- api:            `import app.main` (lazy ML imports)
+- api+ml:         `import app.main` + ML pipeline (eski davranış: API'nin ML'i eager yüklemesi)
+- worker:         `import app.worker` (ML preload)
+
+Kullanım:
+    python scripts/bench_startup.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "api": "import app.main",
+    "api+ml": "import app.main\nimport app.ml.pipelines.ml_baseline",
+    "worker": "import app.worker",
+}
+
+_PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+{code}
+elapsed_ms = (time.perf_counter() - t0) * 1000
+# ru_maxrss is KiB on linux
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({{"elapsed_ms": elapsed_ms, "rss_mb": rss_mb, "n_modules": len(sys.modules)}}))
+"""
+
+def run_once(code: str) -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(code=code)],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<10} {'import ms (median)':>20} {'peak RSS MB':>12} {'modules':>8}")
+    for name, code in SCENARIOS.items():
+        runs = [run_once(code) for _ in range(args.repeat)]
+        ms = statistics.median(r["elapsed_ms"] for r in runs)
+        rss = statistics.median(r["rss_mb"] for r in runs)
+        print(f"{name:<10} {ms:>20.0f} {rss:>12.1f} {runs[0]['n_modules']:>8}")
+
+if __name__ == "__main__":
+    main()
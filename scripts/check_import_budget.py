@@ -0,0 +1,56 @@
+"""API import-time budget kontrolü (CI'da çalışır).
+
+`app.main` import edildiğinde ağır ML modülleri yüklenmemeli ve toplam import
+süresi bütçenin altında kalmalı. Ölçüm temiz bir subprocess'te yapılır.
+
+Kullanım:
+    python scripts/check_import_budget.py            # default budget
+    IMPORT_BUDGET_MS=1500 python scripts/check_import_budget.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+FORBIDDEN = ("pandas", "sklearn", "scipy", "numpy", "joblib")
+DEFAULT_BUDGET_MS = 2000
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+elapsed_ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({"elapsed_ms": elapsed_ms, "modules": sorted(sys.modules)}))
+"""
+
+def measure() -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main() -> int:
+    budget_ms = float(os.environ.get("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+    result = measure()
+    loaded = {m.split(".")[0] for m in result["modules"]}
+    leaked = [m for m in FORBIDDEN if m in loaded]
+
+    print(f"import app.main: {result['elapsed_ms']:.0f} ms (budget {budget_ms:.0f} ms)")
+    ok = True
+    if leaked:
+        print(f"FAIL: ML modules imported by the API process: {', '.join(leaked)}")
+        ok = False
+    if result["elapsed_ms"] > budget_ms:
+        print("FAIL: import time over budget")
+        ok = False
+    if ok:
+        print("ok")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())